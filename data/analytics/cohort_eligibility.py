@@ -0,0 +1,209 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.logic.catalog import (
+    AVAILABILITY_TERMS,
+    CatalogSnapshot,
+    load_catalog_snapshot_sync,
+)
+from data.logic.eligibility import CompiledRequisites, get_compiled_requisites
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = "sqlite:///data/database/courses.db"
+# Students evaluated per batch, bounds memory to a few hundred MB
+STUDENT_CHUNK_SIZE = 2048
+
+
+def load_students(path: str) -> Dict[str, Set[str]]:
+    """
+    Reads students' passed courses from a CSV or JSON file.
+    Accepted layouts:
+        - CSV with columns student_id,course_code (one row per passed course)
+        - CSV with columns student_id,taken_courses (codes separated by ';')
+        - JSON object {student_id: [course codes]}
+        - JSON list [{"student_id": .., "taken_courses": [..]}]
+    Args:
+        path: Path to the .csv or .json file.
+    Returns:
+        Dict mapping student id to the set of passed course codes.
+    """
+    students: Dict[str, Set[str]] = {}
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            items = data.items()
+        else:
+            items = ((row["student_id"], row["taken_courses"]) for row in data)
+        for student_id, taken_courses in items:
+            students[str(student_id)] = {
+                code.replace(" ", "") for code in taken_courses
+            }
+        return students
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            taken = students.setdefault(row["student_id"], set())
+            if "course_code" in row:
+                taken.add(row["course_code"].replace(" ", ""))
+            else:
+                taken.update(
+                    code.replace(" ", "")
+                    for code in (row.get("taken_courses") or "").split(";")
+                    if code.strip()
+                )
+    return students
+
+
+def build_completed_matrix(
+    compiled: CompiledRequisites, students: Sequence[Iterable[str]]
+) -> np.ndarray:
+    """Students x course index boolean matrix of passed courses."""
+    rows: List[int] = []
+    columns: List[int] = []
+    for row, taken_courses in enumerate(students):
+        for code in taken_courses:
+            column = compiled.course_index.get(code)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+    completed = np.zeros((len(students), compiled.num_literals), dtype=bool)
+    completed[rows, columns] = True
+    return completed
+
+
+def cohort_eligibility_counts(
+    catalog: CatalogSnapshot,
+    students: Sequence[Iterable[str]],
+    terms: Sequence[str] = ("fall", "spring"),
+) -> Dict[str, np.ndarray]:
+    """
+    Number of students eligible for each catalog course in each term type.
+    Eligibility follows find_eligible_courses, evaluated as a students x courses matrix
+    in chunks of STUDENT_CHUNK_SIZE students.
+    Args:
+        catalog: Catalog snapshot to evaluate against.
+        students: Passed course codes of each student.
+        terms: Term types to evaluate ("fall", "spring", "firstsummer", ...).
+    Returns:
+        Dict mapping each term to an array of counts aligned with the compiled course codes.
+    """
+    compiled = get_compiled_requisites(catalog)
+    counts = {term: np.zeros(compiled.num_courses, dtype=np.int64) for term in terms}
+    for start in range(0, len(students), STUDENT_CHUNK_SIZE):
+        completed = build_completed_matrix(
+            compiled, students[start : start + STUDENT_CHUNK_SIZE]
+        )
+        for term in terms:
+            eligible, _ = compiled.eligibility_masks(completed, term)
+            counts[term] += eligible.sum(axis=0)
+    return counts
+
+
+def write_counts(
+    path: str,
+    course_codes: Sequence[str],
+    counts: Dict[str, np.ndarray],
+    include_zero: bool = False,
+):
+    """Writes per-course counts as CSV (course_code, one column per term), or JSON for .json paths."""
+    terms = list(counts.keys())
+    rows = [
+        (code, [int(counts[term][i]) for term in terms])
+        for i, code in enumerate(course_codes)
+    ]
+    if not include_zero:
+        rows = [row for row in rows if any(row[1])]
+    rows.sort(key=lambda row: (-max(row[1]), row[0]))
+
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {code: dict(zip(terms, values)) for code, values in rows}, f, indent=2
+            )
+        return
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["course_code", *terms])
+        for code, values in rows:
+            writer.writerow([code, *values])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Counts how many students of a cohort are eligible for each course, per term",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "students", help="CSV or JSON file with students' passed courses"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="cohort_eligibility.csv",
+        help="Output .csv or .json file",
+    )
+    parser.add_argument(
+        "-t",
+        "--terms",
+        nargs="+",
+        choices=AVAILABILITY_TERMS,
+        default=["fall", "spring"],
+        help="Term types to evaluate",
+    )
+    parser.add_argument(
+        "-y",
+        "--year",
+        type=int,
+        help="Reference year for availability predictions (defaults to the current year)",
+    )
+    parser.add_argument(
+        "--include-zero",
+        action="store_true",
+        help="Also list courses no student is eligible for",
+    )
+    args = parser.parse_args()
+
+    students = load_students(args.students)
+    logger.info(f"Loaded {len(students)} students from {args.students}")
+
+    engine = create_engine(DATABASE_URL, echo=False)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        catalog = load_catalog_snapshot_sync(db, args.year)
+    if not catalog:
+        logger.error("Failed to load course data or course data is empty.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    counts = cohort_eligibility_counts(catalog, list(students.values()), args.terms)
+    compiled = get_compiled_requisites(catalog)
+    logger.info(
+        f"Evaluated {len(students)} students x {compiled.num_courses} courses x "
+        f"{len(args.terms)} terms in {time.perf_counter() - start:.2f}s"
+    )
+    write_counts(args.output, compiled.course_codes, counts, args.include_zero)
+    logger.info(f"Wrote eligibility counts to {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from data.database.database import Course, Program, Section
+from data.logic.availability import fetch_next_term_year
+from data.logic.catalog import CatalogSnapshot, load_catalog_snapshot_sync
+from data.logic.recommendation_scheduler import generate_sequence, term_key_sort_key
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = "sqlite:///data/database/courses.db"
+DEFAULT_CREDIT_LOAD = {"min": 12, "max": 18}
+# Number of most recent offerings of a course (per term type) averaged for its capacity
+HISTORY_OFFERINGS = 3
+
+# Catalog and programs loaded once per worker process
+_worker_catalog: Optional[CatalogSnapshot] = None
+_worker_programs: Dict[str, Program] = {}
+
+
+def _session_factory():
+    engine = create_engine(DATABASE_URL, echo=False)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def load_population(path: str) -> List[Dict]:
+    """
+    Reads the student population to plan for.
+    Accepted layouts:
+        - JSON list of {"student_id", "program_code", "taken_courses",
+          optional "specific_elective_credits_initial", optional "credit_load": {"min", "max"}}
+        - CSV with columns student_id,program_code,taken_courses (codes separated by ';')
+          and optional min_credits,max_credits
+    Args:
+        path: Path to the .json or .csv file.
+    Returns:
+        List of student dicts in the JSON layout.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    students = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            student = {
+                "student_id": row["student_id"],
+                "program_code": row["program_code"],
+                "taken_courses": [
+                    code.strip()
+                    for code in (row.get("taken_courses") or "").split(";")
+                    if code.strip()
+                ],
+            }
+            if row.get("min_credits") and row.get("max_credits"):
+                student["credit_load"] = {
+                    "min": int(row["min_credits"]),
+                    "max": int(row["max_credits"]),
+                }
+            students.append(student)
+    return students
+
+
+def _init_worker(year: Optional[int]):
+    global _worker_catalog, _worker_programs
+    # Per-term scheduler logs are too verbose (and slow) for population runs
+    logging.getLogger("data.logic.recommendation_scheduler").setLevel(logging.ERROR)
+    with _session_factory()() as db:
+        _worker_catalog = load_catalog_snapshot_sync(db, year)
+        _worker_programs = {
+            program.code: program for program in db.execute(select(Program)).scalars()
+        }
+
+
+def _plan_student(job: Tuple[Dict, str, int, int]) -> Tuple[str, Dict[str, List[str]]]:
+    student, start_term, start_year, max_terms = job
+    program_reqs = _worker_programs.get(student["program_code"])
+    if program_reqs is None or _worker_catalog is None:
+        return student["student_id"], {}
+    try:
+        result, _ = asyncio.run(
+            generate_sequence(
+                program_reqs=program_reqs,
+                course_lookups=_worker_catalog.course_lookups,
+                start_term_name=start_term,
+                start_year=start_year,
+                initial_taken_courses_set=set(student.get("taken_courses", [])),
+                specific_elective_credits_initial=student.get(
+                    "specific_elective_credits_initial", {}
+                ),
+                credit_limits=student.get("credit_load", DEFAULT_CREDIT_LOAD),
+                db_session=None,
+                max_terms=max_terms,
+                catalog=_worker_catalog,
+            )
+        )
+    except Exception as e:
+        logger.error(f"Failed to plan student {student['student_id']}: {e}")
+        return student["student_id"], {}
+    if result is None:
+        return student["student_id"], {}
+    return student["student_id"], {
+        term_key: term_data.courses
+        for term_key, term_data in result.schedule.items()
+        if term_data.courses
+    }
+
+
+def generate_plans(
+    students: List[Dict],
+    start_term: str,
+    start_year: int,
+    max_terms: int,
+    workers: int,
+    year: Optional[int] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Plans every student with the scheduler against a shared catalog snapshot.
+    Args:
+        students: Population in the load_population layout.
+        start_term: First term to plan (scheduler term name, e.g. "fall").
+        start_year: Year of start_term.
+        max_terms: Planning horizon in terms.
+        workers: Worker processes; 1 plans in this process.
+        year: Reference year for availability predictions (defaults to the current year).
+    Returns:
+        Dict mapping student id to {term key: planned course codes}.
+    """
+    jobs = [(student, start_term, start_year, max_terms) for student in students]
+    if workers <= 1:
+        _init_worker(year)
+        return dict(map(_plan_student, jobs))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(year,)
+    ) as executor:
+        return dict(executor.map(_plan_student, jobs, chunksize=16))
+
+
+def aggregate_demand(
+    plans: Dict[str, Dict[str, List[str]]],
+) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Projected enrollment per term and course.
+    Returns:
+        (term keys in chronological order, course codes, terms x courses count matrix)
+    """
+    term_index: Dict[str, int] = {}
+    course_index: Dict[str, int] = {}
+    term_ids: List[int] = []
+    course_ids: List[int] = []
+    for plan in plans.values():
+        for term_key, courses in plan.items():
+            t = term_index.setdefault(term_key, len(term_index))
+            for course_code in courses:
+                term_ids.append(t)
+                course_ids.append(
+                    course_index.setdefault(course_code, len(course_index))
+                )
+
+    num_terms, num_courses = len(term_index), len(course_index)
+    flat = np.array(term_ids, dtype=np.int64) * num_courses + np.array(
+        course_ids, dtype=np.int64
+    )
+    demand = np.bincount(flat, minlength=num_terms * num_courses).reshape(
+        num_terms, num_courses
+    )
+
+    term_keys = sorted(term_index, key=term_key_sort_key)
+    order = [term_index[key] for key in term_keys]
+    return term_keys, list(course_index), demand[order]
+
+
+def load_section_history(db) -> Dict[Tuple[str, str], Tuple[float, float]]:
+    """
+    Average seats offered and taken per (course code, term type) over the course's
+    HISTORY_OFFERINGS most recent offerings in that term type, from the sections table.
+    """
+    stmt = (
+        select(
+            Course.course_code,
+            Section.semester,
+            func.sum(Section.capacity),
+            func.sum(Section.taken),
+        )
+        .join(Section, Section.cid == Course.cid)
+        .group_by(Course.course_code, Section.semester)
+    )
+    offerings = defaultdict(list)  # (code, term type) -> [(year, capacity, taken)]
+    for course_code, semester, capacity, taken in db.execute(stmt):
+        try:
+            term, year = semester.rsplit("-", 1)  # e.g. "Fall-2024"
+            offerings[(course_code, term.lower())].append(
+                (int(year), capacity or 0, taken or 0)
+            )
+        except (AttributeError, ValueError):
+            logger.debug(f"Skipping section with unexpected semester '{semester}'")
+
+    history = {}
+    for key, rows in offerings.items():
+        recent = sorted(rows, reverse=True)[:HISTORY_OFFERINGS]
+        history[key] = (
+            sum(row[1] for row in recent) / len(recent),
+            sum(row[2] for row in recent) / len(recent),
+        )
+    return history
+
+
+def build_shortage_report(
+    term_keys: List[str],
+    course_codes: List[str],
+    demand: np.ndarray,
+    history: Dict[Tuple[str, str], Tuple[float, float]],
+) -> List[Dict]:
+    """
+    Projected demand against historical capacity for every (term, course) with demand.
+    Courses without section history in that term type are reported with status "no_history".
+    """
+    term_types = [key.split()[0].lower() for key in term_keys]
+    capacity = np.zeros(demand.shape)
+    enrolled = np.zeros(demand.shape)
+    has_history = np.zeros(demand.shape, dtype=bool)
+    for t, term_type in enumerate(term_types):
+        for c, course_code in enumerate(course_codes):
+            seats = history.get((course_code, term_type))
+            if seats is not None:
+                capacity[t, c], enrolled[t, c] = seats
+                has_history[t, c] = True
+
+    shortage = np.where(has_history, np.maximum(demand - capacity, 0), 0)
+    status = np.where(
+        ~has_history, "no_history", np.where(shortage > 0, "shortage", "ok")
+    )
+
+    rows = []
+    for t, c in zip(*np.nonzero(demand)):
+        rows.append(
+            {
+                "term": term_keys[t],
+                "course_code": course_codes[c],
+                "projected_demand": int(demand[t, c]),
+                "historical_capacity": round(float(capacity[t, c]), 1),
+                "historical_enrolled": round(float(enrolled[t, c]), 1),
+                "shortage": round(float(shortage[t, c]), 1),
+                "status": str(status[t, c]),
+            }
+        )
+    rows.sort(
+        key=lambda row: (
+            term_key_sort_key(row["term"]),
+            -row["shortage"],
+            -row["projected_demand"],
+        )
+    )
+    return rows
+
+
+def write_report(path: str, rows: List[Dict]):
+    fields = [
+        "term",
+        "course_code",
+        "projected_demand",
+        "historical_capacity",
+        "historical_enrolled",
+        "shortage",
+        "status",
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Forecasts seat demand per course and term from students' planned schedules",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--students", help="CSV or JSON file with the student population to plan"
+    )
+    source.add_argument(
+        "--plans", help="JSON file with existing plans {student_id: {term: [courses]}}"
+    )
+    parser.add_argument("--save-plans", help="Write generated plans to this JSON file")
+    parser.add_argument(
+        "-o", "--output", default="seat_demand.csv", help="Shortage report CSV"
+    )
+    parser.add_argument(
+        "--max-terms", type=int, default=12, help="Planning horizon in terms"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes used to generate plans",
+    )
+    parser.add_argument(
+        "-y",
+        "--year",
+        type=int,
+        help="Reference year for availability predictions (defaults to the current year)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.plans:
+        with open(args.plans, encoding="utf-8") as f:
+            plans = json.load(f)
+        logger.info(f"Loaded plans for {len(plans)} students from {args.plans}")
+    else:
+        students = load_population(args.students)
+        start_term, start_year = fetch_next_term_year()
+        logger.info(
+            f"Planning {len(students)} students from {start_term.capitalize()} {start_year} "
+            f"with {args.workers} workers..."
+        )
+        plans = generate_plans(
+            students, start_term, start_year, args.max_terms, args.workers, args.year
+        )
+        unplanned = sum(1 for plan in plans.values() if not plan)
+        logger.info(
+            f"Generated {len(plans) - unplanned} plans in {time.perf_counter() - start:.1f}s "
+            f"({unplanned} students could not be planned)"
+        )
+        if args.save_plans:
+            with open(args.save_plans, "w", encoding="utf-8") as f:
+                json.dump(plans, f)
+
+    term_keys, course_codes, demand = aggregate_demand(plans)
+    with _session_factory()() as db:
+        history = load_section_history(db)
+    if not history:
+        logger.warning(
+            "No section history found; every course will be reported as 'no_history'."
+        )
+    rows = build_shortage_report(term_keys, course_codes, demand, history)
+    write_report(args.output, rows)
+
+    for term_key in term_keys:
+        term_rows = [row for row in rows if row["term"] == term_key]
+        short = [row for row in term_rows if row["status"] == "shortage"]
+        logger.info(
+            f"{term_key}: {sum(row['projected_demand'] for row in term_rows)} projected seats "
+            f"in {len(term_rows)} courses, {len(short)} courses short by "
+            f"{sum(row['shortage'] for row in short):.0f} seats"
+        )
+    logger.info(
+        f"Wrote seat demand report to {args.output} in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
@@ -0,0 +1,45 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from data.database.database import CatalogVersion
+
+# Jobs that change the catalog (scraping, path/difficulty calculation, stored ASTs) run
+# in their own processes; bumping this version in the same transaction as the change
+# is how a running API learns that its cached catalog snapshot is stale.
+
+CATALOG_VERSION_ID = 1
+
+
+def _bump_statement():
+    return (
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+
+
+def bump_catalog_version(db: Session) -> None:
+    """Marks the catalog as changed; committed along with the session's other changes."""
+    if db.execute(_bump_statement()).rowcount == 0:
+        db.add(CatalogVersion(id=CATALOG_VERSION_ID, version=1))
+
+
+async def bump_catalog_version_async(db: AsyncSession) -> None:
+    """Async counterpart of bump_catalog_version."""
+    if (await db.execute(_bump_statement())).rowcount == 0:
+        db.add(CatalogVersion(id=CATALOG_VERSION_ID, version=1))
+
+
+def _version_query():
+    return select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+
+
+def load_catalog_version(db: Session) -> int:
+    """Current catalog version, 0 if nothing has bumped it yet."""
+    return db.execute(_version_query()).scalar() or 0
+
+
+async def load_catalog_version_async(db: AsyncSession) -> int:
+    """Async counterpart of load_catalog_version."""
+    return (await db.execute(_version_query())).scalar() or 0
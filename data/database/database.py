@@ -131,5 +131,30 @@ class GradeDistribution(Base):
     section = relationship("Section", back_populates="grade_distributions")
 
 
+class ParsedRequisite(Base):
+    __tablename__ = "parsed_requisites"
+    kind = Column(String, primary_key=True)  # "prerequisites" or "corequisites"
+    raw = Column(String, primary_key=True)  # Requisite string as stored in courses
+    ast = Column(String)  # Compact JSON of the filtered AST, NULL when nothing remains
+    error = Column(String)  # Why the string couldn't be parsed, NULL if it could
+    parser_version = Column(Integer, nullable=False)
+
+
+class RequisiteParseError(Base):
+    __tablename__ = "requisite_parse_errors"
+    course_code = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)  # "prerequisites" or "corequisites"
+    raw = Column(String, primary_key=True)  # Requisite string that couldn't be parsed
+    error = Column(String, nullable=False)
+    parser_version = Column(Integer, nullable=False)
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+    # Single row, bumped by every job that changes the catalog (see catalog_version.py)
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
 engine = create_engine("sqlite:///data/database/courses.db", echo=True)
 Base.metadata.create_all(engine)
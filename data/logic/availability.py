@@ -25,7 +25,6 @@ async def predict_availability(
         True if the course is predicted to be available, False otherwise.
     """
     course_code_formatted = course_code.replace(" ", "")  # Ensure consistent format
-    term_type_lower = term_type.lower()
 
     # Get current year
     current_date = date.today()
@@ -50,12 +49,48 @@ async def predict_availability(
         )
         return False  # Course not in DB, assume unavailable
 
+    return predict_availability_from_lookup(
+        {
+            "last_Fall": course_record.last_Fall,
+            "last_Spring": course_record.last_Spring,
+            "last_FirstSummer": course_record.last_FirstSummer,
+            "last_SecondSummer": course_record.last_SecondSummer,
+            "last_ExtendedSummer": course_record.last_ExtendedSummer,
+        },
+        term_type,
+        year,
+        course_code_formatted,
+    )
+
+
+def predict_availability_from_lookup(
+    course_data: dict, term_type: str, year: int | None = None, course_code: str = ""
+) -> bool:
+    """
+    Predicts if a course is likely available in a given term type using the
+    'last offered' years already present in a course lookup entry
+    (see load_course_data_lookups). Same rules as predict_availability, but
+    without a database round-trip.
+    Args:
+        course_data: Mapping with the last_Fall, last_Spring, last_FirstSummer,
+                     last_SecondSummer and last_ExtendedSummer keys.
+        term_type: The term ("Fall", "Spring", "FirstSummer",
+                   "SecondSummer", "ExtendedSummer"). Case-insensitive.
+        year: Reference year for the prediction. Defaults to the current year.
+        course_code: Only used for logging.
+    Returns:
+        True if the course is predicted to be available, False otherwise.
+    """
+    term_type_lower = term_type.lower()
+    if year is None:
+        year = date.today().year
+
     # Get last offered years, default to 0 if column is None/Null
-    last_fall = course_record.last_Fall or 0
-    last_spring = course_record.last_Spring or 0
-    last_first_summer = course_record.last_FirstSummer or 0
-    last_second_summer = course_record.last_SecondSummer or 0
-    last_extended_summer = course_record.last_ExtendedSummer or 0
+    last_fall = course_data.get("last_Fall") or 0
+    last_spring = course_data.get("last_Spring") or 0
+    last_first_summer = course_data.get("last_FirstSummer") or 0
+    last_second_summer = course_data.get("last_SecondSummer") or 0
+    last_extended_summer = course_data.get("last_ExtendedSummer") or 0
 
     # Simple prediction logic
     if term_type_lower == "fall":
@@ -84,7 +119,7 @@ async def predict_availability(
 
     else:
         logger.error(
-            f"Unknown term_type '{term_type}' for availability check for {course_code_formatted}."
+            f"Unknown term_type '{term_type}' for availability check for {course_code}."
         )
         return False  # Unknown term type is treated as unavailable
 
@@ -0,0 +1,104 @@
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.logic.catalog import load_catalog_snapshot_sync
+from data.logic.recommendation_scheduler import check_requisites_recursive
+from data.logic.requisite_predicates import get_course_index, get_requisite_compiler
+from data.logic.term_state import TermState
+
+DATABASE_URL = "sqlite:///data/database/courses.db"
+
+
+def random_states(catalog, count: int, seed: int) -> list[TermState]:
+    """TermStates over the catalog's course index with random sets of taken courses."""
+    rng = random.Random(seed)
+    codes = sorted(catalog.course_lookups)
+    index = get_course_index(catalog)
+    return [
+        TermState.from_courses(index, rng.sample(codes, rng.randint(0, 80)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures catalog requisite checks with compiled predicates against check_requisites_recursive",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n", "--rounds", type=int, default=10, help="Timed passes per checker"
+    )
+    parser.add_argument(
+        "--states", type=int, default=50, help="Random student states per pass"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    engine = create_engine(DATABASE_URL, echo=False)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        catalog = load_catalog_snapshot_sync(db)
+    if catalog is None:
+        print("Could not load the catalog snapshot.")
+        sys.exit(1)
+
+    requisites = [
+        ast
+        for by_course in (catalog.prerequisites, catalog.corequisites)
+        for ast in by_course.values()
+        if ast
+    ]
+    states = random_states(catalog, args.states, args.seed)
+    compiler = get_requisite_compiler(catalog)
+    start = time.perf_counter()
+    predicates = [compiler.compile(ast) for ast in requisites]
+    compile_time = time.perf_counter() - start
+    print(
+        f"{len(requisites)} requisites ({len(compiler)} distinct) x {len(states)} states, "
+        f"compiled in {compile_time * 1000:.1f} ms"
+    )
+
+    def interpreted():
+        for state in states:
+            for ast in requisites:
+                check_requisites_recursive(ast, state)
+
+    def compiled():
+        for state in states:
+            bits = state.bits
+            for predicate in predicates:
+                predicate(bits)
+
+    medians = {}
+    for name, run in (("interpreted", interpreted), ("compiled", compiled)):
+        run()  # Warm up
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        medians[name] = statistics.median(timings)
+        checks = len(requisites) * len(states)
+        print(
+            f"{name:<11} median {medians[name] * 1000:7.1f} ms   "
+            f"{checks / medians[name]:10.0f} checks/s"
+        )
+    print(
+        f"compiled vs interpreted: {medians['interpreted'] / medians['compiled']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
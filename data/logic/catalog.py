@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from data.database.catalog_version import (
+    load_catalog_version,
+    load_catalog_version_async,
+)
+from data.database.database import Course
+from data.logic.availability import predict_availability_from_lookup
+from data.logic.equivalences import (
+    EquivalenceIndex,
+    default_equivalences,
+    load_equivalences,
+)
+from data.models.course_service import invalidateLatestCourses
+from data.parser.requisite_ast import RequisiteNormalizer
+from data.parser.requisite_store import (
+    StoredRequisites,
+    load_stored_requisites,
+    load_stored_requisites_async,
+    parse_checked_requisites,
+)
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_TERMS = ("fall", "spring", "firstsummer", "secondsummer", "extendedsummer")
+
+
+def course_lookup_entry(course_db_obj: Course) -> Dict:
+    """Lookup entry for one course row, as used throughout the scheduler."""
+    return {
+        "credits": course_db_obj.credits or 0,
+        "difficulty": course_db_obj.difficulty or 0,
+        "highest_ancestor": course_db_obj.highest_ancestor or 0,
+        "prerequisites_raw": course_db_obj.prerequisites,
+        "corequisites_raw": course_db_obj.corequisites,
+        "last_Fall": course_db_obj.last_Fall or 0,
+        "last_Spring": course_db_obj.last_Spring or 0,
+        "last_FirstSummer": course_db_obj.last_FirstSummer or 0,
+        "last_SecondSummer": course_db_obj.last_SecondSummer or 0,
+        "last_ExtendedSummer": course_db_obj.last_ExtendedSummer or 0,
+    }
+
+
+class AvailabilityIndex:
+    """
+    Predicted availability of every course per term type, computed once from the
+    course lookups with the same rules as predict_availability.
+    """
+
+    def __init__(self, course_lookups: Dict[str, Dict], year: Optional[int] = None):
+        self._offered: Dict[str, FrozenSet[str]] = {
+            term: frozenset(
+                code
+                for code, course_data in course_lookups.items()
+                if predict_availability_from_lookup(course_data, term, year, code)
+            )
+            for term in AVAILABILITY_TERMS
+        }
+
+    def is_available(self, course_code: str, term_type: str) -> bool:
+        offered = self._offered.get(term_type.lower())
+        if offered is None:
+            logger.error(f"Unknown term_type '{term_type}' for availability check.")
+            return False
+        return course_code in offered
+
+    def offered_in(self, term_type: str) -> FrozenSet[str]:
+        return self._offered.get(term_type.lower(), frozenset())
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the course catalog shared by every request: course lookups,
+    normalized prerequisite/corequisite ASTs (taken from the stored ASTs, or parsed once
+    per distinct string that has none), the availability index and the course
+    equivalence classes. Nothing in it touches the database after construction.
+    """
+
+    def __init__(
+        self,
+        course_lookups: Dict[str, Dict],
+        year: Optional[int] = None,
+        equivalences: Optional[EquivalenceIndex] = None,
+        stored_requisites: Optional[StoredRequisites] = None,
+        version: int = 0,
+    ):
+        self.course_lookups = course_lookups
+        # catalog_version the snapshot was loaded at (see get_catalog_snapshot)
+        self.version = version
+        # Availability predictions are relative to the current year
+        self.year = year if year is not None else date.today().year
+        self.availability = AvailabilityIndex(course_lookups, self.year)
+        # Read from the equivalences file on every build so edits apply on reload
+        self.equivalences = (
+            equivalences if equivalences is not None else load_equivalences()
+        )
+        self.created_at = time.time()
+        self._derived: Dict[str, Any] = {}
+
+        self.prerequisites: Dict[str, Optional[dict]] = {}
+        self.corequisites: Dict[str, Optional[dict]] = {}
+        # (course_code, "prerequisites"/"corequisites") pairs whose string failed to parse
+        self.requisite_errors: Set[Tuple[str, str]] = set()
+        parsed_by_string: Dict[tuple, Optional[dict]] = {}
+        failed_strings: Set[tuple] = set()
+        stored_requisites = stored_requisites or {}
+        parsed_count = 0
+        # Shares identical subtrees between every requisite of the snapshot
+        normalizer = RequisiteNormalizer(self.equivalences.canonical)
+        for code, course_data in course_lookups.items():
+            for kind, target in (
+                ("prerequisites", self.prerequisites),
+                ("corequisites", self.corequisites),
+            ):
+                raw = course_data.get(f"{kind}_raw")
+                if not raw:
+                    target[code] = None
+                    continue
+                cache_key = (kind, raw)
+                if cache_key not in parsed_by_string:
+                    stored = stored_requisites.get(cache_key)
+                    if stored is not None:
+                        parsed_by_string[cache_key], error = stored
+                        if error:
+                            failed_strings.add(cache_key)
+                    else:
+                        parsed_count += 1
+                        parsed_by_string[cache_key], error = parse_checked_requisites(
+                            raw, kind
+                        )
+                        if error:
+                            logger.error(
+                                f"Error parsing/filtering {kind} for {code} while building catalog snapshot: {error}"
+                            )
+                            failed_strings.add(cache_key)
+                    parsed_by_string[cache_key] = normalizer.normalize(
+                        parsed_by_string[cache_key]
+                    )
+                if cache_key in failed_strings:
+                    self.requisite_errors.add((code, kind))
+                target[code] = parsed_by_string[cache_key]
+        logger.info(
+            f"Built catalog snapshot: {len(course_lookups)} courses, "
+            f"{len(parsed_by_string)} distinct requisite strings "
+            f"({parsed_count} without a stored AST parsed), {len(normalizer)} distinct requisite nodes."
+        )
+
+    def __contains__(self, course_code: str) -> bool:
+        return course_code in self.course_lookups
+
+    def get_derived(self, name: str, build: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """
+        Structure derived from this snapshot (e.g. compiled requisites), built on first
+        use and kept for the snapshot's lifetime.
+        """
+        if name not in self._derived:
+            self._derived[name] = build(self)
+        return self._derived[name]
+
+    def get_requisites(self, course_code: str, kind: str) -> Optional[dict]:
+        """
+        Normalized requisite AST of a course (see RequisiteNormalizer).
+        Args:
+            course_code: Course code, e.g. "CIIC4020".
+            kind: "prerequisites" or "corequisites".
+        Returns:
+            The normalized AST, or None if the course has no such requisites.
+        Raises:
+            ValueError: If the course's requisite string could not be parsed.
+        """
+        if (course_code, kind) in self.requisite_errors:
+            raise ValueError(f"Unparseable {kind} for {course_code}")
+        requisites = (
+            self.prerequisites if kind == "prerequisites" else self.corequisites
+        )
+        return requisites.get(course_code)
+
+
+_catalog_snapshot: Optional[CatalogSnapshot] = None
+_catalog_lock = asyncio.Lock()
+
+
+def build_catalog_snapshot(
+    courses: Iterable[Course],
+    year: Optional[int] = None,
+    stored_requisites: Optional[StoredRequisites] = None,
+    version: int = 0,
+) -> Optional[CatalogSnapshot]:
+    """Snapshot from course rows and their stored ASTs. Returns None if there are no courses."""
+    course_lookups = {
+        course_db_obj.course_code: course_lookup_entry(course_db_obj)
+        for course_db_obj in courses
+    }
+    if not course_lookups:
+        return None
+    return CatalogSnapshot(
+        course_lookups, year, stored_requisites=stored_requisites, version=version
+    )
+
+
+async def load_catalog_snapshot(db: AsyncSession) -> Optional[CatalogSnapshot]:
+    """Builds a new snapshot from the database. Returns None if no courses could be loaded."""
+    try:
+        # Read first, so a change committed while loading triggers another reload
+        version = await load_catalog_version_async(db)
+        result = await db.execute(select(Course))
+        courses = result.scalars().all()
+        stored_requisites = await load_stored_requisites_async(db)
+        return build_catalog_snapshot(
+            courses, stored_requisites=stored_requisites, version=version
+        )
+    except Exception as e:
+        logger.error(f"Error loading course data for catalog snapshot: {e}")
+        return None
+
+
+def load_catalog_snapshot_sync(
+    db: Session, year: Optional[int] = None
+) -> Optional[CatalogSnapshot]:
+    """Synchronous counterpart of load_catalog_snapshot, for batch jobs and scripts."""
+    try:
+        version = load_catalog_version(db)
+        courses = db.execute(select(Course)).scalars().all()
+        return build_catalog_snapshot(
+            courses, year, load_stored_requisites(db), version
+        )
+    except Exception as e:
+        logger.error(f"Error loading course data for catalog snapshot: {e}")
+        return None
+
+
+def _is_current(snapshot: Optional[CatalogSnapshot], version: int) -> bool:
+    return (
+        snapshot is not None
+        and snapshot.year == date.today().year
+        and snapshot.version == version
+    )
+
+
+async def get_catalog_snapshot(db: AsyncSession) -> Optional[CatalogSnapshot]:
+    """
+    Process-wide catalog snapshot, loaded on first use and shared by all requests.
+    It is reloaded when the year changes or when catalog_version moves, which the jobs
+    that refresh the catalog from other processes bump along with their changes.
+    """
+    global _catalog_snapshot
+    try:
+        version = await load_catalog_version_async(db)
+    except Exception as e:
+        logger.error(f"Error loading catalog version: {e}")
+        return _catalog_snapshot
+    if _is_current(_catalog_snapshot, version):
+        return _catalog_snapshot
+    async with _catalog_lock:
+        if not _is_current(_catalog_snapshot, version):
+            if _catalog_snapshot is not None:
+                logger.info(
+                    f"Catalog changed (version {_catalog_snapshot.version} -> {version}), reloading snapshot."
+                )
+                invalidate_catalog_snapshot()
+            _catalog_snapshot = await load_catalog_snapshot(db)
+    return _catalog_snapshot
+
+
+def invalidate_catalog_snapshot() -> None:
+    """Drops the shared snapshot so the next request reloads the catalog (e.g. after a refresh)."""
+    global _catalog_snapshot
+    _catalog_snapshot = None
+    default_equivalences.cache_clear()
+    invalidateLatestCourses()
@@ -0,0 +1,309 @@
+import logging
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from data.logic.availability import predict_availability_from_lookup
+from data.logic.catalog import CatalogSnapshot
+from data.logic.recommendation_scheduler import (
+    SchedulerResult,
+    TermData,
+    get_term_credit_limits,
+    term_key_sort_key,
+)
+from data.parser.parser_utils import flatten_requisites_to_list
+from data.parser.requisite_store import parse_filtered_requisites
+
+logger = logging.getLogger(__name__)
+
+DifficultyCurve = Literal["Flat", "Increasing", "Decreasing"]
+
+# How far the first/last term of a sloped curve deviates from the average term,
+# e.g. 0.5 means the hardest term targets 1.5x the average difficulty density.
+CURVE_SLOPE = 0.5
+# Improvements smaller than this are treated as noise to avoid endless swapping.
+MIN_IMPROVEMENT = 1e-9
+
+
+def build_curve_targets(
+    total_difficulty: float, term_credits: np.ndarray, difficulty_curve: str
+) -> np.ndarray:
+    """
+    Distributes the plan's total difficulty across its terms following the requested curve.
+    Targets are proportional to each term's credit load, so a 6 credit summer
+    gets a smaller share than a full semester.
+    Args:
+        total_difficulty: Sum of difficulties of every course in the plan.
+        term_credits: Credits planned per term, in chronological order.
+        difficulty_curve: "Flat", "Increasing" or "Decreasing".
+    Returns:
+        Array with the target difficulty sum for each term.
+    """
+    num_terms = len(term_credits)
+    if difficulty_curve == "Increasing":
+        weights = np.linspace(1 - CURVE_SLOPE, 1 + CURVE_SLOPE, num_terms)
+    elif difficulty_curve == "Decreasing":
+        weights = np.linspace(1 + CURVE_SLOPE, 1 - CURVE_SLOPE, num_terms)
+    else:
+        weights = np.ones(num_terms)
+
+    shares = weights * term_credits
+    if shares.sum() <= 0:
+        return np.zeros(num_terms)
+    return total_difficulty * shares / shares.sum()
+
+
+def _course_dependencies(
+    course_code: str,
+    course_data: Dict,
+    key: str,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> List[str]:
+    """
+    Course codes mentioned in a course's prerequisites or corequisites. Read from the
+    catalog snapshot's stored ASTs when one is given (codes are then the canonical codes
+    of their equivalence classes), otherwise parsed from the lookup entry's raw string.
+    """
+    if catalog is not None:
+        if course_code not in catalog:
+            return []
+        try:
+            return flatten_requisites_to_list(catalog.get_requisites(course_code, key))
+        except ValueError:
+            return []  # Unparseable, the scheduler doesn't place such courses
+    raw = course_data.get(f"{key}_raw")
+    if not raw:
+        return []
+    return flatten_requisites_to_list(parse_filtered_requisites(raw, key))
+
+
+def _build_dependency_edges(
+    courses: List[str],
+    course_lookups: Dict[str, Dict],
+    catalog: Optional[CatalogSnapshot] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ordering constraints between courses of the plan as parallel arrays (src, dst, gap).
+    Each edge means term[src] + gap <= term[dst]: prerequisites need a gap of
+    one term, corequisites may share the term. Requisites satisfied outside the
+    plan (already taken courses) impose no constraint. With a catalog snapshot, a
+    requisite course is satisfied by any planned course equivalent to it, as in the
+    scheduler's checks.
+    """
+    canonical = catalog.equivalences.canonical if catalog is not None else None
+    positions: Dict[str, List[int]] = {}
+    for i, code in enumerate(courses):
+        positions.setdefault(canonical(code) if canonical else code, []).append(i)
+    src, dst, gap = [], [], []
+    for i, code in enumerate(courses):
+        course_data = course_lookups.get(code, {})
+        for key, key_gap in (("prerequisites", 1), ("corequisites", 0)):
+            for dep in _course_dependencies(code, course_data, key, catalog):
+                for j in positions.get(dep, ()):
+                    if j != i:
+                        src.append(j)
+                        dst.append(i)
+                        gap.append(key_gap)
+    return (
+        np.array(src, dtype=np.int64),
+        np.array(dst, dtype=np.int64),
+        np.array(gap, dtype=np.int64),
+    )
+
+
+def rebalance_difficulty(
+    result: SchedulerResult,
+    course_lookups: Dict[str, Dict],
+    difficulty_curve: DifficultyCurve,
+    credit_limits: Dict,
+    max_iterations: Optional[int] = None,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> SchedulerResult:
+    """
+    Post-pass that moves and swaps courses between the terms of a resolved plan so the
+    per-term difficulty sums follow the requested difficulty curve.
+    Placement is scored as a courses x terms matrix: every single-course move and
+    every pairwise swap is evaluated at once with NumPy, and the best improving
+    change is applied until none is left. Changes are only allowed when they keep
+    prerequisite order (corequisites may share a term), the term's credit limits
+    and the predicted availability of the course in the destination term.
+    Args:
+        result: Resolved schedule returned by generate_sequence.
+        course_lookups: Course lookup data (see load_course_data_lookups).
+        difficulty_curve: "Flat", "Increasing" or "Decreasing".
+        credit_limits: Base credit limits ({"min": .., "max": ..}) for Fall/Spring.
+        max_iterations: Maximum number of moves/swaps to apply. Defaults to the number of courses.
+        catalog: Catalog snapshot whose stored requisite ASTs give the ordering
+            constraints. Without one, the lookup entries' raw strings are parsed.
+    Returns:
+        A copy of the result with the rebalanced schedule.
+    """
+    term_keys = sorted(result.schedule.keys(), key=term_key_sort_key)
+    num_terms = len(term_keys)
+    if num_terms < 2:
+        return result
+
+    courses: List[str] = []
+    placement_list: List[int] = []
+    for t, term_key in enumerate(term_keys):
+        for course_code in result.schedule[term_key].courses:
+            courses.append(course_code)
+            placement_list.append(t)
+    num_courses = len(courses)
+    if num_courses < 2:
+        return result
+
+    placement = np.array(placement_list, dtype=np.int64)
+    difficulty = np.array(
+        [course_lookups.get(c, {}).get("difficulty", 0) or 0 for c in courses],
+        dtype=np.float64,
+    )
+    credits = np.array(
+        [course_lookups.get(c, {}).get("credits", 0) or 0 for c in courses],
+        dtype=np.float64,
+    )
+
+    # Per-term limits. A term that is already below its minimum (e.g. the final
+    # term of the plan) may not lose more credits, but is not forced up either.
+    term_limits = [
+        get_term_credit_limits(k.split()[0], credit_limits) for k in term_keys
+    ]
+    max_credits = np.array([lim["max"] for lim in term_limits], dtype=np.float64)
+    min_credits = np.array([lim["min"] for lim in term_limits], dtype=np.float64)
+    initial_term_credits = np.bincount(placement, weights=credits, minlength=num_terms)
+    min_credits = np.minimum(min_credits, initial_term_credits)
+
+    # Availability of each course in each term of the plan (courses x terms).
+    term_types = [k.split()[0] for k in term_keys]
+    available = np.array(
+        [
+            [
+                predict_availability_from_lookup(
+                    course_lookups.get(c, {}), term_type, course_code=c
+                )
+                for term_type in term_types
+            ]
+            for c in courses
+        ],
+        dtype=bool,
+    )
+    # A course is always allowed where the scheduler originally placed it.
+    available[np.arange(num_courses), placement] = True
+
+    edge_src, edge_dst, edge_gap = _build_dependency_edges(
+        courses, course_lookups, catalog
+    )
+    related = np.zeros((num_courses, num_courses), dtype=bool)
+    related[edge_src, edge_dst] = True
+    related[edge_dst, edge_src] = True
+
+    targets = build_curve_targets(
+        difficulty.sum(), initial_term_credits, difficulty_curve
+    )
+    term_range = np.arange(num_terms)
+    if max_iterations is None:
+        max_iterations = num_courses
+
+    applied = 0
+    for _ in range(max_iterations):
+        term_difficulty = np.bincount(
+            placement, weights=difficulty, minlength=num_terms
+        )
+        term_credits = np.bincount(placement, weights=credits, minlength=num_terms)
+        term_sizes = np.bincount(placement, minlength=num_terms)
+        error = term_difficulty - targets
+
+        # Earliest/latest term each course may occupy given where the others are.
+        earliest = np.zeros(num_courses, dtype=np.int64)
+        latest = np.full(num_courses, num_terms - 1, dtype=np.int64)
+        if len(edge_src):
+            np.maximum.at(earliest, edge_dst, placement[edge_src] + edge_gap)
+            np.minimum.at(latest, edge_src, placement[edge_dst] - edge_gap)
+        in_window = (term_range[None, :] >= earliest[:, None]) & (
+            term_range[None, :] <= latest[:, None]
+        )
+        allowed = available & in_window  # courses x terms
+
+        # --- Single course moves (courses x terms) ---
+        src_error = error[placement]  # error of each course's current term
+        move_delta = (
+            ((src_error - difficulty) ** 2 - src_error**2)[:, None]
+            + (error[None, :] + difficulty[:, None]) ** 2
+            - error[None, :] ** 2
+        )
+        move_ok = (
+            allowed
+            & (term_range[None, :] != placement[:, None])
+            & (term_credits[None, :] + credits[:, None] <= max_credits[None, :])
+            & ((term_credits[placement] - credits) >= min_credits[placement])[:, None]
+            & (term_sizes[placement] > 1)[:, None]  # never empty a term
+        )
+        move_delta = np.where(move_ok, move_delta, np.inf)
+
+        # --- Pairwise swaps (courses x courses) ---
+        # Course i (term a) and course j (term b) trade places.
+        shift = difficulty[None, :] - difficulty[:, None]  # change for term a
+        err_a = error[placement][:, None]
+        err_b = error[placement][None, :]
+        swap_delta = (err_a + shift) ** 2 - err_a**2 + (err_b - shift) ** 2 - err_b**2
+        credit_shift = credits[None, :] - credits[:, None]
+        credits_a = term_credits[placement][:, None] + credit_shift
+        credits_b = term_credits[placement][None, :] - credit_shift
+        swap_ok = (
+            (placement[:, None] < placement[None, :])  # each pair once, different terms
+            & allowed[:, placement]  # i may go to j's term
+            & allowed[:, placement].T  # j may go to i's term
+            & ~related
+            & (credits_a <= max_credits[placement][:, None])
+            & (credits_a >= min_credits[placement][:, None])
+            & (credits_b <= max_credits[placement][None, :])
+            & (credits_b >= min_credits[placement][None, :])
+        )
+        swap_delta = np.where(swap_ok, swap_delta, np.inf)
+
+        best_move = np.unravel_index(np.argmin(move_delta), move_delta.shape)
+        best_swap = np.unravel_index(np.argmin(swap_delta), swap_delta.shape)
+        best_move_delta = move_delta[best_move]
+        best_swap_delta = swap_delta[best_swap]
+
+        if min(best_move_delta, best_swap_delta) >= -MIN_IMPROVEMENT:
+            break
+        if best_swap_delta < best_move_delta:
+            i, j = best_swap
+            placement[i], placement[j] = placement[j], placement[i]
+        else:
+            i, t = best_move
+            placement[i] = t
+        applied += 1
+
+    if applied == 0:
+        return result
+
+    # Keep the original within-term order; moved courses go at the end of their new term.
+    new_schedule: Dict[str, TermData] = {key: TermData() for key in term_keys}
+    for course_code, t in zip(courses, placement):
+        term_data = new_schedule[term_keys[t]]
+        course_data = course_lookups.get(course_code, {})
+        term_data.courses.append(course_code)
+        term_data.credits += course_data.get("credits", 0) or 0
+        term_data.difficulty_sum += course_data.get("difficulty", 0) or 0
+
+    logger.info(
+        f"Difficulty rebalancing ({difficulty_curve}) applied {applied} moves/swaps across {num_terms} terms. "
+        f"Curve error: {difficulty_curve_error(result.schedule, difficulty_curve):.2f} -> "
+        f"{difficulty_curve_error(new_schedule, difficulty_curve):.2f}"
+    )
+    return result.model_copy(update={"schedule": new_schedule})
+
+
+def difficulty_curve_error(
+    schedule: Dict[str, TermData], difficulty_curve: DifficultyCurve
+) -> float:
+    """Sum of squared differences between each term's difficulty and its curve target."""
+    term_keys = sorted(schedule.keys(), key=term_key_sort_key)
+    if not term_keys:
+        return 0.0
+    term_difficulty = np.array([schedule[k].difficulty_sum for k in term_keys])
+    term_credits = np.array([schedule[k].credits for k in term_keys], dtype=np.float64)
+    targets = build_curve_targets(term_difficulty.sum(), term_credits, difficulty_curve)
+    return float(((term_difficulty - targets) ** 2).sum())
@@ -0,0 +1,278 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from data.logic.catalog import AVAILABILITY_TERMS, CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Node kinds of the compiled requisite arrays
+LEAF, AND, OR, TRUE, FALSE = range(5)
+
+
+class EligibilityResult(BaseModel):
+    term: str
+    eligible_courses: List[str] = []
+    # Requisites are met but the course is not predicted to be offered in the term
+    not_offered_courses: List[str] = []
+
+
+class CompiledRequisites:
+    """
+    Prerequisites and corequisites of every catalog course flattened into node arrays,
+    so they can be evaluated for the whole catalog at once.
+    Every AST node gets an id. COURSE leaves point to their literals (the course and its
+    equivalences) in a course index, and AND/OR nodes are reduced one depth level at a
+    time. Evaluation works on one student or a whole students x courses matrix.
+    Semantics match check_requisites_recursive.
+    """
+
+    def __init__(self, catalog: CatalogSnapshot):
+        equivalences = catalog.equivalences
+        # Catalog courses come first in the index, then codes only mentioned in requisites
+        self.course_codes: List[str] = list(catalog.course_lookups.keys())
+        self.course_code_array = np.array(self.course_codes, dtype=object)
+        self.num_courses = len(self.course_codes)
+        self.course_index: Dict[str, int] = {
+            code: i for i, code in enumerate(self.course_codes)
+        }
+
+        kinds: List[int] = []
+        parents: List[int] = []
+        depths: List[int] = []
+        lit_node: List[int] = []
+        lit_course: List[int] = []
+
+        def literal(code: str) -> int:
+            if code not in self.course_index:
+                self.course_index[code] = len(self.course_index)
+            return self.course_index[code]
+
+        def add_node(node, parent: int, depth: int) -> int:
+            node_id = len(kinds)
+            parents.append(parent)
+            depths.append(depth)
+            if not node or not isinstance(node, dict):
+                kinds.append(TRUE)
+                return node_id
+            node_type = node.get("type")
+            if node_type == "COURSE":
+                kinds.append(LEAF)
+                code = node.get("value", "").replace(" ", "")
+                for option in equivalences.members(code):
+                    lit_node.append(node_id)
+                    lit_course.append(literal(option))
+            elif node_type in ("AND", "OR", "ANDOR"):
+                children = node.get("value" if node_type == "ANDOR" else "conditions")
+                if node_type == "ANDOR" and not isinstance(children, list):
+                    kinds.append(FALSE)
+                    return node_id
+                kinds.append(AND if node_type == "AND" else OR)
+                for child in children or []:
+                    add_node(child, node_id, depth + 1)
+            elif node_type == "FOR":
+                kinds.append(TRUE)
+            else:
+                kinds.append(FALSE)
+            return node_id
+
+        def add_root(code: str, kind: str) -> int:
+            if (code, kind) in catalog.requisite_errors:
+                # The scheduler skips courses whose requisites can't be parsed
+                parents.append(-1)
+                depths.append(0)
+                kinds.append(FALSE)
+                return len(kinds) - 1
+            requisites = catalog.get_requisites(code, kind)
+            return add_node(requisites, -1, 0) if requisites else -1
+
+        self.prereq_roots = np.array(
+            [add_root(code, "prerequisites") for code in self.course_codes],
+            dtype=np.int64,
+        )
+        self.coreq_roots = np.array(
+            [add_root(code, "corequisites") for code in self.course_codes],
+            dtype=np.int64,
+        )
+
+        self.num_nodes = len(kinds)
+        node_kinds = np.array(kinds, dtype=np.int8)
+        node_parents = np.array(parents, dtype=np.int64)
+        node_depths = np.array(depths, dtype=np.int64)
+        self.lit_course = np.array(lit_course, dtype=np.int64)
+        # Nodes are numbered depth-first, so each leaf's literals and each internal
+        # node's children form contiguous runs that can be reduced with reduceat.
+        lit_node_array = np.array(lit_node, dtype=np.int64)
+        self.leaf_nodes = np.flatnonzero(node_kinds == LEAF)
+        self.leaf_starts = _run_starts(lit_node_array)
+
+        child_count = np.bincount(
+            node_parents[node_parents >= 0], minlength=self.num_nodes
+        )
+        # AND/OR without children are constants (empty AND is met, empty OR isn't)
+        self.constant_values = (node_kinds == TRUE) | (
+            (node_kinds == AND) & (child_count == 0)
+        )
+
+        # Deepest level first: (reduction, parent nodes, children, run starts)
+        self.levels = []
+        max_depth = int(node_depths.max()) if self.num_nodes else -1
+        for depth in range(max_depth, 0, -1):
+            for kind, reduction in ((AND, np.logical_and), (OR, np.logical_or)):
+                children = np.flatnonzero(
+                    (node_depths == depth)
+                    & (node_kinds[np.maximum(node_parents, 0)] == kind)
+                    & (node_parents >= 0)
+                )
+                if not len(children):
+                    continue
+                child_parents = node_parents[children]
+                starts = _run_starts(child_parents)
+                self.levels.append((reduction, child_parents[starts], children, starts))
+
+        # Catalog courses counted as done when one of their equivalences was taken
+        equivalent_pairs = [
+            (self.course_index[code], literal(option))
+            for code in self.course_codes
+            if code in equivalences
+            for option in equivalences.members(code)
+            if option != code
+        ]
+        self.num_literals = len(self.course_index)
+        self.equivalent_course = np.array(
+            [pair[0] for pair in equivalent_pairs], dtype=np.int64
+        )
+        self.equivalent_option = np.array(
+            [pair[1] for pair in equivalent_pairs], dtype=np.int64
+        )
+
+        self._available_by_term: Dict[str, np.ndarray] = {
+            term: np.array(
+                [
+                    code in catalog.availability.offered_in(term)
+                    for code in self.course_codes
+                ],
+                dtype=bool,
+            )
+            for term in AVAILABILITY_TERMS
+        }
+        logger.info(
+            f"Compiled requisites: {self.num_nodes} nodes, {len(self.lit_course)} literals, "
+            f"{len(self.levels)} levels."
+        )
+
+    def completed_mask(self, taken_courses: Iterable[str]) -> np.ndarray:
+        """Boolean mask over the course index of the courses already passed."""
+        completed = np.zeros(self.num_literals, dtype=bool)
+        indexes = [
+            self.course_index[code]
+            for code in taken_courses
+            if code in self.course_index
+        ]
+        completed[indexes] = True
+        return completed
+
+    def available_mask(self, term: str) -> np.ndarray:
+        return self._available_by_term[term.lower()]
+
+    def evaluate(self, completed: np.ndarray) -> np.ndarray:
+        """
+        Value of every node given completed masks over the course index.
+        completed may be a single mask or a (students x course index) matrix.
+        """
+        values = np.broadcast_to(
+            self.constant_values, completed.shape[:-1] + (self.num_nodes,)
+        ).copy()
+        if len(self.leaf_nodes):
+            values[..., self.leaf_nodes] = np.logical_or.reduceat(
+                completed[..., self.lit_course], self.leaf_starts, axis=-1
+            )
+        for reduction, parent_nodes, children, starts in self.levels:
+            values[..., parent_nodes] = reduction.reduceat(
+                values[..., children], starts, axis=-1
+            )
+        return values
+
+    def satisfied(self, roots: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Per catalog course: whether the requisite rooted at roots is met (no requisite = met)."""
+        return np.where(roots >= 0, values[..., roots], True)
+
+    def eligibility_masks(
+        self, completed: np.ndarray, term: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eligible and not-offered masks over the catalog courses for completed mask(s).
+        A course is eligible when it hasn't been taken (or an equivalent of it), its
+        prerequisites are met by the taken courses, its corequisites are met by the taken
+        courses plus the other courses eligible that term, and it is predicted to be offered.
+        Args:
+            completed: Mask over the course index, or a (students x course index) matrix.
+            term: Term to check ("fall", "spring", "firstsummer", ...).
+        Returns:
+            (eligible, not_offered) masks with the leading shape of completed.
+        """
+        n = self.num_courses
+        done = completed[..., :n].copy()
+        for course, option in zip(self.equivalent_course, self.equivalent_option):
+            done[..., course] |= completed[..., option]
+
+        prereq_ok = self.satisfied(self.prereq_roots, self.evaluate(completed))
+        available = self.available_mask(term)
+        candidates = prereq_ok & ~done
+
+        # Corequisites may be taken in the same term as the course
+        with_concurrent = completed.copy()
+        with_concurrent[..., :n] |= candidates & available
+        coreq_ok = self.satisfied(self.coreq_roots, self.evaluate(with_concurrent))
+
+        requisites_met = candidates & coreq_ok
+        return requisites_met & available, requisites_met & ~available
+
+
+def _run_starts(sorted_ids: np.ndarray) -> np.ndarray:
+    """Start index of each run of equal values in a sorted array."""
+    if not len(sorted_ids):
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+
+
+def get_compiled_requisites(catalog: CatalogSnapshot) -> CompiledRequisites:
+    return catalog.get_derived("compiled_requisites", CompiledRequisites)
+
+
+def find_eligible_courses(
+    catalog: CatalogSnapshot,
+    taken_courses: Iterable[str],
+    term: str,
+    course_codes: Optional[Iterable[str]] = None,
+) -> EligibilityResult:
+    """
+    Courses a student can take in a term, evaluated for the whole catalog in one pass
+    (see CompiledRequisites.eligibility_masks for the rules).
+    Args:
+        catalog: Shared catalog snapshot.
+        taken_courses: Course codes already passed.
+        term: Term to check ("fall", "spring", "firstsummer", ...).
+        course_codes: Restrict the answer to these courses (e.g. a program's). Defaults to all.
+    Returns:
+        EligibilityResult with eligible and not-offered course codes, sorted.
+    """
+    compiled = get_compiled_requisites(catalog)
+    n = compiled.num_courses
+    eligible, not_offered = compiled.eligibility_masks(
+        compiled.completed_mask(taken_courses), term
+    )
+    if course_codes is not None:
+        scope = np.zeros(n, dtype=bool)
+        indexes = [compiled.course_index.get(code, n) for code in course_codes]
+        scope[[i for i in indexes if i < n]] = True  # Only catalog courses
+        eligible &= scope
+        not_offered &= scope
+
+    return EligibilityResult(
+        term=term.lower(),
+        eligible_courses=sorted(compiled.course_code_array[eligible]),
+        not_offered_courses=sorted(compiled.course_code_array[not_offered]),
+    )
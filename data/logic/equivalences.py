@@ -0,0 +1,124 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+EQUIVALENCES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "input_files",
+    "equivalences.txt",
+)
+
+
+def read_equivalence_classes(path: str = EQUIVALENCES_PATH) -> List[List[str]]:
+    """
+    Reads equivalence classes: one line per class with comma separated course codes,
+    e.g. "INGE3016, CIIC3015". Text after '#' is ignored.
+    Args:
+        path: Path to the equivalences file.
+    Returns:
+        List of classes (course codes without spaces). Empty if the file doesn't exist.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Equivalences file {path} not found, no equivalences loaded.")
+        return []
+    classes = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            codes = [
+                "".join(code.split()).upper()
+                for code in line.split("#", 1)[0].split(",")
+                if code.strip()
+            ]
+            if len(codes) == 1:
+                logger.warning(
+                    f"{path}:{line_number}: equivalence class with a single course ignored."
+                )
+            elif codes:
+                classes.append(codes)
+    return classes
+
+
+class EquivalenceIndex:
+    """
+    Course equivalence classes closed transitively (classes sharing a course are merged
+    with union-find), each represented by a canonical code: the smallest code in the class.
+    Lookups return precomputed values, so checks don't allocate.
+    """
+
+    def __init__(self, classes: Iterable[Iterable[str]] = ()):
+        parent: Dict[str, str] = {}
+
+        def find(code: str) -> str:
+            root = code
+            while parent[root] != root:
+                root = parent[root]
+            while parent[code] != root:  # Path compression
+                parent[code], code = root, parent[code]
+            return root
+
+        for equivalence_class in classes:
+            codes = list(equivalence_class)
+            for code in codes:
+                parent.setdefault(code, code)
+            for code in codes[1:]:
+                root_a, root_b = find(codes[0]), find(code)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        grouped: Dict[str, Set[str]] = {}
+        for code in parent:
+            grouped.setdefault(find(code), set()).add(code)
+
+        self._canonical: Dict[str, str] = {}
+        self._members: Dict[str, FrozenSet[str]] = {}
+        for codes in grouped.values():
+            members = frozenset(codes)
+            canonical = min(members)
+            for code in members:
+                self._canonical[code] = canonical
+                self._members[code] = members
+
+    def __len__(self) -> int:
+        """Number of equivalence classes."""
+        return len(set(self._canonical.values()))
+
+    def __contains__(self, course_code: object) -> bool:
+        """Whether the course has at least one equivalent course."""
+        return course_code in self._canonical
+
+    def canonical(self, course_code: str) -> str:
+        """Canonical code of the course's class (the code itself when it has no equivalences)."""
+        return self._canonical.get(course_code, course_code)
+
+    def members(self, course_code: str) -> FrozenSet[str]:
+        """Every course equivalent to course_code, including itself."""
+        members = self._members.get(course_code)
+        return members if members is not None else frozenset((course_code,))
+
+    def equivalent(self, course_a: str, course_b: str) -> bool:
+        return self.canonical(course_a) == self.canonical(course_b)
+
+    def expand(self, course_codes: Iterable[str]) -> Set[str]:
+        """The given courses plus all their equivalents."""
+        expanded = set()
+        for code in course_codes:
+            expanded |= self.members(code)
+        return expanded
+
+    def classes(self) -> List[FrozenSet[str]]:
+        return list({members for members in self._members.values()})
+
+
+def load_equivalences(path: str = EQUIVALENCES_PATH) -> EquivalenceIndex:
+    index = EquivalenceIndex(read_equivalence_classes(path))
+    logger.info(f"Loaded {len(index)} course equivalence classes from {path}.")
+    return index
+
+
+@lru_cache(maxsize=1)
+def default_equivalences() -> EquivalenceIndex:
+    """Process-wide index for code paths that don't have a catalog snapshot."""
+    return load_equivalences()
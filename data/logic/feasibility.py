@@ -0,0 +1,322 @@
+import json
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from data.database.database import Program
+from data.logic.availability import predict_availability_from_lookup
+from data.logic.catalog import AvailabilityIndex
+from data.logic.equivalences import EquivalenceIndex, default_equivalences
+from data.logic.recommendation_scheduler import (
+    TERM_SEQUENCE,
+    get_course_category,
+    get_next_term,
+    get_term_credit_limits,
+)
+from data.parser.prerequisite_graph import PrerequisiteGraph
+
+logger = logging.getLogger(__name__)
+
+# How many terms past the target we look for the earliest possible graduation.
+MAX_EXTRA_TERMS = 40
+UNREACHABLE = math.inf
+
+
+class FeasibilityResult(BaseModel):
+    is_feasible: bool
+    min_terms_required: Optional[int] = None  # None if a course can never be scheduled
+    terms_available: int
+    earliest_graduation_term: Optional[str] = None
+    remaining_credits: int = 0
+    credits_completed: int = 0  # Credits already counting towards the program
+    longest_remaining_chain: int = 0
+    critical_path: List[str] = []
+    blocking_courses: List[str] = []
+    reasons: List[str] = []
+
+
+def _build_term_slots(
+    start_term: str,
+    start_year: int,
+    target_term: str,
+    target_year: int,
+    include_summers: bool = True,
+) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    Terms from the start term onwards, as (term, year) pairs in scheduler term-key space.
+    Returns the slots (extending MAX_EXTRA_TERMS past the target) and how many of them
+    fall on or before the target term.
+    """
+    target_order = (target_year, TERM_SEQUENCE.index(target_term.lower()))
+    slots: List[Tuple[str, int]] = []
+    terms_available = 0
+    term, year = start_term.lower(), start_year
+    while True:
+        if include_summers or not term.endswith("summer"):
+            if (year, TERM_SEQUENCE.index(term)) <= target_order:
+                terms_available += 1
+            elif len(slots) >= terms_available + MAX_EXTRA_TERMS:
+                break
+            slots.append((term, year))
+        next_term = get_next_term(term, year)
+        term, year = next_term["term"], next_term["year"]
+    return slots, terms_available
+
+
+def _is_satisfied(
+    course_code: str, taken_courses: Set[str], equivalences: EquivalenceIndex
+) -> bool:
+    if course_code in taken_courses:
+        return True
+    return course_code in equivalences and any(
+        option in taken_courses for option in equivalences.members(course_code)
+    )
+
+
+def check_graduation_feasibility(
+    program_reqs: Program,
+    course_lookups: Dict[str, Dict],
+    taken_courses: Set[str],
+    specific_elective_credits_initial: Dict[str, int],
+    credit_limits: Dict,
+    start_term: str,
+    start_year: int,
+    target_term: str,
+    target_year: int,
+    include_summers: bool = True,
+    availability: Optional[AvailabilityIndex] = None,
+    equivalences: Optional[EquivalenceIndex] = None,
+) -> FeasibilityResult:
+    """
+    Computes lower bounds on the number of terms needed to finish a program, without
+    running the scheduler. O(V+E) over the program's prerequisite graph.
+    Three bounds are combined:
+        - Prerequisite chains: a remaining course can't be taken before the term after
+          its prerequisites (AND takes the latest option, OR the earliest one).
+        - Offerings: a course is pushed to the next term type it is predicted to be offered in.
+        - Credits: remaining credits must fit in the max load of the terms used.
+    Args:
+        program_reqs: Program row (courses JSON holds each course's filtered prerequisites).
+        course_lookups: Course lookup data (see load_course_data_lookups).
+        taken_courses: Course codes already passed.
+        specific_elective_credits_initial: Credits already completed per category.
+        credit_limits: Base credit limits ({"min": .., "max": ..}) for Fall/Spring.
+        start_term: First term the scheduler would plan (e.g. "fall").
+        start_year: Year of start_term.
+        target_term: Target graduation term ("Fall" or "Spring").
+        target_year: Target graduation year.
+        include_summers: Whether summer terms can be used.
+        availability: Shared availability index; predicted from the lookups if not given.
+        equivalences: Course equivalence classes; the default ones if not given.
+    Returns:
+        FeasibilityResult with the verdict and the bounds that produced it.
+    """
+    try:
+        program_courses = json.loads(program_reqs.courses or "{}")
+        technical_pool = set(json.loads(program_reqs.technical_courses or "{}").keys())
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse program JSON for {program_reqs.code}: {e}")
+        raise
+
+    equivalences = equivalences or default_equivalences()
+    required_codes = set(program_courses.keys())
+    slots, terms_available = _build_term_slots(
+        start_term, start_year, target_term, target_year, include_summers
+    )
+    slot_capacity = [
+        get_term_credit_limits(term, credit_limits)["max"] for term, _ in slots
+    ]
+
+    offered_cache: Dict[Tuple[str, str], bool] = {}
+
+    def first_offered_slot(course_code: str, from_slot: float) -> float:
+        """First slot index >= from_slot in which the course is predicted to be offered."""
+        if from_slot == UNREACHABLE:
+            return UNREACHABLE
+        course_data = course_lookups.get(course_code)
+        if course_data is None:
+            return UNREACHABLE
+        for index in range(int(from_slot), len(slots)):
+            term = slots[index][0]
+            key = (course_code, term)
+            if key not in offered_cache:
+                if availability is not None:
+                    offered_cache[key] = availability.is_available(course_code, term)
+                else:
+                    offered_cache[key] = predict_availability_from_lookup(
+                        course_data, term, course_code=course_code
+                    )
+            if offered_cache[key]:
+                return index
+        return UNREACHABLE
+
+    remaining_required = sorted(
+        code
+        for code in required_codes
+        if not _is_satisfied(code, taken_courses, equivalences)
+    )
+    # Components of the remaining courses' prerequisite graph come prerequisites first
+    graph = PrerequisiteGraph(
+        {
+            code: program_courses.get(code, {}).get("prerequisites") or {}
+            for code in remaining_required
+        }
+    )
+
+    # earliest[c] = (earliest slot index, course that determined it)
+    earliest: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def ready_slot(req: dict, component: int) -> Tuple[float, Optional[str]]:
+        """Earliest slot in which a requisite expression can be satisfied."""
+        if not req or not isinstance(req, dict):
+            return 0, None
+        req_type = req.get("type")
+        if req_type == "COURSE":
+            code = req.get("value", "").replace(" ", "")
+            if _is_satisfied(code, taken_courses, equivalences):
+                return 0, None
+            if code in required_codes:
+                if graph.component_of[graph.ids[code]] == component:
+                    # A prerequisite cycle can't be ordered, so requisites between its
+                    # courses don't delay them
+                    return 0, None
+                slot = earliest[code][0]
+            else:
+                # Outside the program: needs at least one term of its own.
+                slot = first_offered_slot(code, 0)
+            return (slot + 1 if slot != UNREACHABLE else UNREACHABLE), code
+        if req_type in ("AND", "OR"):
+            options = [
+                ready_slot(cond, component) for cond in req.get("conditions", [])
+            ]
+            if not options:
+                return 0, None
+            pick = max if req_type == "AND" else min
+            return pick(options, key=lambda option: option[0])
+        return 0, None  # Non-course requirements don't delay the plan
+
+    remaining = set(remaining_required)
+    for component, members in enumerate(graph.components):
+        for node in members:
+            code = graph.codes[node]
+            if code not in remaining:
+                continue  # Only mentioned as a prerequisite
+            prereqs = program_courses.get(code, {}).get("prerequisites") or {}
+            ready, via = ready_slot(prereqs, component)
+            earliest[code] = (first_offered_slot(code, ready), via)
+
+    reasons: List[str] = []
+    unschedulable = [c for c in remaining_required if earliest[c][0] == UNREACHABLE]
+    if unschedulable:
+        reasons.append(
+            f"{len(unschedulable)} required course(s) are not predicted to be offered "
+            f"in any available term: {unschedulable[:5]}{'...' if len(unschedulable) > 5 else ''}"
+        )
+
+    # Chain bound (with offerings folded in) and the critical chain behind it.
+    chain_terms = 0
+    critical_chain: List[str] = []
+    reachable = [c for c in remaining_required if earliest[c][0] != UNREACHABLE]
+    if reachable:
+        last = max(reachable, key=lambda c: earliest[c][0])
+        chain_terms = int(earliest[last][0]) + 1
+        node: Optional[str] = last
+        while node is not None and node not in critical_chain:
+            critical_chain.append(node)
+            node = earliest.get(node, (0, None))[1]
+        critical_chain.reverse()
+
+    # Credit bound
+    remaining_credits = sum(
+        course_lookups.get(code, {}).get("credits", 0) or 0
+        for code in remaining_required
+    )
+    credits_met_for_category: Dict[str, int] = defaultdict(int)
+    for category, credits in specific_elective_credits_initial.items():
+        credits_met_for_category[category] += credits or 0
+    required_equivalents = equivalences.expand(required_codes)
+    for code in taken_courses:
+        if code in required_equivalents:
+            continue
+        category = get_course_category(
+            code,
+            required_codes,
+            technical_pool,
+            group_sociohumanistics=(program_reqs.sociohumanistics or 0) > 0,
+        )
+        credits_met_for_category[category] += (
+            course_lookups.get(code, {}).get("credits", 0) or 0
+        )
+    credits_completed = sum(
+        course_lookups.get(code, {}).get("credits", 0) or 0
+        for code in required_codes
+        if _is_satisfied(code, taken_courses, equivalences)
+    )
+    for category in (
+        "english",
+        "spanish",
+        "humanities",
+        "social",
+        "sociohumanistics",
+        "technical",
+        "free",
+        "kinesiology",
+    ):
+        target = getattr(program_reqs, category) or 0
+        remaining_credits += max(0, target - credits_met_for_category[category])
+        credits_completed += min(target, credits_met_for_category[category])
+
+    credit_terms = 0
+    capacity_so_far = 0
+    while capacity_so_far < remaining_credits and credit_terms < len(slots):
+        capacity_so_far += slot_capacity[credit_terms]
+        credit_terms += 1
+    if capacity_so_far < remaining_credits:
+        credit_terms = len(slots) + 1  # Not even the extended horizon is enough
+
+    min_terms_required: Optional[int] = max(chain_terms, credit_terms)
+    if unschedulable:
+        min_terms_required = None
+
+    earliest_graduation_term = None
+    if min_terms_required and min_terms_required <= len(slots):
+        term, year = slots[min_terms_required - 1]
+        earliest_graduation_term = f"{term.capitalize()} {year}"
+
+    is_feasible = min_terms_required is not None and (
+        min_terms_required <= terms_available
+    )
+    blocking_courses = list(unschedulable)
+    if not is_feasible and min_terms_required is not None:
+        if chain_terms > terms_available:
+            reasons.append(
+                f"Longest remaining prerequisite chain needs at least {chain_terms} terms "
+                f"but only {terms_available} are available: {' -> '.join(critical_chain)}"
+            )
+            blocking_courses.extend(critical_chain)
+        if credit_terms > terms_available:
+            reasons.append(
+                f"{remaining_credits} remaining credits need at least {credit_terms} terms "
+                f"at the maximum load, but only {terms_available} are available."
+            )
+
+    result = FeasibilityResult(
+        is_feasible=is_feasible,
+        min_terms_required=min_terms_required,
+        terms_available=terms_available,
+        earliest_graduation_term=earliest_graduation_term,
+        remaining_credits=remaining_credits,
+        credits_completed=credits_completed,
+        longest_remaining_chain=len(critical_chain),
+        critical_path=critical_chain,
+        blocking_courses=blocking_courses,
+        reasons=reasons,
+    )
+    logger.info(
+        f"Feasibility precheck for {program_reqs.code}: feasible={is_feasible}, "
+        f"min terms={min_terms_required}, available={terms_available}"
+    )
+    return result
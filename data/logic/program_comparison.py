@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from data.database.database import Program
+from data.logic.catalog import CatalogSnapshot
+from data.logic.equivalences import EquivalenceIndex
+from data.logic.feasibility import check_graduation_feasibility
+from data.logic.recommendation_scheduler import (
+    TERM_SEQUENCE,
+    generate_sequence,
+    term_key_sort_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProgramComparison(BaseModel):
+    program_code: str
+    program_name: str
+    is_complete: bool  # Whether the generated plan finishes the program
+    terms_to_graduate: Optional[int] = None  # Terms with courses, None if incomplete
+    expected_graduation_term: Optional[str] = None
+    # Credits already passed that count towards the program
+    credits_transferred: int = 0
+    remaining_credits: int = 0
+    blocking_courses: List[str] = []
+    critical_path: List[str] = []
+    warnings: List[str] = []
+
+
+def _missing_required_courses(
+    program_reqs: Program, taken: Set[str], equivalences: EquivalenceIndex
+) -> List[str]:
+    required_codes = json.loads(program_reqs.courses or "{}").keys()
+    return sorted(
+        code
+        for code in required_codes
+        if not any(option in taken for option in equivalences.members(code))
+    )
+
+
+def evaluate_program(
+    program_reqs: Program,
+    catalog: CatalogSnapshot,
+    taken_courses: Set[str],
+    specific_elective_credits_initial: Dict[str, int],
+    credit_limits: Dict,
+    start_term: str,
+    start_year: int,
+    max_terms: int,
+) -> ProgramComparison:
+    """
+    Plans one program for a student against the shared catalog snapshot and condenses
+    the result. Runs its own event loop so several programs can be planned in threads.
+    Args:
+        program_reqs: Program row to evaluate.
+        catalog: Shared catalog snapshot (lookups, parsed requisites, availability).
+        taken_courses: Course codes already passed.
+        specific_elective_credits_initial: Credits already completed per category.
+        credit_limits: Base credit limits ({"min": .., "max": ..}) for Fall/Spring.
+        start_term: First term to plan (scheduler term name, e.g. "fall").
+        start_year: Year of start_term.
+        max_terms: Planning horizon in terms.
+    Returns:
+        ProgramComparison for the program.
+    """
+    course_lookups = catalog.course_lookups
+    # Horizon end (in years) doubles as the feasibility target
+    target_year = start_year + max(1, max_terms // len(TERM_SEQUENCE))
+    feasibility = check_graduation_feasibility(
+        program_reqs=program_reqs,
+        course_lookups=course_lookups,
+        taken_courses=taken_courses,
+        specific_elective_credits_initial=specific_elective_credits_initial,
+        credit_limits=credit_limits,
+        start_term=start_term,
+        start_year=start_year,
+        target_term="fall",
+        target_year=target_year,
+        availability=catalog.availability,
+        equivalences=catalog.equivalences,
+    )
+
+    result, _ = asyncio.run(
+        generate_sequence(
+            program_reqs=program_reqs,
+            course_lookups=course_lookups,
+            start_term_name=start_term,
+            start_year=start_year,
+            initial_taken_courses_set=set(taken_courses),
+            specific_elective_credits_initial=specific_elective_credits_initial,
+            credit_limits=credit_limits,
+            db_session=None,
+            max_terms=max_terms,
+            catalog=catalog,
+        )
+    )
+
+    comparison = ProgramComparison(
+        program_code=program_reqs.code,
+        program_name=program_reqs.name,
+        is_complete=bool(result and result.is_complete),
+        credits_transferred=feasibility.credits_completed,
+        remaining_credits=feasibility.remaining_credits,
+        critical_path=feasibility.critical_path,
+    )
+    blocking_courses = list(feasibility.blocking_courses)
+    if result is None:
+        comparison.warnings.append("Could not generate a plan for this program.")
+    else:
+        comparison.warnings.extend(result.warnings)
+        planned_terms = [
+            term_key
+            for term_key in sorted(result.schedule.keys(), key=term_key_sort_key)
+            if result.schedule[term_key].courses
+        ]
+        if result.is_complete:
+            comparison.terms_to_graduate = len(planned_terms)
+            if planned_terms:
+                comparison.expected_graduation_term = planned_terms[-1]
+        else:
+            planned = set(taken_courses)
+            for term_data in result.schedule.values():
+                planned.update(term_data.courses)
+            blocking_courses.extend(
+                _missing_required_courses(program_reqs, planned, catalog.equivalences)
+            )
+    comparison.blocking_courses = list(dict.fromkeys(blocking_courses))
+    return comparison
+
+
+async def compare_programs(
+    programs: List[Program],
+    catalog: CatalogSnapshot,
+    taken_courses: Set[str],
+    specific_elective_credits_initial: Dict[str, int],
+    credit_limits: Dict,
+    start_term: str,
+    start_year: int,
+    max_terms: int,
+) -> List[ProgramComparison]:
+    """
+    Evaluates several programs for the same student concurrently. Every program shares
+    the same catalog snapshot, so nothing is reloaded or reparsed per program, and the
+    planning runs in worker threads without blocking the event loop.
+    Returns the comparisons in the same order as programs.
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    evaluate_program,
+                    program_reqs,
+                    catalog,
+                    taken_courses,
+                    specific_elective_credits_initial,
+                    credit_limits,
+                    start_term,
+                    start_year,
+                    max_terms,
+                )
+                for program_reqs in programs
+            )
+        )
+    )
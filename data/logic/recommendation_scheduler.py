@@ -6,7 +6,18 @@ import math
 import random
 import statistics
 from collections import defaultdict
-from typing import Any, List, Dict, Set, Optional, Tuple, Literal
+from typing import (
+    Any,
+    Container,
+    Iterable,
+    List,
+    Dict,
+    Mapping,
+    Set,
+    Optional,
+    Tuple,
+    Literal,
+)
 
 # from data.models import course # Assuming this import is not strictly needed for the provided snippet
 from pydantic import BaseModel, Field
@@ -14,12 +25,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from data.database.database import Program, Course
 from data.logic.availability import predict_availability
+from data.logic.catalog import CatalogSnapshot, course_lookup_entry
+from data.logic.equivalences import EquivalenceIndex, default_equivalences
+from data.logic.scoring import ScoringEngine, ScoringWeights, get_scoring_engine
+from data.logic.requisite_predicates import get_course_index, get_requisite_compiler
+from data.logic.term_state import CourseIndex, TermState
 
-from data.parser.parser_utils import (
-    parse_prerequisites,
-    parse_corequisites,
-    filter_parsed_requisites,
-)
+from data.parser.requisite_store import parse_checked_requisites
 
 logger = logging.getLogger(__name__)
 # Configure basic logging if not already configured by the application
@@ -36,11 +48,9 @@ if not logger.hasHandlers():
         ],
     )
 
-equivalences_dict = {
-    "INGE3016": {
-        "CIIC3015",
-    },
-}
+# Order of terms within a calendar year, as used in term keys like "Fall 2025"
+TERM_SEQUENCE = ["spring", "firstsummer", "secondsummer", "fall"]
+SUMMER_CREDIT_LIMITS = {"min": 0, "max": 6}
 
 
 # Pydantic models
@@ -113,6 +123,24 @@ async def load_program_data(program_code: str, db: AsyncSession) -> Optional[Pro
         return None
 
 
+async def load_programs_data(
+    program_codes: List[str], db: AsyncSession
+) -> Dict[str, Program]:
+    """Loads several programs with a single query. Missing codes are left out of the result."""
+    try:
+        result = await db.execute(
+            select(Program).where(Program.code.in_(program_codes))
+        )
+        programs = {program.code: program for program in result.scalars().all()}
+        logger.info(
+            f"Loaded program data for {len(programs)}/{len(program_codes)} programs"
+        )
+        return programs
+    except Exception as e:
+        logger.error(f"Error loading program data for {program_codes}: {e}")
+        return {}
+
+
 async def load_course_data_lookups(db: AsyncSession) -> Dict[str, Dict]:
     lookup = {}
     try:
@@ -120,18 +148,7 @@ async def load_course_data_lookups(db: AsyncSession) -> Dict[str, Dict]:
         result = await db.execute(stmt)
         all_courses_db = result.scalars().all()  # Renamed to avoid conflict
         for course_db_obj in all_courses_db:
-            lookup[course_db_obj.course_code] = {
-                "credits": course_db_obj.credits or 0,
-                "difficulty": course_db_obj.difficulty or 0,
-                "highest_ancestor": course_db_obj.highest_ancestor or 0,
-                "prerequisites_raw": course_db_obj.prerequisites,
-                "corequisites_raw": course_db_obj.corequisites,
-                "last_Fall": course_db_obj.last_Fall or 0,
-                "last_Spring": course_db_obj.last_Spring or 0,
-                "last_FirstSummer": course_db_obj.last_FirstSummer or 0,
-                "last_SecondSummer": course_db_obj.last_SecondSummer or 0,
-                "last_ExtendedSummer": course_db_obj.last_ExtendedSummer or 0,
-            }
+            lookup[course_db_obj.course_code] = course_lookup_entry(course_db_obj)
         logger.info(f"Loaded lookup data for {len(lookup)} courses.")
     except Exception as e:
         logger.error(f"Error loading course lookup data: {e}")
@@ -139,7 +156,75 @@ async def load_course_data_lookups(db: AsyncSession) -> Dict[str, Dict]:
     return lookup
 
 
-def check_requisites_recursive(req_dict: dict, completed_courses: Set[str]) -> bool:
+def get_filtered_requisites(
+    course_code: str,
+    course_data: Dict,
+    kind: str,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> Optional[dict]:
+    """
+    Filtered prerequisite or corequisite AST of a course. Uses the catalog snapshot's
+    pre-parsed requisites when one is given, otherwise parses the raw string.
+    Raises ValueError if the requisite string can't be parsed.
+    """
+    if catalog is not None and course_code in catalog:
+        return catalog.get_requisites(course_code, kind)
+    raw = course_data.get(f"{kind}_raw")
+    if not raw:
+        return None
+    requisites, error = parse_checked_requisites(raw, kind)
+    if error:
+        raise ValueError(f"Unparseable {kind} for {course_code}: {error}")
+    return requisites
+
+
+def requisites_met(
+    course_code: str,
+    course_data: Dict,
+    kind: str,
+    completed_courses: Container[str],
+    catalog: Optional[CatalogSnapshot] = None,
+) -> bool:
+    """
+    Whether a course's prerequisites or corequisites are met. Runs the catalog's compiled
+    predicate when completed_courses is a TermState over the catalog's course index,
+    otherwise checks the AST with check_requisites_recursive.
+    Requisites the catalog knows to be unparseable (see requisite_parse_errors) are
+    never met, so those courses are skipped without raising and logging on every check.
+    Raises ValueError if a requisite string outside the catalog can't be parsed.
+    """
+    if catalog is not None and (course_code, kind) in catalog.requisite_errors:
+        return False
+    if (
+        catalog is not None
+        and course_code in catalog
+        and isinstance(completed_courses, TermState)
+    ):
+        compiler = get_requisite_compiler(catalog)
+        if completed_courses.index is compiler.index:
+            predicate = compiler.compile(catalog.get_requisites(course_code, kind))
+            return predicate(completed_courses.bits)
+    return check_requisites_recursive(
+        get_filtered_requisites(course_code, course_data, kind, catalog),
+        completed_courses,
+    )
+
+
+async def is_course_available(
+    course_code: str,
+    term: str,
+    db_session: Optional[AsyncSession],
+    catalog: Optional[CatalogSnapshot] = None,
+) -> bool:
+    """Predicted availability, from the catalog's availability index when one is given."""
+    if catalog is not None:
+        return catalog.availability.is_available(course_code, term)
+    return await predict_availability(course_code, term, db_session)
+
+
+def check_requisites_recursive(
+    req_dict: dict, completed_courses: Container[str]
+) -> bool:
     if not req_dict or not isinstance(req_dict, dict):
         return True
 
@@ -147,10 +232,14 @@ def check_requisites_recursive(req_dict: dict, completed_courses: Set[str]) -> b
 
     if req_type == "COURSE":
         course_code = req_dict.get("value", "").replace(" ", "")
-        if course_code in equivalences_dict:
-            options = equivalences_dict[course_code].union({course_code})
-            return any(option in completed_courses for option in options)
-        return course_code in completed_courses
+        if course_code in completed_courses:
+            return True
+        if isinstance(completed_courses, TermState):
+            return False  # Membership already covers the course's equivalences
+        equivalences = default_equivalences()
+        return course_code in equivalences and any(
+            option in completed_courses for option in equivalences.members(course_code)
+        )
     elif req_type == "AND":
         conditions = req_dict.get("conditions", [])
         if not conditions:
@@ -233,6 +322,37 @@ def get_course_category(
     return "free"  # Default to free if no other category matches
 
 
+def tally_category_credits(
+    course_codes: Iterable[str],
+    course_lookups: Dict[str, Dict],
+    program_specific_required_codes: Set[str],
+    program_technical_elective_pool: Set[str],
+    group_sociohumanistics: bool,
+    equivalences: Optional[EquivalenceIndex] = None,
+) -> Dict[str, int]:
+    """
+    Credits per category of the given courses. Specific required courses (and courses
+    equivalent to them) don't count.
+    """
+    required_equivalents = (equivalences or default_equivalences()).expand(
+        program_specific_required_codes
+    )
+    credits_by_category: Dict[str, int] = defaultdict(int)
+    for course_code in course_codes:
+        if course_code in required_equivalents:
+            continue
+        course_data = course_lookups.get(course_code)
+        if course_data:
+            category = get_course_category(
+                course_code,
+                program_specific_required_codes,
+                program_technical_elective_pool,
+                group_sociohumanistics=group_sociohumanistics,
+            )
+            credits_by_category[category] += course_data["credits"]
+    return credits_by_category
+
+
 def get_course_priority(category: str) -> float:
     PRIORITY_MAP = {
         "required": 1.0,
@@ -250,7 +370,7 @@ def get_course_priority(category: str) -> float:
 
 def get_next_term(current_term: str, current_year: int) -> Dict[str, Any]:
     current_term_lower = current_term.lower()
-    TERMS = ["spring", "firstsummer", "secondsummer", "fall"]
+    TERMS = TERM_SEQUENCE
     try:
         current_term_index = TERMS.index(current_term_lower)
     except ValueError:
@@ -269,17 +389,39 @@ def get_next_term(current_term: str, current_year: int) -> Dict[str, Any]:
     return {"term": next_term_name, "year": next_year}
 
 
+def term_key_sort_key(term_key: str) -> Tuple[int, int]:
+    """Sort key for term keys like "Fall 2025" (year first, then term order)."""
+    term_name, term_year = term_key.split()
+    return int(term_year), TERM_SEQUENCE.index(term_name.lower())
+
+
+def get_term_credit_limits(term: str, credit_limits: Dict) -> Dict:
+    """Credit limits that apply to a term; summer terms use SUMMER_CREDIT_LIMITS."""
+    if term.lower().endswith("summer"):
+        return SUMMER_CREDIT_LIMITS.copy()
+    return credit_limits.copy()
+
+
 def _is_program_complete_v2(
     program_reqs: Program,
-    current_taken_courses: Set[str],
+    current_taken_courses: Iterable[str],
     specific_elective_credits_initial,
     course_lookups: Dict[str, Dict],
     program_specific_required_codes: Set[str],
     program_technical_elective_pool: Set[str],
     context_message: str = "Program completion check",
+    equivalences: Optional[EquivalenceIndex] = None,
 ) -> bool:
-    if not program_specific_required_codes.issubset(current_taken_courses):
-        missing_specific = program_specific_required_codes - current_taken_courses
+    equivalences = equivalences or default_equivalences()
+    missing_specific = {
+        code
+        for code in program_specific_required_codes
+        if not any(
+            option in current_taken_courses for option in equivalences.members(code)
+        )
+    }
+    required_equivalents = equivalences.expand(program_specific_required_codes)
+    if missing_specific:
         logger.info(
             f"{context_message}: Incomplete. Missing specific courses ({len(missing_specific)}): {list(missing_specific)[:5]}{'...' if len(missing_specific) > 5 else ''}"
         )
@@ -287,7 +429,7 @@ def _is_program_complete_v2(
 
     credits_met_for_category = defaultdict(int)
     for course_code_val in current_taken_courses:
-        if course_code_val not in program_specific_required_codes:
+        if course_code_val not in required_equivalents:
             category = get_course_category(
                 course_code_val,
                 program_specific_required_codes,
@@ -340,19 +482,22 @@ async def generate_semester(
     course_lookups: Dict[str, Dict],
     term: str,
     year: int,
-    resolved_courses_before_this_term: Set[str],
-    category_credits_met_by_prior_resolved_courses: Dict[str, int],
+    resolved_courses_before_this_term: TermState,
+    category_credits_met_by_prior_resolved_courses: Mapping[str, int],
     target_difficulty: float,
     credit_limits: Dict,  # Base credit limits
-    db_session: AsyncSession,
+    db_session: Optional[AsyncSession],
     exclusion_list: Optional[List[Requirement]] = None,
+    catalog: Optional[CatalogSnapshot] = None,
+    scoring_weights: Optional[ScoringWeights] = None,
+    scoring_engine: Optional[ScoringEngine] = None,
 ) -> tuple[
     TermRequisiteData, bool
 ]:  # Returns (TermSkeleton, EstimatedProgramCompletionAfterThisSkeleton)
 
-    current_credit_limits = credit_limits.copy()  # Use a copy to modify for summer
-    if term.lower().endswith("summer"):
-        current_credit_limits = {"min": 0, "max": 6}  # Override for summer terms
+    current_credit_limits = get_term_credit_limits(
+        term, credit_limits
+    )  # Summer terms override the base limits
 
     term_id_str = f"{term.capitalize()} {year}"
     logger.info(
@@ -372,16 +517,16 @@ async def generate_semester(
         raise
 
     program_specific_required_codes = set(required_courses_req_data_json.keys())
-    program_technical_elective_pool = set(
-        json.loads(program_reqs.technical_courses or "{}").keys()
-    )
-
     current_semester_requirements_pool: List[Requirement] = []
+    # Specific courses come from the required set, so their category is always "required"
+    required_priority = get_course_priority("required")
 
     # 1. Add specific required courses to the pool if eligible
-    remaining_specific_course_codes = (
-        program_specific_required_codes - resolved_courses_before_this_term
-    )
+    remaining_specific_course_codes = {
+        code
+        for code in program_specific_required_codes
+        if code not in resolved_courses_before_this_term
+    }
     for course_code in remaining_specific_course_codes:
         course_data = course_lookups.get(course_code)
         if not course_data:
@@ -406,10 +551,12 @@ async def generate_semester(
         prereqs_raw = course_data.get("prerequisites_raw")
         if prereqs_raw:
             try:
-                parsed_prereqs = parse_prerequisites(prereqs_raw)
-                filtered_prereqs = filter_parsed_requisites(parsed_prereqs)
-                if not check_requisites_recursive(
-                    filtered_prereqs, resolved_courses_before_this_term
+                if not requisites_met(
+                    course_code,
+                    course_data,
+                    "prerequisites",
+                    resolved_courses_before_this_term,
+                    catalog,
                 ):
                     logger.debug(
                         f"{term_id_str}: Prerequisites not met for specific course {course_code}. Skipping."
@@ -421,25 +568,19 @@ async def generate_semester(
                 )
                 continue
 
-        is_available = await predict_availability(course_code, term, db_session)
+        is_available = await is_course_available(course_code, term, db_session, catalog)
         if not is_available:
             logger.debug(
                 f"{term_id_str}: Specific course {course_code} predicted unavailable. Skipping."
             )
             continue
 
-        category_for_priority = get_course_category(
-            course_code,
-            program_specific_required_codes,
-            program_technical_elective_pool,
-            group_sociohumanistics=program_reqs.sociohumanistics > 0,
-        )
         current_semester_requirements_pool.append(
             Requirement(
                 kind="COURSE",
                 value=course_code,
                 credits=course_data["credits"],
-                priority=get_course_priority(category_for_priority),
+                priority=required_priority,
                 difficulty=course_data["difficulty"],
             )
         )
@@ -522,8 +663,19 @@ async def generate_semester(
                 )
             )
 
-    current_semester_requirements_pool.sort(
-        key=lambda r: (r.priority, abs(r.difficulty - target_difficulty))
+    if scoring_engine is None:
+        scoring_engine = (
+            get_scoring_engine(catalog)
+            if catalog is not None
+            else ScoringEngine(course_lookups)
+        )
+    current_semester_requirements_pool = scoring_engine.rank(
+        current_semester_requirements_pool,
+        target_difficulty,
+        scoring_engine.program_static(
+            program_reqs.code, required_courses_req_data_json
+        ),
+        scoring_weights,
     )
 
     # 3. Select requirements for the semester from the pool
@@ -561,14 +713,18 @@ async def generate_semester(
                 coreqs_raw = course_cand_data.get("corequisites_raw")
                 if coreqs_raw:
                     try:
-                        parsed_coreqs = parse_corequisites(coreqs_raw)
-                        filtered_coreqs = filter_parsed_requisites(parsed_coreqs)
                         # Co-reqs check: (resolved before this term) + (specifics added to THIS term's skeleton so far)
-                        co_req_check_set = resolved_courses_before_this_term.union(
-                            specific_courses_added_this_term_skeleton
+                        co_req_check_set = (
+                            resolved_courses_before_this_term.with_courses(
+                                specific_courses_added_this_term_skeleton
+                            )
                         )
-                        if not check_requisites_recursive(
-                            filtered_coreqs, co_req_check_set
+                        if not requisites_met(
+                            course_code_cand,
+                            course_cand_data,
+                            "corequisites",
+                            co_req_check_set,
+                            catalog,
                         ):
                             logger.debug(
                                 f"{term_id_str}: Course {course_code_cand} co-reqs not met for skeleton. Skipping."
@@ -606,11 +762,12 @@ async def generate_semester(
 
     # 4. Estimate program completion based on this new skeleton term
     # Specific courses: (resolved before this term) + (specifics planned in THIS term's skeleton)
-    all_specifics_in_skeleton_so_far = resolved_courses_before_this_term.union(
+    all_specifics_in_skeleton_so_far = resolved_courses_before_this_term.with_courses(
         specific_courses_added_this_term_skeleton
     )
-    all_specific_courses_covered_estimate = program_specific_required_codes.issubset(
-        all_specifics_in_skeleton_so_far
+    all_specific_courses_covered_estimate = all(
+        code in all_specifics_in_skeleton_so_far
+        for code in program_specific_required_codes
     )
 
     # Category credits: (met by prior resolved courses) + (placeholders planned in THIS term's skeleton)
@@ -679,12 +836,11 @@ async def resolve_single_semester_skeleton(
     course_lookups: Dict[str, Dict],
     term_skeleton_data: TermRequisiteData,  # The skeleton for the current semester only
     term_key: str,  # e.g., "Fall 2024"
-    taken_courses_before_this_term: Set[
-        str
-    ],  # All courses resolved successfully in previous iterations
-    db_session: AsyncSession,
+    taken_courses_before_this_term: TermState,  # All courses resolved in previous terms
+    db_session: Optional[AsyncSession],
     program_specific_required_codes: Set[str],
     program_technical_elective_pool: Set[str],
+    catalog: Optional[CatalogSnapshot] = None,
 ) -> Tuple[
     Optional[TermData], List[Requirement]
 ]:  # (ResolvedTermData or None, List of FAILED Requirement objects from skeleton)
@@ -823,8 +979,8 @@ async def resolve_single_semester_skeleton(
                 ):  # Simplification: exact credit match for placeholder
                     continue
 
-                is_available = await predict_availability(
-                    cand_course_code, current_term_name_for_api, db_session
+                is_available = await is_course_available(
+                    cand_course_code, current_term_name_for_api, db_session, catalog
                 )
                 if not is_available:
                     continue
@@ -833,10 +989,12 @@ async def resolve_single_semester_skeleton(
                 prereqs_r = cand_course_data.get("prerequisites_raw")
                 if prereqs_r:
                     try:
-                        parsed_pr = parse_prerequisites(prereqs_r)
-                        filtered_pr = filter_parsed_requisites(parsed_pr)
-                        if not check_requisites_recursive(
-                            filtered_pr, taken_courses_before_this_term
+                        if not requisites_met(
+                            cand_course_code,
+                            cand_course_data,
+                            "prerequisites",
+                            taken_courses_before_this_term,
+                            catalog,
                         ):
                             continue
                     except Exception as parse_exc:
@@ -849,14 +1007,16 @@ async def resolve_single_semester_skeleton(
                 coreqs_r = cand_course_data.get("corequisites_raw")
                 if coreqs_r:
                     try:
-                        parsed_co = parse_corequisites(coreqs_r)
-                        filtered_co = filter_parsed_requisites(parsed_co)
                         # Co-req check set includes courses already resolved in this term
-                        co_req_check_set = taken_courses_before_this_term.union(
+                        co_req_check_set = taken_courses_before_this_term.with_courses(
                             courses_resolved_this_term_set
                         )
-                        if not check_requisites_recursive(
-                            filtered_co, co_req_check_set
+                        if not requisites_met(
+                            cand_course_code,
+                            cand_course_data,
+                            "corequisites",
+                            co_req_check_set,
+                            catalog,
                         ):
                             continue
                     except Exception as parse_exc:
@@ -905,9 +1065,11 @@ async def generate_sequence(
     initial_taken_courses_set: Set[str],
     specific_elective_credits_initial: Dict[str, int],
     credit_limits: Dict,  # e.g. {"min": 12, "max": 18} for Fall/Spring
-    db_session: AsyncSession,
+    db_session: Optional[AsyncSession],
     max_terms: int = 15,
     max_resolution_attempts_per_semester: int = 3,
+    catalog: Optional[CatalogSnapshot] = None,
+    scoring_weights: Optional[ScoringWeights] = None,
 ) -> Tuple[Optional[SchedulerResult], Optional[SchedulerSkeletonResult]]:
 
     logger.info(
@@ -929,9 +1091,6 @@ async def generate_sequence(
     # Stores the skeleton that *led* to a successful resolution for each term
     final_successful_skeletons_map: Dict[str, TermRequisiteData] = {}
 
-    # Tracks all *actually resolved* courses, including initial ones, as the sequence progresses
-    globally_resolved_and_taken_courses = initial_taken_courses_set.copy()
-
     sequence_generation_warnings: List[str] = []
     is_program_fully_resolved = False  # Tracks if the *resolved* program is complete
 
@@ -951,16 +1110,45 @@ async def generate_sequence(
 
     p_specific_req_codes = set(prog_courses_json.keys())
     p_tech_elective_pool = set(prog_tech_electives_json.keys())
+    group_sociohumanistics = program_reqs.sociohumanistics > 0
+
+    # Tracks all *actually resolved* courses, including initial ones, and the category
+    # credits they meet as the sequence progresses. Immutable, advanced once per term.
+    if catalog is not None:
+        course_index = get_course_index(catalog)
+    else:
+        course_index = CourseIndex(course_lookups)
+    equivalences = course_index.equivalences
+    # Candidate ranking features are computed once, not per term
+    scoring_engine = (
+        get_scoring_engine(catalog)
+        if catalog is not None
+        else ScoringEngine(course_lookups)
+    )
+    initial_category_credits = tally_category_credits(
+        initial_taken_courses_set,
+        course_lookups,
+        p_specific_req_codes,
+        p_tech_elective_pool,
+        group_sociohumanistics,
+        equivalences,
+    )
+    for category, credits in specific_elective_credits_initial.items():
+        initial_category_credits[category] += credits or 0
+    term_state = TermState.from_courses(
+        course_index, initial_taken_courses_set, initial_category_credits
+    )
 
     # Initial check: Is the program already complete with the provided courses?
     if _is_program_complete_v2(
         program_reqs,
-        globally_resolved_and_taken_courses,
+        term_state,
         specific_elective_credits_initial,
         course_lookups,
         p_specific_req_codes,
         p_tech_elective_pool,
         "Initial check",
+        equivalences,
     ):
         logger.info(
             f"Program {program_reqs.code} is ALREADY COMPLETE with provided initial courses."
@@ -989,12 +1177,13 @@ async def generate_sequence(
         # Check for program completion *before* attempting to schedule this new term
         if _is_program_complete_v2(
             program_reqs,
-            globally_resolved_and_taken_courses,
+            term_state,
             specific_elective_credits_initial,
             course_lookups,
             p_specific_req_codes,
             p_tech_elective_pool,
             f"Pre-check for {term_id_str}",
+            equivalences,
         ):
             logger.info(
                 f"Program RESOLVED and complete before term {term_id_str} was needed."
@@ -1006,28 +1195,6 @@ async def generate_sequence(
         current_semester_exclusion_list: List[Requirement] = []
         semester_successfully_resolved_and_added = False
 
-        # Calculate category credits met by *actually resolved non-specific* courses so far
-        # This is passed to generate_semester to inform placeholder generation
-        specific_elective_credits_initial_copy = specific_elective_credits_initial
-        category_credits_met_by_resolved_courses = (
-            specific_elective_credits_initial_copy
-        )
-        for course_code_val in globally_resolved_and_taken_courses:
-            if (
-                course_code_val not in p_specific_req_codes
-            ):  # Only non-specific courses count towards these categories
-                category = get_course_category(
-                    course_code_val,
-                    p_specific_req_codes,
-                    p_tech_elective_pool,
-                    group_sociohumanistics=program_reqs.sociohumanistics > 0,
-                )
-                course_data_lookup = course_lookups.get(course_code_val)
-                if course_data_lookup:
-                    category_credits_met_by_resolved_courses[
-                        category
-                    ] += course_data_lookup["credits"]
-
         # Inner loop: attempts to generate and resolve the current semester
         for attempt in range(max_resolution_attempts_per_semester):
             logger.info(
@@ -1044,12 +1211,15 @@ async def generate_sequence(
                         course_lookups=course_lookups,
                         term=main_current_term,
                         year=main_current_year,
-                        resolved_courses_before_this_term=globally_resolved_and_taken_courses,
-                        category_credits_met_by_prior_resolved_courses=category_credits_met_by_resolved_courses,
+                        resolved_courses_before_this_term=term_state,
+                        category_credits_met_by_prior_resolved_courses=term_state.category_credits,
                         target_difficulty=DEFAULT_TARGET_DIFFICULTY,
                         credit_limits=credit_limits,
                         db_session=db_session,
                         exclusion_list=current_semester_exclusion_list,
+                        catalog=catalog,
+                        scoring_weights=scoring_weights,
+                        scoring_engine=scoring_engine,
                     )
                 )
             except (
@@ -1077,10 +1247,11 @@ async def generate_sequence(
                     course_lookups,
                     current_semester_skeleton,
                     term_id_str,
-                    globally_resolved_and_taken_courses.copy(),  # Pass a copy for safety
+                    term_state,
                     db_session,
                     p_specific_req_codes,
                     p_tech_elective_pool,
+                    catalog=catalog,
                 )
             )
 
@@ -1099,9 +1270,18 @@ async def generate_sequence(
                     current_semester_skeleton  # Store skeleton that worked
                 )
 
-                # Update globally tracked resolved courses
-                for c_code in resolved_term_data_current_sem.courses:
-                    globally_resolved_and_taken_courses.add(c_code)
+                # Advance the tracked state with this term's courses
+                term_state = term_state.with_courses(
+                    resolved_term_data_current_sem.courses,
+                    tally_category_credits(
+                        resolved_term_data_current_sem.courses,
+                        course_lookups,
+                        p_specific_req_codes,
+                        p_tech_elective_pool,
+                        group_sociohumanistics,
+                        equivalences,
+                    ),
+                )
 
                 semester_successfully_resolved_and_added = True
                 break  # Break from resolution_attempts_per_semester loop (SUCCESS for this semester)
@@ -1152,12 +1332,13 @@ async def generate_sequence(
         # This means max_terms were processed. Check final completion status.
         if not _is_program_complete_v2(
             program_reqs,
-            globally_resolved_and_taken_courses,
+            term_state,
             specific_elective_credits_initial,
             course_lookups,
             p_specific_req_codes,
             p_tech_elective_pool,
             f"Post max_terms ({max_terms}) check",
+            equivalences,
         ):
             msg = f"Sequence generation reached max_terms ({max_terms}) but program is NOT fully resolved."
             logger.warning(msg)
@@ -1174,12 +1355,13 @@ async def generate_sequence(
     if not is_program_fully_resolved:  # If not True from loop logic, do a final check
         is_program_fully_resolved = _is_program_complete_v2(
             program_reqs,
-            globally_resolved_and_taken_courses,
+            term_state,
             specific_elective_credits_initial,
             course_lookups,
             p_specific_req_codes,
             p_tech_elective_pool,
             "Final overall completion status check",
+            equivalences,
         )
 
     # Construct final result objects
@@ -0,0 +1,142 @@
+import logging
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.logic.catalog import CatalogSnapshot
+from data.logic.term_state import CourseIndex
+from data.parser.parser_utils import flatten_requisites_to_list
+
+logger = logging.getLogger(__name__)
+
+# Takes the bits of a TermState over the compiler's CourseIndex
+RequisitePredicate = Callable[[int], bool]
+
+
+def _always_met(bits: int) -> bool:
+    return True
+
+
+class RequisiteCompiler:
+    """
+    Compiles normalized requisite ASTs (see RequisiteNormalizer) into Python functions
+    over the bits of a TermState. Each course becomes the mask of its equivalence class
+    in the CourseIndex, ORs of courses merge into one mask, and the AND/OR structure
+    becomes a single generated expression, e.g. A and (B or C) is checked as
+    bits & a and bits & bc: no dict lookups or type comparisons per check.
+    Compiled predicates are kept per AST object, the catalog's ASTs are interned.
+    """
+
+    def __init__(self, index: CourseIndex):
+        self.index = index
+        # id(AST) -> (AST, predicate); the entry holds the AST so its id isn't reused
+        self._compiled: Dict[int, Tuple[dict, RequisitePredicate]] = {}
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def compile(self, req_dict: Optional[dict]) -> RequisitePredicate:
+        """
+        Predicate with the same result as check_requisites_recursive on a TermState
+        over this compiler's index.
+        Args:
+            req_dict: Normalized requisite AST (or None).
+        Returns:
+            Function taking TermState.bits and returning whether the requisite is met.
+        """
+        if not req_dict:
+            return _always_met
+        entry = self._compiled.get(id(req_dict))
+        if entry is None:
+            masks: List[int] = []
+            expression = self._expression(req_dict, masks)
+            names = ", ".join(f"m{i}" for i in range(len(masks)))
+            # The masks are closure variables, the source only holds names and operators
+            namespace: dict = {}
+            exec(
+                f"def make({names}):\n    return lambda bits: bool({expression})",
+                namespace,
+            )
+            entry = (req_dict, namespace["make"](*masks))
+            self._compiled[id(req_dict)] = entry
+        return entry[1]
+
+    def _course_mask(self, course_code: str) -> int:
+        # Every class member has a position, get_course_index indexes all of them
+        return self.index.mask(self.index.equivalences.members(course_code))
+
+    def _mask_term(self, mask: int, masks: List[int]) -> str:
+        masks.append(mask)
+        return f"bits & m{len(masks) - 1}"
+
+    def _expression(self, req_dict: dict, masks: List[int]) -> str:
+        req_type = req_dict.get("type")
+        course_code = req_dict.get("value")
+        if req_type == "COURSE" and isinstance(course_code, str):
+            return self._mask_term(
+                self._course_mask(course_code.replace(" ", "")), masks
+            )
+        if req_type in ("AND", "OR"):
+            conditions = [
+                condition
+                for condition in req_dict.get("conditions", [])
+                if condition and isinstance(condition, dict)
+            ]
+            if req_type == "AND":
+                if not conditions:
+                    return "True"
+                return (
+                    "("
+                    + " and ".join(self._expression(c, masks) for c in conditions)
+                    + ")"
+                )
+            if len(conditions) < len(req_dict.get("conditions", [])):
+                return "True"  # Non-dict conditions are met
+            courses_mask = 0
+            terms = []
+            for condition in conditions:
+                code = condition.get("value")
+                if condition.get("type") == "COURSE" and isinstance(code, str):
+                    courses_mask |= self._course_mask(code.replace(" ", ""))
+                else:
+                    terms.append(self._expression(condition, masks))
+            if courses_mask:
+                terms.insert(0, self._mask_term(courses_mask, masks))
+            return "(" + " or ".join(terms) + ")" if terms else "False"
+        if req_type == "FOR":
+            return "True"
+        # Normalized ASTs have no other nodes; they fail, as unknown types do
+        logger.warning(f"Unexpected node type compiling requisites: {req_dict}")
+        return "False"
+
+
+def _build_course_index(catalog: CatalogSnapshot) -> CourseIndex:
+    # Every code a requisite or an equivalence class can mention gets its position now:
+    # the index is shared by all requests, so it never grows afterwards (see CourseIndex)
+    referenced = set()
+    for by_course in (catalog.prerequisites, catalog.corequisites):
+        for requisites in by_course.values():
+            referenced.update(flatten_requisites_to_list(requisites))
+    for members in catalog.equivalences.classes():
+        referenced.update(members)
+    return CourseIndex(
+        chain(
+            catalog.course_lookups,
+            sorted(referenced.difference(catalog.course_lookups)),
+        ),
+        catalog.equivalences,
+    )
+
+
+def get_course_index(catalog: CatalogSnapshot) -> CourseIndex:
+    """
+    CourseIndex over the catalog's courses, the courses its requisites mention and its
+    equivalences, shared by its TermStates.
+    """
+    return catalog.get_derived("course_index", _build_course_index)
+
+
+def get_requisite_compiler(catalog: CatalogSnapshot) -> RequisiteCompiler:
+    return catalog.get_derived(
+        "requisite_compiler",
+        lambda snapshot: RequisiteCompiler(get_course_index(snapshot)),
+    )
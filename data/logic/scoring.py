@@ -0,0 +1,179 @@
+import logging
+import threading
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from data.logic.catalog import AVAILABILITY_TERMS, AvailabilityIndex, CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Columns of the feature matrix, in the order of ScoringWeights.vector()
+FEATURES = (
+    "priority",
+    "difficulty_gap",
+    "unlocks",
+    "highest_ancestor",
+    "offering_frequency",
+)
+# Per-course columns precomputed once per snapshot (the first two depend on the term)
+STATIC_FEATURES = FEATURES[2:]
+
+
+class ScoringWeights(BaseModel):
+    """
+    Weights of the candidate score; candidates with the lowest score are picked first.
+    The defaults reproduce ordering by (priority, |difficulty - target|): priorities are
+    whole numbers and the difficulty gap is at most 5, so it only breaks priority ties.
+    """
+
+    priority: float = Field(1000.0, description="Category priority (1 = required)")
+    difficulty_gap: float = Field(
+        1.0, description="Distance from the term's target difficulty"
+    )
+    unlocks: float = Field(
+        0.0, description="Program courses the course is a prerequisite for"
+    )
+    highest_ancestor: float = Field(
+        0.0, description="Length of the prerequisite chain above the course"
+    )
+    offering_frequency: float = Field(
+        0.0, description="Share of term types the course is predicted to be offered in"
+    )
+
+    def vector(self) -> np.ndarray:
+        return np.array([getattr(self, name) for name in FEATURES], dtype=np.float64)
+
+
+DEFAULT_SCORING_WEIGHTS = ScoringWeights()
+
+
+class ScoringEngine:
+    """
+    Ranks a term's candidate requirements with a weighted sum of their features.
+    Course features that don't change between terms are computed once per catalog
+    (and once per program for the program-specific ones) and gathered by row index.
+    Category placeholders and unknown courses use an all-zero row.
+    """
+
+    def __init__(
+        self,
+        course_lookups: Mapping[str, Dict],
+        availability: Optional[AvailabilityIndex] = None,
+    ):
+        if availability is None:
+            availability = AvailabilityIndex(dict(course_lookups))
+        self.course_rows: Dict[str, int] = {
+            code: row for row, code in enumerate(course_lookups)
+        }
+        self.blank_row = len(self.course_rows)
+        self.static = np.zeros(
+            (len(self.course_rows) + 1, len(STATIC_FEATURES)), dtype=np.float64
+        )
+        ancestor_column = STATIC_FEATURES.index("highest_ancestor")
+        frequency_column = STATIC_FEATURES.index("offering_frequency")
+        for code, row in self.course_rows.items():
+            self.static[row, ancestor_column] = (
+                course_lookups[code].get("highest_ancestor") or 0
+            )
+        for term in AVAILABILITY_TERMS:
+            offered = availability.offered_in(term)
+            for code in offered:
+                row = self.course_rows.get(code)
+                if row is not None:
+                    self.static[row, frequency_column] += 1
+        self.static[:, frequency_column] /= len(AVAILABILITY_TERMS)
+
+        self._program_static: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def program_static(
+        self, program_code: str, program_courses: Mapping[str, Dict]
+    ) -> np.ndarray:
+        """Static features with the program's unlock counts (len of each prerequisite_for)."""
+        static = self._program_static.get(program_code)
+        if static is None:
+            with self._lock:
+                static = self._program_static.get(program_code)
+                if static is None:
+                    static = self.static.copy()
+                    unlocks_column = STATIC_FEATURES.index("unlocks")
+                    for code, course_data in program_courses.items():
+                        row = self.course_rows.get(code)
+                        if row is not None and isinstance(course_data, dict):
+                            static[row, unlocks_column] = len(
+                                course_data.get("prerequisite_for") or ()
+                            )
+                    self._program_static[program_code] = static
+        return static
+
+    def scores(
+        self,
+        requirements: Sequence,
+        target_difficulty: float,
+        static: Optional[np.ndarray] = None,
+        weights: Optional[ScoringWeights] = None,
+    ) -> np.ndarray:
+        """
+        Score of each requirement (see ScoringWeights).
+        Args:
+            requirements: Requirement objects (kind, value, priority, difficulty).
+            target_difficulty: The term's target difficulty.
+            static: Static feature matrix (see program_static). Defaults to the catalog's.
+            weights: Feature weights. Defaults to DEFAULT_SCORING_WEIGHTS.
+        Returns:
+            Array of scores aligned with requirements.
+        """
+        count = len(requirements)
+        static = self.static if static is None else static
+        weights = weights or DEFAULT_SCORING_WEIGHTS
+        rows = np.fromiter(
+            (
+                (
+                    self.course_rows.get(requirement.value, self.blank_row)
+                    if requirement.kind == "COURSE"
+                    else self.blank_row
+                )
+                for requirement in requirements
+            ),
+            dtype=np.int64,
+            count=count,
+        )
+        priority = np.fromiter(
+            (requirement.priority for requirement in requirements),
+            dtype=np.float64,
+            count=count,
+        )
+        difficulty = np.fromiter(
+            (requirement.difficulty for requirement in requirements),
+            dtype=np.float64,
+            count=count,
+        )
+        features = np.column_stack(
+            (priority, np.abs(difficulty - target_difficulty), static[rows])
+        )
+        return features @ weights.vector()
+
+    def rank(
+        self,
+        requirements: Sequence,
+        target_difficulty: float,
+        static: Optional[np.ndarray] = None,
+        weights: Optional[ScoringWeights] = None,
+    ) -> List:
+        """Requirements sorted by score; ties keep their original order."""
+        if not requirements:
+            return []
+        order = np.argsort(
+            self.scores(requirements, target_difficulty, static, weights),
+            kind="stable",
+        )
+        return [requirements[i] for i in order]
+
+
+def get_scoring_engine(catalog: CatalogSnapshot) -> ScoringEngine:
+    return catalog.get_derived(
+        "scoring_engine",
+        lambda snapshot: ScoringEngine(snapshot.course_lookups, snapshot.availability),
+    )
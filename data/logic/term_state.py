@@ -0,0 +1,157 @@
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from data.logic.equivalences import EquivalenceIndex, default_equivalences
+
+
+class CourseIndex:
+    """
+    Mapping of course codes to bit positions, shared by every TermState built from it.
+    Positions are only assigned while building the index (or through position());
+    mask() and split() leave codes missing from the index out, so TermStates built
+    from request input never grow an index shared between requests.
+    Courses keep their own positions, and each equivalence class also gets a mask of
+    its members' positions so membership checks cover equivalent courses.
+    """
+
+    def __init__(
+        self,
+        course_codes: Iterable[str] = (),
+        equivalences: Optional[EquivalenceIndex] = None,
+    ):
+        self.equivalences = (
+            equivalences if equivalences is not None else default_equivalences()
+        )
+        self._positions: Dict[str, int] = {}
+        self._codes: List[str] = []
+        # Canonical code -> bits of the class members that have a position
+        self._class_masks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for code in course_codes:
+            self.position(code)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def find(self, course_code: str) -> Optional[int]:
+        return self._positions.get(course_code)
+
+    def position(self, course_code: str) -> int:
+        position = self._positions.get(course_code)
+        if position is None:
+            with self._lock:
+                position = self._positions.get(course_code)
+                if position is None:
+                    position = len(self._codes)
+                    self._codes.append(course_code)
+                    self._positions[course_code] = position
+                    if course_code in self.equivalences:
+                        canonical = self.equivalences.canonical(course_code)
+                        self._class_masks[canonical] = self._class_masks.get(
+                            canonical, 0
+                        ) | (1 << position)
+        return position
+
+    def class_mask(self, course_code: str) -> int:
+        """Bits of every indexed course equivalent to course_code, 0 if it has no equivalences."""
+        return self._class_masks.get(self.equivalences.canonical(course_code), 0)
+
+    def mask(self, course_codes: Iterable[str]) -> int:
+        """Bits of the indexed codes; codes missing from the index are left out."""
+        return self.split(course_codes)[0]
+
+    def split(self, course_codes: Iterable[str]) -> Tuple[int, FrozenSet[str]]:
+        """Bits of the indexed codes, and the codes missing from the index."""
+        bits = 0
+        unindexed = []
+        for code in course_codes:
+            position = self._positions.get(code)
+            if position is None:
+                unindexed.append(code)
+            else:
+                bits |= 1 << position
+        return bits, frozenset(unindexed)
+
+    def codes(self, bits: int) -> Iterator[str]:
+        while bits:
+            lowest = bits & -bits
+            yield self._codes[lowest.bit_length() - 1]
+            bits ^= lowest
+
+
+def _empty_tallies() -> Mapping[str, int]:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class TermState:
+    """
+    Immutable snapshot of a plan between terms: the courses taken or resolved so far
+    (a bitset over a shared CourseIndex, plus the codes the index doesn't know) and the
+    elective credits met per category.
+    Adding courses returns a new state, so states can be handed to several attempts
+    for the same term without copying or aliasing. Behaves as a read-only set of codes
+    where a course counts as contained when it or an equivalent course was taken.
+    """
+
+    index: CourseIndex
+    bits: int = 0
+    category_credits: Mapping[str, int] = field(default_factory=_empty_tallies)
+    # Courses missing from the index, e.g. unknown codes in a request's taken courses
+    unindexed: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_courses(
+        cls,
+        index: CourseIndex,
+        course_codes: Iterable[str],
+        category_credits: Optional[Mapping[str, int]] = None,
+    ) -> "TermState":
+        bits, unindexed = index.split(course_codes)
+        return cls(
+            index,
+            bits,
+            MappingProxyType(dict(category_credits or {})),
+            unindexed,
+        )
+
+    def with_courses(
+        self,
+        course_codes: Iterable[str],
+        category_credits: Optional[Mapping[str, int]] = None,
+    ) -> "TermState":
+        """New state with the given courses added and their category credits tallied."""
+        tallies = self.category_credits
+        if category_credits:
+            merged = dict(tallies)
+            for category, credits in category_credits.items():
+                merged[category] = merged.get(category, 0) + credits
+            tallies = MappingProxyType(merged)
+        bits, unindexed = self.index.split(course_codes)
+        return TermState(
+            self.index,
+            self.bits | bits,
+            tallies,
+            self.unindexed | unindexed if unindexed else self.unindexed,
+        )
+
+    def __contains__(self, course_code: object) -> bool:
+        if self.unindexed and any(
+            code in self.unindexed
+            for code in self.index.equivalences.members(course_code)  # type: ignore[arg-type]
+        ):
+            return True
+        class_mask = self.index.class_mask(course_code)  # type: ignore[arg-type]
+        if class_mask:
+            return self.bits & class_mask != 0
+        position = self.index.find(course_code)  # type: ignore[arg-type]
+        return position is not None and (self.bits >> position) & 1 == 1
+
+    def __iter__(self) -> Iterator[str]:
+        return chain(self.index.codes(self.bits), self.unindexed)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count() + len(self.unindexed)
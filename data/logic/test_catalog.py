@@ -0,0 +1,47 @@
+import asyncio
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from data.database.catalog_version import bump_catalog_version
+from data.database.database import Base, Course
+from data.logic import catalog
+
+
+def test_snapshot_reloads_when_another_process_bumps_the_catalog(tmp_path):
+    path = tmp_path / "courses.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Course(course_code="CIIC3015", year=2024, term="Fall", credits=4))
+        db.commit()
+
+    async def snapshot():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                return await catalog.get_catalog_snapshot(db)
+        finally:
+            await async_engine.dispose()
+
+    catalog.invalidate_catalog_snapshot()
+    try:
+        first = asyncio.run(snapshot())
+        assert first.course_lookups["CIIC3015"]["credits"] == 4
+        assert asyncio.run(snapshot()) is first
+
+        # A refresh job only changes the database, in its own session
+        with Session(engine) as db:
+            db.execute(update(Course).values(credits=3))
+            db.commit()
+        assert asyncio.run(snapshot()) is first  # Not bumped, still cached
+        with Session(engine) as db:
+            bump_catalog_version(db)
+            db.commit()
+        second = asyncio.run(snapshot())
+        assert second is not first
+        assert second.version == first.version + 1
+        assert second.course_lookups["CIIC3015"]["credits"] == 3
+    finally:
+        catalog.invalidate_catalog_snapshot()
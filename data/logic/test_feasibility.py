@@ -0,0 +1,105 @@
+import json
+
+from data.database.database import Program
+from data.logic.equivalences import EquivalenceIndex
+from data.logic.feasibility import check_graduation_feasibility
+
+
+class Offerings:
+    """Availability stand-in: course -> term types it is offered in (default fall and spring)."""
+
+    def __init__(self, **terms):
+        self.terms = terms
+
+    def is_available(self, course_code, term_type):
+        return term_type in self.terms.get(course_code, ("fall", "spring"))
+
+
+def course(*prereqs):
+    """Program courses JSON entry of a course requiring all of prereqs."""
+    conditions = [{"type": "COURSE", "value": prereq} for prereq in prereqs]
+    if len(conditions) > 1:
+        return {"prerequisites": {"type": "AND", "conditions": conditions}}
+    return {"prerequisites": conditions[0] if conditions else None}
+
+
+def check(
+    courses,
+    credits=3,
+    target=("spring", 2028),
+    taken=(),
+    offerings=None,
+    max_credits=18,
+):
+    program = Program(code="TEST", courses=json.dumps(courses), technical_courses="{}")
+    lookups = {code: {"credits": credits} for code in courses}
+    return check_graduation_feasibility(
+        program,
+        lookups,
+        set(taken),
+        {},
+        {"min": 12, "max": max_credits},
+        "fall",
+        2026,
+        target[0],
+        target[1],
+        include_summers=False,
+        availability=offerings or Offerings(),
+        equivalences=EquivalenceIndex([]),
+    )
+
+
+def test_prerequisite_chain_bound():
+    courses = {
+        "CIIC3015": course(),
+        "CIIC4010": course("CIIC3015"),
+        "CIIC4020": course("CIIC4010"),
+        "CIIC4025": course("CIIC4020", "CIIC3015"),
+    }
+    result = check(courses, target=("spring", 2027))  # Fall 2026 and Spring 2027
+    assert result.min_terms_required == 4
+    assert not result.is_feasible
+    assert result.critical_path == ["CIIC3015", "CIIC4010", "CIIC4020", "CIIC4025"]
+    assert result.earliest_graduation_term == "Spring 2028"
+    # Courses already taken shorten the chain
+    result = check(courses, target=("spring", 2027), taken=["CIIC3015", "CIIC4010"])
+    assert result.min_terms_required == 2
+    assert result.is_feasible
+
+
+def test_offering_bound():
+    courses = {"INEL3105": course(), "INEL4102": course("INEL3105")}
+    # Spring only: INEL3105 in Spring 2027, INEL4102 in Spring 2028
+    offerings = Offerings(INEL3105=("spring",), INEL4102=("spring",))
+    result = check(courses, offerings=offerings)
+    assert result.min_terms_required == 4
+    assert result.critical_path == ["INEL3105", "INEL4102"]
+    # Never offered
+    result = check(courses, offerings=Offerings(INEL4102=()))
+    assert result.min_terms_required is None
+    assert result.blocking_courses == ["INEL4102"]
+
+
+def test_credit_bound():
+    courses = {f"MATE{3000 + number}": course() for number in range(10)}
+    result = check(courses, credits=4, target=("fall", 2026), max_credits=12)
+    assert result.remaining_credits == 40
+    assert result.min_terms_required == 4  # 12 credits per term
+    assert not result.is_feasible
+    assert "40 remaining credits need at least 4 terms" in result.reasons[0]
+
+
+def test_cycles_do_not_depend_on_visit_order():
+    courses = {
+        "QUIM3131": course("QUIM3132"),
+        "QUIM3132": course("QUIM3131"),
+        "QUIM3461": course("QUIM3132"),
+    }
+    results = {
+        json.dumps(check(dict(order)).model_dump())
+        for order in (courses.items(), reversed(courses.items()))
+    }
+    assert len(results) == 1
+    result = check(courses)
+    # The cycle's courses can't be ordered, so they only delay what requires them
+    assert result.min_terms_required == 2
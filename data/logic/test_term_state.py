@@ -0,0 +1,58 @@
+import asyncio
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from data.database.database import Program
+from data.logic.catalog import load_catalog_snapshot_sync
+from data.logic.equivalences import EquivalenceIndex
+from data.logic.recommendation_scheduler import generate_sequence
+from data.logic.requisite_predicates import get_course_index
+from data.logic.term_state import CourseIndex, TermState
+
+DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "database",
+    "courses.db",
+)
+
+
+def test_unknown_codes_stay_out_of_the_index():
+    index = CourseIndex(
+        ["CIIC3015", "MATE3031"], EquivalenceIndex([["CIIC3015", "INGE3016"]])
+    )
+    state = TermState.from_courses(index, ["CIIC3015", "FAKE0001"])
+    state = state.with_courses(["FAKE0002", "MATE3031"])
+    assert len(index) == 2
+    assert state.unindexed == {"FAKE0001", "FAKE0002"}
+    assert "FAKE0001" in state and "MATE3031" in state
+    assert "INGE3016" in state  # Through its equivalence with CIIC3015
+    assert "FAKE0003" not in state
+    assert sorted(state) == ["CIIC3015", "FAKE0001", "FAKE0002", "MATE3031"]
+    assert len(state) == 4
+
+
+def test_planning_with_unknown_codes_keeps_the_shared_index():
+    with Session(create_engine(f"sqlite:///{DATABASE_PATH}")) as db:
+        catalog = load_catalog_snapshot_sync(db)
+        program = db.get(Program, "0508")
+    index = get_course_index(catalog)
+    size = len(index)
+    taken = {"CIIC3015", "MATE3031"} | {f"MADE{number:04d}" for number in range(50)}
+    result, _ = asyncio.run(
+        generate_sequence(
+            program_reqs=program,
+            course_lookups=catalog.course_lookups,
+            start_term_name="fall",
+            start_year=2027,
+            initial_taken_courses_set=taken,
+            specific_elective_credits_initial={},
+            credit_limits={"min": 12, "max": 18},
+            db_session=None,
+            max_terms=4,
+            catalog=catalog,
+        )
+    )
+    assert result is not None
+    assert len(index) == size
@@ -0,0 +1,135 @@
+import itertools
+import random
+
+from data.logic.timetable import (
+    SectionOption,
+    build_timetables,
+    meeting_mask,
+    timetable_score,
+)
+
+
+def option(course_code, section_code, *meetings):
+    mask = 0
+    for days, start_time, end_time in meetings:
+        mask |= meeting_mask(days, start_time, end_time)
+    return SectionOption(course_code, section_code, mask)
+
+
+def test_conflicting_sections_are_never_combined():
+    options = {
+        "MATE3031": [option("MATE3031", "010", ("LWV", "07:30", "08:20"))],
+        "CIIC3015": [
+            option("CIIC3015", "020", ("LW", "08:00", "09:20")),  # Overlaps 010
+            option("CIIC3015", "030", ("LWV", "08:30", "09:20")),
+        ],
+    }
+    timetables = build_timetables(options)
+    assert len(timetables) == 1
+    assert [section.section_code for section in timetables[0].sections] == [
+        "030",
+        "010",
+    ]
+    # Without 030 the only pair overlaps, so there is no timetable
+    options["CIIC3015"] = options["CIIC3015"][:1]
+    assert build_timetables(options) == []
+
+
+def test_blocked_mask_skips_sections():
+    options = {
+        "INGL3101": [
+            option("INGL3101", "010", ("MJ", "07:30", "08:50")),
+            option("INGL3101", "020", ("MJ", "13:30", "14:50")),
+        ],
+        "QUIM3131": [option("QUIM3131", "010", ("LWV", "10:30", "11:20"))],
+    }
+    blocked = meeting_mask("MJ", "07:00", "12:00")
+    timetables = build_timetables(options, blocked_mask=blocked)
+    assert len(timetables) == 1
+    sections = {section.course_code: section for section in timetables[0].sections}
+    assert sections["INGL3101"].section_code == "020"
+    # No section of QUIM3131 left once its times are blocked
+    blocked |= meeting_mask("V", "10:00", "11:00")
+    assert build_timetables(options, blocked_mask=blocked) == []
+
+
+def test_max_results_keeps_the_best_timetables():
+    options = {
+        "FISI3171": [
+            option("FISI3171", f"{hour:03d}", ("LWV", f"{hour}:30", f"{hour + 1}:20"))
+            for hour in range(7, 17)
+        ],
+        "MATE3032": [
+            option("MATE3032", f"{hour:03d}", ("LWV", f"{hour}:30", f"{hour + 1}:20"))
+            for hour in range(7, 17)
+        ],
+    }
+    everything = build_timetables(options, max_results=100)
+    assert len(everything) == 90  # Any two different hours
+    scores = [timetable.score for timetable in everything]
+    assert scores == sorted(scores)
+    top = build_timetables(options, max_results=3)
+    assert [timetable.score for timetable in top] == scores[:3]
+    assert build_timetables(options, max_results=0) == []
+
+
+def test_alternatives_share_the_meeting_times():
+    options = {
+        "ESPA3101": [
+            option("ESPA3101", "010", ("MJ", "10:30", "11:50")),
+            option("ESPA3101", "011", ("MJ", "10:30", "11:50")),
+        ]
+    }
+    (timetable,) = build_timetables(options)
+    assert timetable.sections[0].section_code == "010"
+    assert timetable.sections[0].alternatives == ["011"]
+    assert timetable.days_on_campus == 2
+    assert timetable.minutes_on_campus == 2 * 80
+
+
+def test_matches_exhaustive_search():
+    rng = random.Random(7)
+    options = {}
+    for course in range(5):
+        course_code = f"CURS{course:04d}"
+        options[course_code] = []
+        for section in range(6):
+            days = rng.choice(["LWV", "MJ", "LW", "J"])
+            hour = rng.randint(7, 17)
+            options[course_code].append(
+                option(
+                    course_code,
+                    f"{section:03d}",
+                    (days, f"{hour}:30", f"{hour + 1}:20"),
+                )
+            )
+    # Sections with the same times are one option (the rest become alternatives)
+    masks = [{section.mask for section in sections} for sections in options.values()]
+    scores = []
+    for choice in itertools.product(*masks):
+        mask = 0
+        for section_mask in choice:
+            if section_mask & mask:
+                break
+            mask |= section_mask
+        else:
+            scores.append(timetable_score(mask))
+    timetables = build_timetables(options, max_results=10)
+    assert [timetable.score for timetable in timetables] == sorted(scores)[:10]
+
+
+def test_node_budget_returns_the_best_found():
+    options = {
+        f"CURS{course:04d}": [
+            option(
+                f"CURS{course:04d}", f"{hour:03d}", ("LWV", f"{hour}:00", f"{hour}:50")
+            )
+            for hour in range(7, 19)
+        ]
+        for course in range(8)
+    }
+    timetables = build_timetables(options, max_results=5, max_nodes=50)
+    assert 0 < len(timetables) <= 5
+    for timetable in timetables:
+        hours = {section.section_code for section in timetable.sections}
+        assert len(hours) == 8
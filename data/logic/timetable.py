@@ -0,0 +1,368 @@
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from data.database.database import Course, Section
+from data.parser.schedule_parser import parse_schedule
+
+logger = logging.getLogger(__name__)
+
+# Week layout of the meeting bitmasks: one bit per SLOT_MINUTES slot, day after day
+DAYS = "LMWJVSD"  # Lunes .. Domingo, as in the schedule strings
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_BITS = (1 << SLOTS_PER_DAY) - 1
+# Ranking: minutes spent on campus, plus this much per day that requires going
+DAY_PENALTY_MINUTES = 90
+# Partial timetables build_timetables explores before returning the best found,
+# tens of milliseconds for ten courses with many sections each
+MAX_SEARCH_NODES = 5000
+
+
+class TimetableSection(BaseModel):
+    course_code: str
+    section_code: str
+    meetings: List[str] = []
+    professors: List[str] = []
+    modality: Optional[str] = None
+    available_seats: Optional[int] = None
+    # Other sections of the course that meet at exactly the same times
+    alternatives: List[str] = []
+
+
+class Timetable(BaseModel):
+    score: int  # Lower is better
+    days_on_campus: int
+    minutes_on_campus: int
+    sections: List[TimetableSection]
+
+
+@dataclass(frozen=True)
+class SectionOption:
+    course_code: str
+    section_code: str
+    mask: int
+    meetings: Tuple[str, ...] = ()
+    professors: Tuple[str, ...] = ()
+    modality: Optional[str] = None
+    available_seats: Optional[int] = None
+
+
+def time_to_slot(time: str, round_up: bool = False) -> int:
+    """Slot of an "HH:MM" (24 hour) time within its day."""
+    hours, minutes = time.strip().split(":")
+    total = int(hours) * 60 + int(minutes)
+    slot, remainder = divmod(total, SLOT_MINUTES)
+    if round_up and remainder:
+        slot += 1
+    return min(slot, SLOTS_PER_DAY)
+
+
+def meeting_mask(days: str, start_time: str, end_time: str) -> int:
+    """
+    Weekly bitmask of a meeting, e.g. meeting_mask("LWV", "07:30", "08:20").
+    Args:
+        days: Day letters (L M W J V S D).
+        start_time: Start time in 24 hour "HH:MM" format.
+        end_time: End time in 24 hour "HH:MM" format.
+    Returns:
+        int with the bits of every slot the meeting occupies.
+    """
+    start = time_to_slot(start_time)
+    end = time_to_slot(end_time, round_up=True)
+    if end <= start:
+        return 0
+    day_mask = ((1 << (end - start)) - 1) << start
+    mask = 0
+    for day in days.upper():
+        position = DAYS.find(day)
+        if position >= 0:
+            mask |= day_mask << (position * SLOTS_PER_DAY)
+    return mask
+
+
+def campus_time(mask: int) -> Tuple[int, int]:
+    """(days on campus, minutes from first to last meeting summed over the days)."""
+    days = 0
+    slots = 0
+    for position in range(len(DAYS)):
+        day = (mask >> (position * SLOTS_PER_DAY)) & DAY_BITS
+        if day:
+            days += 1
+            slots += day.bit_length() - (day & -day).bit_length() + 1
+    return days, slots * SLOT_MINUTES
+
+
+def timetable_score(mask: int) -> int:
+    """
+    Cost of a combined weekly mask. Adding a section never lowers it, which lets the
+    search discard partial timetables that already cost more than the worst one kept.
+    It is a sum of day costs (see _day_cost), so the search updates it day by day.
+    """
+    days, minutes = campus_time(mask)
+    return minutes + days * DAY_PENALTY_MINUTES
+
+
+def _day_spans(mask: int) -> Tuple[Tuple[int, int, int], ...]:
+    """(day, first slot, last slot) of every day the mask uses."""
+    spans = []
+    for position in range(len(DAYS)):
+        day = (mask >> (position * SLOTS_PER_DAY)) & DAY_BITS
+        if day:
+            spans.append(
+                (position, (day & -day).bit_length() - 1, day.bit_length() - 1)
+            )
+    return tuple(spans)
+
+
+def _day_cost(first: int, last: int) -> int:
+    """timetable_score of a single day on campus from slot first to slot last."""
+    return (last - first + 1) * SLOT_MINUTES + DAY_PENALTY_MINUTES
+
+
+def build_timetables(
+    options_by_course: Dict[str, Sequence[SectionOption]],
+    max_results: int = 10,
+    blocked_mask: int = 0,
+    max_nodes: int = MAX_SEARCH_NODES,
+) -> List[Timetable]:
+    """
+    Best conflict-free timetables taking one section of every course.
+    Sections of a course with identical meeting times are grouped (the rest show up as
+    alternatives), then courses are searched fewest options first by branch and bound:
+    a section is only tried when its mask doesn't intersect the mask of the sections
+    chosen so far, cheapest resulting timetable first, and a branch is pruned once its
+    optimistic score can't beat the top max_results. The optimistic score of a partial
+    timetable is the larger of its own score and the time its classes plus the shortest
+    section of every remaining course take on its days, since sections never overlap.
+    The search stops after max_nodes partial timetables, keeping the best found.
+    Args:
+        options_by_course: Candidate sections of each course.
+        max_results: Number of timetables to return.
+        blocked_mask: Times the student is unavailable (see meeting_mask).
+        max_nodes: Budget of partial timetables to explore.
+    Returns:
+        Timetables sorted from best to worst. Empty if some course can't fit.
+    """
+    groups: List[List[Tuple[int, List[SectionOption]]]] = []
+    for course_code, options in options_by_course.items():
+        by_mask: Dict[int, List[SectionOption]] = {}
+        for option in options:
+            if option.mask & blocked_mask:
+                continue
+            by_mask.setdefault(option.mask, []).append(option)
+        if not by_mask:
+            logger.info(f"No section of {course_code} fits the blocked times.")
+            return []
+        groups.append(list(by_mask.items()))
+    if not groups or max_results <= 0:
+        return []
+    # Fewest options first fails fast
+    groups.sort(key=len)
+
+    # Per section: its days as (day, first slot, last slot) and the slots it takes
+    section_days = [
+        [_day_spans(section_mask) for section_mask, _ in course_groups]
+        for course_groups in groups
+    ]
+    section_slots = [
+        [section_mask.bit_count() for section_mask, _ in course_groups]
+        for course_groups in groups
+    ]
+    # Sections never overlap, so the courses still to pick add at least their shortest
+    # sections' time to the time on campus
+    remaining_slots = [0] * (len(groups) + 1)
+    for depth in range(len(groups) - 1, -1, -1):
+        remaining_slots[depth] = remaining_slots[depth + 1] + min(section_slots[depth])
+
+    best: List[Tuple[int, int, Tuple[int, ...]]] = []  # Max-heap on (-score, -order)
+    order = itertools.count()
+    chosen: List[int] = []
+    explored = 0
+
+    def search(
+        depth: int,
+        mask: int,
+        spans: List[Optional[Tuple[int, int]]],
+        score: int,
+        slots: int,
+    ) -> bool:
+        """Returns False once the node budget runs out."""
+        nonlocal explored
+        explored += 1
+        if depth == len(groups):
+            entry = (-score, -next(order), tuple(chosen))
+            if len(best) < max_results:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heapreplace(best, entry)
+            return True
+        if explored > max_nodes:
+            return False
+        days = sum(1 for span in spans if span)
+        children = []
+        for index, (section_mask, _) in enumerate(groups[depth]):
+            if section_mask & mask:
+                continue
+            child_score = score
+            child_days = days
+            for day, first, last in section_days[depth][index]:
+                span = spans[day]
+                if span:
+                    grown = max(last, span[1]) - span[1] + span[0] - min(first, span[0])
+                    child_score += grown * SLOT_MINUTES
+                else:
+                    child_score += _day_cost(first, last)
+                    child_days += 1
+            child_slots = slots + section_slots[depth][index]
+            class_minutes = (child_slots + remaining_slots[depth + 1]) * SLOT_MINUTES
+            bound = max(child_score, class_minutes + child_days * DAY_PENALTY_MINUTES)
+            children.append((bound, child_score, index, child_slots))
+        # Cheapest first, so the first branch that can't make the top ends the loop
+        children.sort()
+        for bound, child_score, index, child_slots in children:
+            if len(best) == max_results and bound >= -best[0][0]:
+                break
+            section_mask = groups[depth][index][0]
+            child_spans = list(spans)
+            for day, first, last in section_days[depth][index]:
+                span = spans[day]
+                child_spans[day] = (
+                    (min(first, span[0]), max(last, span[1])) if span else (first, last)
+                )
+            chosen.append(index)
+            within_budget = search(
+                depth + 1, mask | section_mask, child_spans, child_score, child_slots
+            )
+            chosen.pop()
+            if not within_budget:
+                return False
+        return True
+
+    if not search(0, 0, [None] * len(DAYS), 0, 0):
+        logger.warning(
+            f"Timetable search stopped after {max_nodes} partial timetables; "
+            "returning the best found so far."
+        )
+    logger.debug(f"Timetable search explored {explored} partial timetables.")
+
+    timetables = []
+    for negative_score, _, choice in sorted(best, reverse=True):
+        mask = 0
+        sections = []
+        for course_groups, index in zip(groups, choice):
+            section_mask, options = course_groups[index]
+            mask |= section_mask
+            first = options[0]
+            sections.append(
+                TimetableSection(
+                    course_code=first.course_code,
+                    section_code=first.section_code,
+                    meetings=list(first.meetings),
+                    professors=list(first.professors),
+                    modality=first.modality,
+                    available_seats=first.available_seats,
+                    alternatives=[option.section_code for option in options[1:]],
+                )
+            )
+        days, minutes = campus_time(mask)
+        timetables.append(
+            Timetable(
+                score=-negative_score,
+                days_on_campus=days,
+                minutes_on_campus=minutes,
+                sections=sorted(sections, key=lambda section: section.course_code),
+            )
+        )
+    return timetables
+
+
+def semester_label(term: str, year: int) -> str:
+    """
+    Section.semester value of a term, e.g. ("spring", 2026) -> "Spring-2025".
+    Sections are stored under the academic year's starting year, so spring and summer
+    terms belong to the previous calendar year.
+    """
+    names = {
+        "fall": "Fall",
+        "spring": "Spring",
+        "firstsummer": "FirstSummer",
+        "secondsummer": "SecondSummer",
+        "extendedsummer": "ExtendedSummer",
+    }
+    term_lower = term.lower()
+    if term_lower not in names:
+        raise ValueError(f"Unsupported term: {term}")
+    return f"{names[term_lower]}-{year if term_lower == 'fall' else year - 1}"
+
+
+def _section_option(course_code: str, section: Section) -> SectionOption:
+    meetings_text = [
+        text.strip() for text in (section.meetings_text or "").split(",") if text
+    ]
+    mask = 0
+    if section.meetings:
+        for meeting in section.meetings:
+            if meeting.days and meeting.start_time and meeting.end_time:
+                mask |= meeting_mask(meeting.days, meeting.start_time, meeting.end_time)
+    else:
+        # Older rows only kept the raw meeting strings
+        for text in meetings_text:
+            parsed = parse_schedule(text)
+            if parsed:
+                mask |= meeting_mask(
+                    parsed["days"], parsed["start_time"], parsed["end_time"]
+                )
+    available_seats = None
+    if section.capacity:
+        available_seats = max(0, section.capacity - (section.taken or 0))
+    return SectionOption(
+        course_code=course_code,
+        section_code=section.section_code,
+        mask=mask,
+        meetings=tuple(meetings_text),
+        professors=tuple(
+            name.strip() for name in (section.professors or "").split(",") if name
+        ),
+        modality=section.modality,
+        available_seats=available_seats,
+    )
+
+
+async def load_section_options(
+    course_codes: Iterable[str],
+    semester: str,
+    db: AsyncSession,
+    open_only: bool = False,
+) -> Dict[str, List[SectionOption]]:
+    """
+    Sections of the given courses offered in a semester, with their meeting masks.
+    Args:
+        course_codes: Course codes to load.
+        semester: Section.semester value (e.g. "Fall-2025", see semester_label).
+        db: Async session.
+        open_only: Skip sections with no seats left (sections without capacity are kept).
+    Returns:
+        Dict mapping course code to its sections. Courses without sections are omitted.
+    """
+    codes = list(dict.fromkeys(code.replace(" ", "") for code in course_codes))
+    stmt = (
+        select(Course.course_code, Section)
+        .join(Section, Section.cid == Course.cid)
+        .where(Course.course_code.in_(codes), Section.semester == semester)
+        .options(selectinload(Section.meetings))
+    )
+    options: Dict[str, List[SectionOption]] = {}
+    for course_code, section in (await db.execute(stmt)).all():
+        option = _section_option(course_code, section)
+        if open_only and option.available_seats == 0:
+            continue
+        options.setdefault(course_code, []).append(option)
+    return options
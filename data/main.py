@@ -1,6 +1,22 @@
+import asyncio
+import json
 import logging
 import datetime
 from data.logic.availability import fetch_next_term_year
+from data.logic.catalog import get_catalog_snapshot
+from data.logic.difficulty_balancer import rebalance_difficulty
+from data.logic.eligibility import EligibilityResult, find_eligible_courses
+from data.logic.feasibility import FeasibilityResult, check_graduation_feasibility
+from data.logic.program_comparison import ProgramComparison, compare_programs
+from data.logic.scoring import ScoringWeights
+from data.logic.timetable import (
+    Timetable,
+    build_timetables,
+    load_section_options,
+    meeting_mask,
+    semester_label,
+)
+from data.parser.requisite_store import PARSER_VERSION, load_parse_errors_async
 from fastapi import FastAPI, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field, validator
@@ -10,7 +26,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from data.logic.recommendation_scheduler import (
     generate_sequence,  # New main generation function
     load_program_data,
-    load_course_data_lookups,
+    load_programs_data,
     SchedulerResult,
     SchedulerSkeletonResult,
 )
@@ -71,6 +87,14 @@ class ScheduleRequest(BaseModel):
         default_factory=dict,
         description="Credits completed by category (e.g., {'humanities': 6, 'technical': 3})",
     )
+    skip_if_infeasible: bool = Field(
+        False,
+        description="Skip schedule generation when the feasibility precheck shows the target can't be met",
+    )
+    scoring_weights: Optional[ScoringWeights] = Field(
+        None,
+        description="Weights used to rank each term's candidate courses (lowest score first)",
+    )
 
     @validator("specific_summers", pre=True, always=True)
     def check_specific_summers(cls, v, values):
@@ -85,6 +109,77 @@ class ScheduleRequest(BaseModel):
         return v
 
 
+class EligibilityRequest(BaseModel):
+    taken_courses: List[str] = Field(
+        [], description="List of course codes already passed"
+    )
+    term: Optional[
+        Literal["Fall", "Spring", "FirstSummer", "SecondSummer", "ExtendedSummer"]
+    ] = Field(None, description="Term to check, defaults to the upcoming term")
+    program_code: Optional[str] = Field(
+        None,
+        description="Only return the program's required and technical elective courses",
+    )
+
+
+class ProgramComparisonRequest(BaseModel):
+    program_codes: List[str] = Field(
+        ..., min_length=1, max_length=6, description="Program codes to compare"
+    )
+    start_year: int = Field(..., description="Academic year to start planning FROM")
+    taken_courses: List[str] = Field(
+        [], description="List of course codes already passed"
+    )
+    credit_load_preference: CreditLoad
+    specific_elective_credits_initial: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Credits completed by category (e.g., {'humanities': 6, 'technical': 3})",
+    )
+    max_years: int = Field(
+        6, ge=1, le=10, description="Planning horizon for each program, in years"
+    )
+
+
+class ProgramComparisonResponse(BaseModel):
+    comparisons: List[ProgramComparison]
+    warnings: List[str] = []
+
+
+class UnavailableTime(BaseModel):
+    days: str = Field(
+        ..., pattern=r"^[LMWJVSD]{1,7}$", description="Day letters (e.g. 'LWV')"
+    )
+    start_time: str = Field(
+        ..., pattern=r"^\d{1,2}:\d{2}$", description="24 hour start time (e.g. '07:30')"
+    )
+    end_time: str = Field(
+        ..., pattern=r"^\d{1,2}:\d{2}$", description="24 hour end time (e.g. '12:00')"
+    )
+
+
+class TimetableRequest(BaseModel):
+    course_codes: List[str] = Field(
+        ..., min_length=1, max_length=10, description="Courses to fit in the timetable"
+    )
+    semester: Optional[str] = Field(
+        None,
+        description="Section semester (e.g. 'Fall-2025'), defaults to the upcoming term",
+    )
+    unavailable: List[UnavailableTime] = Field(
+        [], description="Times the student can't attend classes"
+    )
+    open_sections_only: bool = Field(
+        False, description="Skip sections with no seats left"
+    )
+    max_results: int = Field(10, ge=1, le=50, description="Timetables to return")
+
+
+class TimetableResponse(BaseModel):
+    semester: str
+    timetables: List[Timetable]
+    warnings: List[str] = []
+
+
 class TermSchedule(BaseModel):  # For API response, mirrors structure of scheduler
     term_name: str
     courses: List[str]
@@ -102,6 +197,21 @@ class RecommendedSchedule(BaseModel):
 class ScheduleResponse(BaseModel):
     recommendations: List[RecommendedSchedule]
     warnings: List[str] = []
+    feasibility: Optional[FeasibilityResult] = None
+
+
+class RequisiteParseErrorEntry(BaseModel):
+    course_code: str
+    kind: str
+    raw: str
+    error: str
+    parser_version: int
+
+
+class RequisiteParseErrorReport(BaseModel):
+    # Entries from another version are from before the last requisite refresh
+    parser_version: int
+    errors: List[RequisiteParseErrorEntry]
 
 
 # Async database setup
@@ -142,7 +252,174 @@ def map_request_term_to_scheduler_term(req_term: str) -> str:
     return mapping[term_lower]
 
 
+def get_upcoming_start_term(start_year: int) -> Tuple[str, int]:
+    # TODO: implement course prediction based on start year and term as request start year and term refer to
+    # when a student enrolled rather than the first term/year they are planning for using our scheduler.
+    upcoming_start_term, upcoming_start_year = fetch_next_term_year()
+    if start_year > upcoming_start_year:
+        # Handle case where the student hasn't enrolled yet
+        upcoming_start_term = "fall"
+        upcoming_start_year = start_year
+    return upcoming_start_term, upcoming_start_year
+
+
+def run_feasibility_precheck(
+    request: ScheduleRequest, program_reqs, catalog
+) -> FeasibilityResult:
+    upcoming_start_term, upcoming_start_year = get_upcoming_start_term(request.start_year)
+    return check_graduation_feasibility(
+        program_reqs=program_reqs,
+        course_lookups=catalog.course_lookups,
+        taken_courses=set(request.taken_courses),
+        specific_elective_credits_initial=request.specific_elective_credits_initial,
+        credit_limits=request.credit_load_preference.model_dump(),
+        start_term=upcoming_start_term,
+        start_year=upcoming_start_year,
+        target_term=request.target_grad_term,
+        target_year=request.target_grad_year,
+        availability=catalog.availability,
+        equivalences=catalog.equivalences,
+    )
+
+
 # API endpoint
+@app.post("/check-feasibility", response_model=FeasibilityResult)
+async def check_feasibility_endpoint(
+    request: ScheduleRequest, db: AsyncSession = Depends(get_db)
+):
+    program_reqs = await load_program_data(request.program_code, db)
+    if not program_reqs:
+        raise HTTPException(
+            status_code=404, detail=f"Program '{request.program_code}' not found"
+        )
+    catalog = await get_catalog_snapshot(db)
+    if not catalog:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load course data or course data is empty.",
+        )
+    return run_feasibility_precheck(request, program_reqs, catalog)
+
+
+@app.get("/requisite-parse-errors", response_model=RequisiteParseErrorReport)
+async def requisite_parse_errors_endpoint(db: AsyncSession = Depends(get_db)):
+    errors = await load_parse_errors_async(db)
+    return RequisiteParseErrorReport(
+        parser_version=PARSER_VERSION,
+        errors=[
+            RequisiteParseErrorEntry(
+                course_code=error.course_code,
+                kind=error.kind,
+                raw=error.raw,
+                error=error.error,
+                parser_version=error.parser_version,
+            )
+            for error in errors
+        ],
+    )
+
+
+@app.post("/eligible-courses", response_model=EligibilityResult)
+async def eligible_courses_endpoint(
+    request: EligibilityRequest, db: AsyncSession = Depends(get_db)
+):
+    course_codes = None
+    if request.program_code:
+        program_reqs = await load_program_data(request.program_code, db)
+        if not program_reqs:
+            raise HTTPException(
+                status_code=404, detail=f"Program '{request.program_code}' not found"
+            )
+        course_codes = set(json.loads(program_reqs.courses or "{}")) | set(
+            json.loads(program_reqs.technical_courses or "{}")
+        )
+    catalog = await get_catalog_snapshot(db)
+    if not catalog:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load course data or course data is empty.",
+        )
+    term = request.term or fetch_next_term_year()[0]
+    return find_eligible_courses(catalog, request.taken_courses, term, course_codes)
+
+
+@app.post("/compare-programs", response_model=ProgramComparisonResponse)
+async def compare_programs_endpoint(
+    request: ProgramComparisonRequest, db: AsyncSession = Depends(get_db)
+):
+    program_codes = list(dict.fromkeys(request.program_codes))
+    programs = await load_programs_data(program_codes, db)
+    missing = [code for code in program_codes if code not in programs]
+    if len(missing) == len(program_codes):
+        raise HTTPException(
+            status_code=404, detail=f"Programs not found: {', '.join(missing)}"
+        )
+    catalog = await get_catalog_snapshot(db)
+    if not catalog:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to load course data or course data is empty.",
+        )
+
+    upcoming_start_term, upcoming_start_year = get_upcoming_start_term(
+        request.start_year
+    )
+    try:
+        comparisons = await compare_programs(
+            [programs[code] for code in program_codes if code in programs],
+            catalog,
+            taken_courses=set(request.taken_courses),
+            specific_elective_credits_initial=request.specific_elective_credits_initial,
+            credit_limits=request.credit_load_preference.model_dump(),
+            start_term=upcoming_start_term,
+            start_year=upcoming_start_year,
+            max_terms=request.max_years * 4,
+        )
+    except Exception as e:
+        logging.exception(f"Unexpected error comparing programs {program_codes}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: Failed to compare programs. Error: {str(e)}",
+        )
+    return ProgramComparisonResponse(
+        comparisons=comparisons,
+        warnings=[f"Program '{code}' not found" for code in missing],
+    )
+
+
+@app.post("/timetables", response_model=TimetableResponse)
+async def timetables_endpoint(
+    request: TimetableRequest, db: AsyncSession = Depends(get_db)
+):
+    semester = request.semester or semester_label(*fetch_next_term_year())
+    course_codes = list(
+        dict.fromkeys(code.replace(" ", "") for code in request.course_codes)
+    )
+    options = await load_section_options(
+        course_codes, semester, db, open_only=request.open_sections_only
+    )
+    if not options:
+        raise HTTPException(status_code=404, detail=f"No sections found for {semester}")
+
+    warnings = [
+        f"No sections of {code} found for {semester}; left out of the timetables."
+        for code in course_codes
+        if code not in options
+    ]
+    blocked_mask = 0
+    for unavailable in request.unavailable:
+        blocked_mask |= meeting_mask(
+            unavailable.days, unavailable.start_time, unavailable.end_time
+        )
+    # CPU bound search, kept off the event loop
+    timetables = await asyncio.to_thread(
+        build_timetables, options, request.max_results, blocked_mask
+    )
+    if not timetables:
+        warnings.append("No conflict-free combination of sections was found.")
+    return TimetableResponse(semester=semester, timetables=timetables, warnings=warnings)
+
+
 @app.post("/recommend-schedule", response_model=ScheduleResponse)
 async def recommend_schedule_endpoint(
     request: ScheduleRequest, db: AsyncSession = Depends(get_db)
@@ -166,12 +443,13 @@ async def recommend_schedule_endpoint(
                 status_code=404, detail=f"Program '{request.program_code}' not found"
             )
 
-        course_lookups = await load_course_data_lookups(db)
-        if not course_lookups:
+        catalog = await get_catalog_snapshot(db)
+        if not catalog:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to load course data or course data is empty.",
             )
+        course_lookups = catalog.course_lookups
 
         # --- Input Validation ---
         if request.target_grad_year < request.start_year or (
@@ -210,20 +488,27 @@ async def recommend_schedule_endpoint(
                 "The current scheduler version does not yet support targeting specific summer years. "
                 "Advanced summer term management is under development."
             )
-        if request.difficulty_curve != "Flat":
+
+        upcoming_start_term, upcoming_start_year = get_upcoming_start_term(request.start_year)
+
+        # Cheap lower-bound check before running the full generator
+        feasibility = run_feasibility_precheck(request, program_reqs, catalog)
+        if not feasibility.is_feasible:
             api_warnings.append(
-                f"Note: 'difficulty_curve' preference for '{request.difficulty_curve}' is noted. "
-                "The current scheduler uses a default term difficulty target. "
-                "Dynamic difficulty curve shaping is under development."
+                "Warning: Target graduation date is not reachable"
+                + (
+                    f" (earliest possible: {feasibility.earliest_graduation_term})."
+                    if feasibility.earliest_graduation_term
+                    else "."
+                )
             )
-
-        # TODO: implement course prediction based on start year and term as request start year and term refer to
-        # when a student enrolled rather than the first term/year they are planning for using our scheduler.
-        upcoming_start_term, upcoming_start_year = fetch_next_term_year()
-        if request.start_year > upcoming_start_year:
-            # Handle case where the student hasn't enrolled yet
-            upcoming_start_term = "fall"
-            upcoming_start_year = request.start_year
+            api_warnings.extend(feasibility.reasons)
+            if request.skip_if_infeasible:
+                return ScheduleResponse(
+                    recommendations=[],
+                    warnings=list(set(api_warnings)),
+                    feasibility=feasibility,
+                )
 
         # Call the new generate_sequence function
         result_tuple: Tuple[
@@ -238,6 +523,8 @@ async def recommend_schedule_endpoint(
             credit_limits=request.credit_load_preference.model_dump(),
             db_session=db,
             max_terms=max_terms_for_scheduler,
+            catalog=catalog,
+            scoring_weights=request.scoring_weights,
         )
 
         resolved_schedule_result: Optional[SchedulerResult] = result_tuple[0]
@@ -257,9 +544,25 @@ async def recommend_schedule_endpoint(
                 "Could not generate any valid schedules with the given constraints using the current scheduler."
             )
             return ScheduleResponse(
-                recommendations=[], warnings=list(set(api_warnings))
+                recommendations=[],
+                warnings=list(set(api_warnings)),
+                feasibility=feasibility,
             )  # Ensure unique warnings
 
+        # Post-pass: shape the per-term difficulty to the requested curve
+        try:
+            resolved_schedule_result = rebalance_difficulty(
+                resolved_schedule_result,
+                course_lookups,
+                request.difficulty_curve,
+                request.credit_load_preference.model_dump(),
+                catalog=catalog,
+            )
+        except Exception as e:
+            logging.warning(
+                f"Difficulty rebalancing failed, keeping original plan: {e}"
+            )
+
         if resolved_schedule_result.warnings:  # Capture warnings from resolved result
             api_warnings.extend(
                 w for w in resolved_schedule_result.warnings if w not in api_warnings
@@ -346,7 +649,9 @@ async def recommend_schedule_endpoint(
         )
 
         return ScheduleResponse(
-            recommendations=recommendations, warnings=list(set(api_warnings))
+            recommendations=recommendations,
+            warnings=list(set(api_warnings)),
+            feasibility=feasibility,
         )
 
     except HTTPException as http_exc:
@@ -0,0 +1,91 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def _pattern_regex(pattern: str) -> str:
+    # Patterns are compared to a code with zip(): "*" matches any character and the
+    # comparison stops at the end of the shorter one, so CIIC**** also matches "CII"
+    regex = ""
+    for char in reversed(pattern):
+        regex = f"(?:{'.' if char == '*' else re.escape(char)}{regex}|$)"
+    return regex
+
+
+class CoursePatterns:
+    """
+    Course code patterns of a CREDITS/COURSES_WITH_PATTERN requirement (e.g. CIIC****),
+    compiled into one regex that matches the same codes as comparing each pattern
+    character by character. When every pattern is a literal prefix followed only by
+    wildcards, the prefixes are kept too so totals can be looked up in a PrefixTotals.
+    """
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = patterns
+        alternatives = "|".join(map(_pattern_regex, patterns))
+        # No patterns match no course
+        self.regex = re.compile(alternatives or "(?!)", re.DOTALL)
+        self.prefixes: Optional[Tuple[str, ...]] = None
+        literals = [pattern.rstrip("*") for pattern in patterns]
+        if all("*" not in literal for literal in literals):
+            # A prefix of another prefix matches everything the longer one does, so the
+            # remaining ones match disjoint sets of codes
+            kept = []
+            for literal in sorted(set(literals), key=len):
+                if not any(literal.startswith(prefix) for prefix in kept):
+                    kept.append(literal)
+            self.prefixes = tuple(kept)
+
+    def matches(self, course_code: str) -> bool:
+        return self.regex.match(course_code) is not None
+
+
+@lru_cache(maxsize=1024)
+def _compile_patterns(patterns: Tuple[str, ...]) -> CoursePatterns:
+    return CoursePatterns(patterns)
+
+
+def compile_patterns(patterns: Iterable[str]) -> CoursePatterns:
+    """Compiled patterns, cached per distinct pattern list."""
+    return _compile_patterns(tuple(patterns))
+
+
+class PrefixTotals:
+    """Credits and number of course records per course code and per code prefix."""
+
+    def __init__(self):
+        self.by_prefix: Dict[str, Tuple[int, int]] = {}
+        self.by_code: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, course_code: str, credits: int) -> None:
+        credits_so_far, courses = self.by_code.get(course_code, (0, 0))
+        self.by_code[course_code] = (credits_so_far + credits, courses + 1)
+        for length in range(len(course_code) + 1):
+            prefix = course_code[:length]
+            credits_so_far, courses = self.by_prefix.get(prefix, (0, 0))
+            self.by_prefix[prefix] = (credits_so_far + credits, courses + 1)
+
+    def matching(self, patterns: CoursePatterns) -> Tuple[int, int]:
+        """(credits, course records) whose code matches any of the patterns."""
+        if patterns.prefixes is None:
+            matching = [
+                totals
+                for code, totals in self.by_code.items()
+                if patterns.matches(code)
+            ]
+        else:
+            matching = [
+                self.by_prefix.get(prefix, (0, 0)) for prefix in patterns.prefixes
+            ]
+            # Codes shorter than a prefix match it when they are its start
+            shorter_codes = {
+                prefix[:length]
+                for prefix in patterns.prefixes
+                for length in range(len(prefix))
+            }
+            matching.extend(
+                self.by_code[code] for code in shorter_codes if code in self.by_code
+            )
+        return sum(credits for credits, _ in matching), sum(
+            courses for _, courses in matching
+        )
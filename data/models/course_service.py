@@ -1,59 +1,181 @@
 #requisite unused
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
 from data.database.database import Course, engine
-from sqlalchemy.orm import sessionmaker, aliased
-from sqlalchemy import func, distinct
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import func
+
+# Shared by every CourseService, so units of work reuse the engine's pooled connections.
+# Nothing is committed through it, fetched courses stay readable after their session closes.
+SessionLocal = sessionmaker(engine, expire_on_commit=False)
+# Keeps IN lists under SQLite's bound parameter limit
+IN_CHUNK_SIZE = 500
+
+_latestCourses: Optional[List[Course]] = None
+_latestCoursesLock = threading.Lock()
+
+
+def invalidateLatestCourses() -> None:
+    """Drops the cached getLatestCourses result, e.g. after the catalog is refreshed."""
+    global _latestCourses
+    with _latestCoursesLock:
+        _latestCourses = None
+
+
+def pickCourseVersion(
+    versions: List[Course], term: str | None, year: int | None
+) -> Optional[Course]:
+    """The row getCourse returns for the term/year, from all the course's rows (in cid order)."""
+    candidates = [
+        course
+        for course in versions
+        if (term is None or course.term == term)
+        and (year is None or course.year == year)
+    ]
+    if not candidates:
+        return None
+    if year is None and term is not None:
+        return max(candidates, key=lambda course: course.year)
+    if year is not None and term is None:
+        return candidates[0]
+    # Code only (or the one row of the term and year): first in the unique index
+    # on (course_code, term, year)
+    return min(candidates, key=lambda course: (course.term, course.year))
+
+
+def _chunks(codes: List[str]) -> Iterator[List[str]]:
+    for start in range(0, len(codes), IN_CHUNK_SIZE):
+        yield codes[start : start + IN_CHUNK_SIZE]
 
 
 class CourseService:
     def __init__(self):
-        Session = sessionmaker(engine)
-        self.session = Session()
+        # Session of the current unit of work, None outside of one
+        self.session: Optional[Session] = None
+        # (code, term, year) -> getCourse result, for the current unit of work
+        self._identityMap: Dict[
+            Tuple[str, Optional[str], Optional[int]], Optional[Course]
+        ] = {}
+
+    @contextmanager
+    def unitOfWork(self) -> Iterator["CourseService"]:
+        """
+        Runs the calls made inside on one session, and returns courses already fetched
+        in it without querying again. Calls outside of one are a unit of work each.
+        """
+        if self.session is not None:
+            yield self
+            return
+        self.session = SessionLocal()
+        try:
+            yield self
+        finally:
+            self.session.close()
+            self.session = None
+            self._identityMap.clear()
+
+    @contextmanager
+    def _unitSession(self) -> Iterator[Session]:
+        with self.unitOfWork():
+            yield self.session
 
     def getCourse(self, code: str, term: str | None, year: int | None) -> Course | None:
-        self.session.begin()
+        key = (code, term, year)
+        with self._unitSession() as session:
+            if key not in self._identityMap:
+                self._identityMap[key] = self._queryCourse(session, code, term, year)
+            return self._identityMap[key]
+
+    def _queryCourse(
+        self, session: Session, code: str, term: str | None, year: int | None
+    ) -> Course | None:
         if term is None and year is None:
-            self.session.query(Course).filter_by(course_code=code)
-            course = self.session.query(Course).filter_by(course_code=code).first()
+            return session.query(Course).filter_by(course_code=code).first()
         elif term is None:
-            course = (
-                self.session.query(Course)
-                .filter_by(course_code=code, year=year)
-                .first()
-            )
+            return session.query(Course).filter_by(course_code=code, year=year).first()
         elif year is None:
-            course = (
-                self.session.query(Course)
+            return (
+                session.query(Course)
                 .filter_by(course_code=code, term=term)
                 .order_by(Course.year.desc())
                 .first()
             )
-        else:
-            course = (
-                self.session.query(Course)
-                .filter_by(course_code=code, term=term, year=year)
-                .first()
-            )
-        self.session.close()
-        return course
+        return (
+            session.query(Course)
+            .filter_by(course_code=code, term=term, year=year)
+            .first()
+        )
+
+    def getCourses(
+        self, codes: Iterable[str], term: str | None = None, year: int | None = None
+    ) -> Dict[str, Course | None]:
+        """
+        getCourse for several codes with one IN query (per IN_CHUNK_SIZE codes not
+        fetched yet in this unit of work).
+        Returns:
+            Course (or None if there is none for the term/year) per code.
+        """
+        codes = list(dict.fromkeys(codes))
+        with self._unitSession() as session:
+            missing = [
+                code for code in codes if (code, term, year) not in self._identityMap
+            ]
+            for chunk in _chunks(missing):
+                query = session.query(Course).filter(Course.course_code.in_(chunk))
+                if term is not None:
+                    query = query.filter_by(term=term)
+                if year is not None:
+                    query = query.filter_by(year=year)
+                versions: Dict[str, List[Course]] = {code: [] for code in chunk}
+                for course in query.order_by(Course.cid):
+                    versions[course.course_code].append(course)
+                for code in chunk:
+                    self._identityMap[(code, term, year)] = pickCourseVersion(
+                        versions[code], term, year
+                    )
+            return {code: self._identityMap[(code, term, year)] for code in codes}
+
+    def getCourseVersions(self, codes: Iterable[str]) -> dict[str, list[Course]]:
+        """Every term/year row of each course code, fetched in one query."""
+        codes = list(dict.fromkeys(codes))
+        versions: dict[str, list[Course]] = {code: [] for code in codes}
+        with self._unitSession() as session:
+            for chunk in _chunks(codes):
+                courses = (
+                    session.query(Course)
+                    .filter(Course.course_code.in_(chunk))
+                    .order_by(Course.cid)
+                    .all()
+                )
+                for course in courses:
+                    versions[course.course_code].append(course)
+        return versions
 
     def getAllCourses(self, term: str, year: int) -> list[Course]:
-        self.session.begin()
-        courses = self.session.query(Course).filter_by(year=year, term=term).all()
-        self.session.close()
-        return courses
+        with self._unitSession() as session:
+            return session.query(Course).filter_by(year=year, term=term).all()
 
     def getLatestCourses(self) -> list[Course]:
+        """Latest row of every course, queried once and cached until invalidateLatestCourses."""
+        global _latestCourses
+        with _latestCoursesLock:
+            if _latestCourses is None:
+                with self._unitSession() as session:
+                    _latestCourses = self._queryLatestCourses(session)
+            return list(_latestCourses)
+
+    def _queryLatestCourses(self, session: Session) -> list[Course]:
         # Subquery to get the max year for each course_code
         subquery = (
-            self.session.query(
-                Course.course_code, func.max(Course.year).label("max_year")
-            )
+            session.query(Course.course_code, func.max(Course.year).label("max_year"))
             .group_by(Course.course_code)
             .subquery()
         )
 
         latest_courses = (
-            self.session.query(Course)
+            session.query(Course)
             .join(
                 subquery,
                 (Course.course_code == subquery.c.course_code)
@@ -1,10 +1,11 @@
 #requisite unused
 
 from functools import reduce
-from typing import Tuple
+from typing import Iterable, List, Optional, Tuple
+from data.database.database import Course
 from data.models.course import DesiredCourse
 from data.models.course_requisite_result import RequisitesAnalysisResult
-from data.models.course_service import CourseService
+from data.models.course_service import CourseService, pickCourseVersion
 from data.models.student import StudentRecord
 from data.parser.requisite_parser import parse_prerequisites, parse_corequisites
 
@@ -17,29 +18,98 @@ class RecommendationSystem:
         self, student: StudentRecord, course: DesiredCourse, hasDirectorApproval=False
     ) -> RequisitesAnalysisResult:
         fetchedCourse = self.cs.getCourse(course.courseCode, course.term, course.year)
+        return self._analyzeCourse(student, course, fetchedCourse, hasDirectorApproval)
+
+    def checkMany(
+        self,
+        student: StudentRecord,
+        courses: Iterable[DesiredCourse],
+        hasDirectorApproval=False,
+    ) -> List[RequisitesAnalysisResult]:
+        """
+        checkCourseRequisites for several courses (e.g. a whole transcript audit), with
+        every course fetched in a single query.
+        Args:
+            student: Student whose records are checked.
+            courses: Courses the student wants to take.
+            hasDirectorApproval: Whether DIRECTOR_APPROVAL requirements are met.
+        Returns:
+            One RequisitesAnalysisResult per course, in the same order.
+        """
+        courses = list(courses)
+        versions = self.cs.getCourseVersions(course.courseCode for course in courses)
+        # Requisite strings are parsed once each (parse cache) and courses sharing one
+        # with the same year are checked once
+        checked: dict = {}
+        return [
+            self._analyzeCourse(
+                student,
+                course,
+                pickCourseVersion(
+                    versions[course.courseCode], course.term, course.year
+                ),
+                hasDirectorApproval,
+                checked,
+            )
+            for course in courses
+        ]
+
+    def _analyzeCourse(
+        self,
+        student: StudentRecord,
+        course: DesiredCourse,
+        fetchedCourse: Optional[Course],
+        hasDirectorApproval: bool,
+        checked: Optional[dict] = None,
+    ) -> RequisitesAnalysisResult:
         if not fetchedCourse:
             return RequisitesAnalysisResult(False, "", "")
-        parsedPrerequisites = parse_prerequisites(fetchedCourse.prerequisites)
-        parsedCorequisites = parse_corequisites(fetchedCourse.corequisites)
-        tookPrerequisites, missingPrerequisites = self.requisiteChecker(
-            student=student,
-            course=course,
-            requisites=parsedPrerequisites,
-            hasDirectorApproval=hasDirectorApproval,
-            checkingCorequisites=False,
+        tookPrerequisites, missingPrerequisites = self._checkRequisiteString(
+            student,
+            course,
+            fetchedCourse.prerequisites,
+            hasDirectorApproval,
+            False,
+            checked,
         )
-        tookCorequisites, missingCorequisites = self.requisiteChecker(
-            student=student,
-            course=course,
-            requisites=parsedCorequisites,
-            hasDirectorApproval=hasDirectorApproval,
-            checkingCorequisites=True,
+        tookCorequisites, missingCorequisites = self._checkRequisiteString(
+            student,
+            course,
+            fetchedCourse.corequisites,
+            hasDirectorApproval,
+            True,
+            checked,
         )
         canTakeCourse = tookPrerequisites and tookCorequisites
         return RequisitesAnalysisResult(
             canTakeCourse, missingPrerequisites, missingCorequisites
         )
 
+    def _checkRequisiteString(
+        self,
+        student: StudentRecord,
+        course: DesiredCourse,
+        requisiteString: str | None,
+        hasDirectorApproval: bool,
+        checkingCorequisites: bool,
+        checked: Optional[dict],
+    ) -> Tuple[bool, str]:
+        # Besides the student, the result only depends on the string and the course's year
+        key = (requisiteString, checkingCorequisites, course.year)
+        if checked is not None and key in checked:
+            return checked[key]
+        parse = parse_corequisites if checkingCorequisites else parse_prerequisites
+        result = self.requisiteChecker(
+            student=student,
+            course=course,
+            requisites=parse(requisiteString),
+            hasDirectorApproval=hasDirectorApproval,
+            checkingCorequisites=checkingCorequisites,
+        )
+        if checked is not None:
+            checked[key] = result
+        return result
+
     def requisiteChecker(
         self,
         student: StudentRecord,
@@ -153,20 +223,7 @@ class RecommendationSystem:
             case "CREDITS_WITH_PATTERN_REQUIREMENT":
                 patterns = requisites["patterns"]
                 requiredCredits = requisites["credits"]
-                takenCredits = 0
-                for takenCourse in student.completed_courses:
-                    foundMatch = False
-                    for pattern in patterns:
-                        matches = True
-                        for cChar, pChar in zip(takenCourse.courseCode, pattern):
-                            if pChar != "*" and pChar != cChar:
-                                matches = False
-                                break
-                        if matches:
-                            foundMatch = True
-                            break
-                    if foundMatch:
-                        takenCredits += takenCourse.credits
+                takenCredits = student.creditsWithPattern(patterns)
                 if takenCredits >= requiredCredits:
                     return True, ""
                 else:
@@ -177,20 +234,7 @@ class RecommendationSystem:
             case "COURSES_WITH_PATTERN_REQUIREMENT":
                 patterns = requisites["patterns"]
                 requiredNumberOfCourses = requisites["courses"]
-                qualifiedCourses = 0
-                for takenCourse in student.completed_courses:
-                    foundMatch = False
-                    for pattern in patterns:
-                        matches = True
-                        for cChar, pChar in zip(takenCourse.courseCode, pattern):
-                            if pChar != "*" and pChar != cChar:
-                                matches = False
-                                break
-                        if matches:
-                            foundMatch = True
-                            break
-                    if foundMatch:
-                        qualifiedCourses += 1
+                qualifiedCourses = student.coursesWithPattern(patterns)
                 if qualifiedCourses >= requiredNumberOfCourses:
                     return True, ""
                 else:
@@ -1,10 +1,13 @@
 # req unsused
 
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from data.models.course_pattern import PrefixTotals, compile_patterns
 
-@dataclass(slots=True)
+
+# frozen: the transcript index keeps totals of each record's credits
+@dataclass(slots=True, frozen=True)
 class CourseRecord:
     courseCode: str
     sectionCode: str
@@ -25,9 +28,13 @@ class StudentRecord:
     graduation_status: str  # Undergraduate or Graduate
     english_level: int  # ranges between 1-4 depending on taking the PNA and scoring well on the College Board
 
+    def __post_init__(self):
+        # The record keeps its own CompletedCourses copy of the list
+        self.completed_courses = CompletedCourses(self.completed_courses)
+
     @property
     def completedCredits(self) -> int:
-        return sum([c.credits for c in self.completed_courses])
+        return self._transcript().totals.by_prefix.get("", (0, 0))[0]
 
     def yearsEnrolled(self, currentYear: int) -> int:
         return (
@@ -38,13 +45,109 @@ class StudentRecord:
 
     # for requirements like BIOL{12} -> 12 BIOL credits
     def departmentCredits(self, department: str) -> int:
-        return sum(
-            [
-                c.credits
-                for c in self.completed_courses
-                if c.courseCode.startswith(department)
-            ]
-        )
+        return self._transcript().totals.by_prefix.get(department, (0, 0))[0]
 
     def tookCourse(self, course: str) -> bool:
-        return course in map(lambda c: c.courseCode, self.completed_courses)
+        return course in self._transcript().records_by_code
+
+    def courseRecords(self, course: str) -> List[CourseRecord]:
+        return self._transcript().records_by_code.get(course, [])
+
+    def addCompletedCourse(self, course: CourseRecord) -> None:
+        self._transcript()
+        self.completed_courses.append(course)
+
+    def _transcript(self) -> "TranscriptIndex":
+        courses = self.completed_courses
+        if not isinstance(courses, CompletedCourses):
+            # completed_courses was replaced by a plain list
+            courses = self.completed_courses = CompletedCourses(courses)
+        if courses.index is None:
+            courses.index = TranscriptIndex(courses)
+        return courses.index
+
+    # for requirements like CIIC****{12} -> 12 credits of courses matching CIIC****
+    def creditsWithPattern(self, patterns: Iterable[str]) -> int:
+        return self._transcript().totals.matching(compile_patterns(patterns))[0]
+
+    # for requirements like [INGL****]{2} -> 2 courses matching INGL****
+    def coursesWithPattern(self, patterns: Iterable[str]) -> int:
+        return self._transcript().totals.matching(compile_patterns(patterns))[1]
+
+
+class TranscriptIndex:
+    """Completed course records by code, with credit and course totals per code prefix."""
+
+    def __init__(self, records: Iterable[CourseRecord] = ()):
+        self.records_by_code: Dict[str, List[CourseRecord]] = {}
+        self.totals = PrefixTotals()
+        for record in records:
+            self.add(record)
+
+    def add(self, record: CourseRecord) -> None:
+        self.records_by_code.setdefault(record.courseCode, []).append(record)
+        self.totals.add(record.courseCode, record.credits)
+
+
+class CompletedCourses(List[CourseRecord]):
+    """
+    List of completed course records that owns their TranscriptIndex: append updates the
+    index and any other change to the list drops it, to be rebuilt when next needed.
+    Records themselves are frozen, so changing one means replacing it in the list.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, records: Iterable[CourseRecord] = ()):
+        super().__init__(records)
+        self.index: Optional[TranscriptIndex] = None
+
+    def append(self, record: CourseRecord) -> None:
+        super().append(record)
+        if self.index is not None:
+            self.index.add(record)
+
+    # Anything else may drop or reorder records, so the index is rebuilt later
+    def __setitem__(self, key, value):
+        self.index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.index = None
+        super().__delitem__(key)
+
+    def __iadd__(self, records):
+        self.index = None
+        return super().__iadd__(records)
+
+    def __imul__(self, times):
+        self.index = None
+        return super().__imul__(times)
+
+    def extend(self, records):
+        self.index = None
+        super().extend(records)
+
+    def insert(self, position, record):
+        self.index = None
+        super().insert(position, record)
+
+    def pop(self, position=-1):
+        self.index = None
+        return super().pop(position)
+
+    def remove(self, record):
+        self.index = None
+        super().remove(record)
+
+    def clear(self):
+        self.index = None
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self.index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self.index = None
+        super().reverse()
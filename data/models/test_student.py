@@ -0,0 +1,69 @@
+import dataclasses
+
+import pytest
+
+from data.models.student import CourseRecord, StudentRecord
+
+
+def make_student(*records):
+    return StudentRecord(
+        name="John Doe",
+        enrolledCourses=[],
+        enrolledDegrees=[("CIIC", 2022)],
+        completed_courses=list(records),
+        graduation_status="SUBGRADUADO",
+        english_level=2,
+    )
+
+
+def test_add_completed_course_updates_the_index():
+    student = make_student(CourseRecord("CIIC3011", "001", "Fall", 2022, "A", 3))
+    assert student.completedCredits == 3
+    student.addCompletedCourse(CourseRecord("MATE3031", "010", "Fall", 2022, "B", 4))
+    assert student.tookCourse("MATE3031")
+    assert student.departmentCredits("MATE") == 4
+    assert student.completedCredits == 7
+
+
+def test_replacing_a_record_in_place_rebuilds_the_index():
+    student = make_student(
+        CourseRecord("CIIC3011", "001", "Fall", 2022, "A", 3),
+        CourseRecord("INGL3101", "020", "Fall", 2022, "B", 3),
+    )
+    assert student.tookCourse("CIIC3011")
+    student.completed_courses[0] = CourseRecord("MATE3031", "010", "Fall", 2022, "A", 4)
+    assert not student.tookCourse("CIIC3011")
+    assert student.tookCourse("MATE3031")
+    assert student.completedCredits == 7
+    # Same length, different records
+    student.completed_courses[:] = [
+        CourseRecord("QUIM3131", "030", "Spring", 2023, "C", 3),
+        CourseRecord("QUIM3133", "031", "Spring", 2023, "A", 1),
+    ]
+    assert student.departmentCredits("QUIM") == 4
+    assert not student.tookCourse("MATE3031")
+
+
+def test_other_list_changes_rebuild_the_index():
+    record = CourseRecord("CIIC3011", "001", "Fall", 2022, "A", 3)
+    student = make_student(record)
+    assert student.tookCourse("CIIC3011")
+    student.completed_courses.remove(record)
+    assert not student.tookCourse("CIIC3011")
+    student.completed_courses += [record]
+    assert student.completedCredits == 3
+    student.completed_courses = []
+    assert student.completedCredits == 0
+    student.completed_courses.append(record)
+    assert student.courseRecords("CIIC3011") == [record]
+
+
+def test_record_credits_can_only_change_through_the_list():
+    student = make_student(CourseRecord("CIIC3011", "001", "Fall", 2022, "A", 3))
+    assert student.completedCredits == 3
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        student.completed_courses[0].credits = 4
+    student.completed_courses[0] = dataclasses.replace(
+        student.completed_courses[0], credits=4
+    )
+    assert student.completedCredits == 4
@@ -0,0 +1,117 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from data.parser import requisite_parser
+from data.parser.requisite_parser import LEXTAB_MODULE, PARSETAB_MODULE
+
+IMPORT_SNIPPET = "import data.parser.requisite_parser"
+# Hides the packaged tables so the import builds the lexer and LALR tables itself
+NO_TABLES_SNIPPET = (
+    "import sys\n"
+    f"sys.modules[{LEXTAB_MODULE!r}] = None\n"
+    f"sys.modules[{PARSETAB_MODULE!r}] = None\n" + IMPORT_SNIPPET
+)
+BASELINE_SNIPPET = "import ply.lex, ply.yacc"
+
+
+def time_snippet(snippet: str, runs: int) -> list[float]:
+    """Wall time in seconds of running the snippet in a fresh interpreter, runs times."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get("PYTHONPATH")])
+    )
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", snippet],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_construction(runs: int) -> tuple[float, float]:
+    """Median seconds to construct the lexer and parser in-process, (packaged tables, no tables)."""
+    packaged, built = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        lex.lex(module=requisite_parser, optimize=1, lextab=LEXTAB_MODULE)
+        yacc.yacc(
+            module=requisite_parser,
+            optimize=1,
+            tabmodule=PARSETAB_MODULE,
+            write_tables=False,
+            debug=False,
+        )
+        packaged.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        lex.lex(module=requisite_parser)
+        yacc.yacc(
+            module=requisite_parser,
+            tabmodule="_no_packaged_tables",
+            write_tables=False,
+            debug=False,
+            errorlog=yacc.NullLogger(),
+        )
+        built.append(time.perf_counter() - start)
+    return statistics.median(packaged), statistics.median(built)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures the cold import time of the requisite parser with and without the packaged tables",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n", "--runs", type=int, default=10, help="Interpreter launches per case"
+    )
+    args = parser.parse_args()
+
+    # First launch compiles the table modules to bytecode, as a deployment would have
+    time_snippet(IMPORT_SNIPPET, 1)
+    cases = {
+        "interpreter + ply": BASELINE_SNIPPET,
+        "packaged tables": IMPORT_SNIPPET,
+        "tables built on import": NO_TABLES_SNIPPET,
+    }
+    medians = {}
+    for name, snippet in cases.items():
+        timings = time_snippet(snippet, args.runs)
+        medians[name] = statistics.median(timings)
+        print(
+            f"{name:<24} median {medians[name] * 1000:7.1f} ms   "
+            f"min {min(timings) * 1000:7.1f} ms"
+        )
+
+    baseline = medians["interpreter + ply"]
+    packaged = medians["packaged tables"] - baseline
+    built = medians["tables built on import"] - baseline
+    print(
+        f"Parser setup: {packaged * 1000:.1f} ms with packaged tables vs "
+        f"{built * 1000:.1f} ms building them ({built / max(packaged, 1e-9):.1f}x)"
+    )
+    packaged, built = time_construction(args.runs)
+    print(
+        f"In-process lex+yacc construction: {packaged * 1000:.2f} ms with packaged tables vs "
+        f"{built * 1000:.2f} ms building them ({built / max(packaged, 1e-9):.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
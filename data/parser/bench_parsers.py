@@ -0,0 +1,266 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from data.parser.requisite_parser import (
+    PARSER_BACKENDS,
+    clear_requisite_cache,
+    get_parser_backend,
+    parse_corequisites,
+    parse_prerequisites,
+    set_parser_backend,
+)
+
+DATABASE_PATH = "data/database/courses.db"
+PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+# Distinct requisite strings of courses.db, versioned so results stay comparable
+CORPUS_PATH = os.path.join(PARSER_DIR, "requisite_corpus.json")
+BASELINE_PATH = os.path.join(PARSER_DIR, "bench_parsers_baseline.json")
+# Allowed relative drop in throughput or growth in peak memory before --check fails
+DEFAULT_THRESHOLD = 0.25
+
+
+def load_requisite_strings(database_path: str = DATABASE_PATH) -> list[tuple[str, str]]:
+    """Distinct non-empty (kind, requisite string) pairs of the courses table."""
+    connection = sqlite3.connect(database_path)
+    try:
+        pairs = []
+        for kind in ("prerequisites", "corequisites"):
+            rows = connection.execute(f"SELECT DISTINCT {kind} FROM courses").fetchall()
+            pairs.extend(
+                (kind, raw) for raw in sorted(row[0] for row in rows if row[0])
+            )
+        return pairs
+    finally:
+        connection.close()
+
+
+def load_corpus(corpus_path: str = CORPUS_PATH) -> tuple[int, list[tuple[str, str]]]:
+    """Version and (kind, requisite string) pairs of the corpus file."""
+    with open(corpus_path, encoding="utf-8") as corpus_file:
+        corpus = json.load(corpus_file)
+    return corpus["version"], [(kind, raw) for kind, raw in corpus["strings"]]
+
+
+def extract_corpus(
+    database_path: str = DATABASE_PATH, corpus_path: str = CORPUS_PATH
+) -> int:
+    """
+    Writes the database's distinct requisite strings to the corpus file. The version
+    goes up only when the strings changed.
+    Returns:
+        The corpus version.
+    """
+    requisite_strings = load_requisite_strings(database_path)
+    version = 1
+    if os.path.exists(corpus_path):
+        previous_version, previous_strings = load_corpus(corpus_path)
+        if previous_strings == requisite_strings:
+            return previous_version
+        version = previous_version + 1
+    # One string per line, so corpus updates diff line by line
+    strings = ",\n".join(
+        f"    {json.dumps(pair, ensure_ascii=False)}" for pair in requisite_strings
+    )
+    with open(corpus_path, "w", encoding="utf-8") as corpus_file:
+        corpus_file.write(
+            f'{{\n  "version": {version},\n'
+            f'  "extracted": "{date.today().isoformat()}",\n'
+            f'  "strings": [\n{strings}\n  ]\n}}\n'
+        )
+    return version
+
+
+def _parse_all(requisite_strings: list[tuple[str, str]]) -> int:
+    """Parses every string; returns how many failed (PARSE_ERROR)."""
+    errors = 0
+    for kind, raw in requisite_strings:
+        if kind == "prerequisites":
+            ast = parse_prerequisites(raw)
+        else:
+            ast = parse_corequisites(raw)
+        if ast.get("type") == "PARSE_ERROR":
+            errors += 1
+    return errors
+
+
+def time_backend(
+    backend: str, requisite_strings: list[tuple[str, str]], rounds: int
+) -> list[float]:
+    """Seconds to parse every string with the backend, per round (cache cleared each round)."""
+    set_parser_backend(backend)
+    timings = []
+    for _ in range(rounds):
+        clear_requisite_cache()
+        start = time.perf_counter()
+        _parse_all(requisite_strings)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_backend(
+    backend: str, requisite_strings: list[tuple[str, str]], rounds: int
+) -> dict:
+    """
+    Throughput (median of rounds), peak traced memory of one pass including the
+    cached ASTs, and error rate of the backend over the strings.
+    """
+    time_backend(backend, requisite_strings, 1)  # Warm up
+    timings = time_backend(backend, requisite_strings, rounds)
+
+    clear_requisite_cache()
+    tracemalloc.start()
+    try:
+        errors = _parse_all(requisite_strings)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    clear_requisite_cache()
+    return {
+        "strings_per_sec": round(len(requisite_strings) / statistics.median(timings)),
+        "peak_kib": round(peak / 1024),
+        "errors": errors,
+        "error_rate": round(errors / max(len(requisite_strings), 1), 4),
+    }
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Descriptions of every metric worse than the baseline beyond the threshold."""
+    regressions = []
+    for backend, measured in results.items():
+        expected = baseline["backends"].get(backend)
+        if expected is None:
+            continue
+        if measured["strings_per_sec"] < expected["strings_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{backend}: {measured['strings_per_sec']} strings/s, baseline "
+                f"{expected['strings_per_sec']}"
+            )
+        if measured["peak_kib"] > expected["peak_kib"] * (1 + threshold):
+            regressions.append(
+                f"{backend}: peak {measured['peak_kib']} KiB, baseline {expected['peak_kib']}"
+            )
+        # Parsing is deterministic, so any new error is a regression
+        if measured["errors"] > expected["errors"]:
+            regressions.append(
+                f"{backend}: {measured['errors']} parse errors, baseline {expected['errors']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures requisite parsing throughput, peak memory and error rate of each parser backend over the requisite corpus",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n",
+        "--rounds",
+        type=int,
+        default=10,
+        help="Passes over the strings per backend",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=PARSER_BACKENDS,
+        action="append",
+        help="Backend to measure, repeatable (default: all)",
+    )
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Corpus file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument(
+        "--database", default=DATABASE_PATH, help="SQLite database for --extract"
+    )
+    parser.add_argument(
+        "--extract",
+        action="store_true",
+        help="Refresh the corpus from the database and exit",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="Fail (exit code 1) on regressions against the baseline",
+    )
+    mode.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative throughput drop / peak memory growth for --check",
+    )
+    args = parser.parse_args()
+
+    if args.extract:
+        version = extract_corpus(args.database, args.corpus)
+        print(f"{args.corpus} is at corpus version {version}")
+        return
+
+    # Unparseable strings log an error each time they are parsed
+    logging.disable(logging.CRITICAL)
+    corpus_version, requisite_strings = load_corpus(args.corpus)
+    print(
+        f"Corpus version {corpus_version}: {len(requisite_strings)} requisite strings, "
+        f"{args.rounds} rounds"
+    )
+
+    original_backend = get_parser_backend()
+    results = {}
+    try:
+        for backend in args.backend or PARSER_BACKENDS:
+            results[backend] = measure_backend(backend, requisite_strings, args.rounds)
+            measured = results[backend]
+            print(
+                f"{backend:<5} {measured['strings_per_sec']:9d} strings/s   "
+                f"peak {measured['peak_kib']:6d} KiB   "
+                f"{measured['errors']} errors ({measured['error_rate']:.2%})"
+            )
+    finally:
+        set_parser_backend(original_backend)
+    if "ply" in results and "fast" in results:
+        speedup = results["fast"]["strings_per_sec"] / results["ply"]["strings_per_sec"]
+        print(f"fast vs ply: {speedup:.1f}x")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {"corpus_version": corpus_version, "backends": results},
+                baseline_file,
+                indent=2,
+            )
+            baseline_file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif args.check:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["corpus_version"] != corpus_version:
+            print(
+                f"Baseline is for corpus version {baseline['corpus_version']}, "
+                "run with --save-baseline to measure a new one."
+            )
+            sys.exit(1)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
@@ -0,0 +1,108 @@
+import argparse
+import importlib
+import logging
+import os
+import sys
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from data.parser import requisite_parser
+from data.parser.requisite_parser import LEXTAB_MODULE, PARSETAB_MODULE
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _table_path(module_name: str, outputdir: str) -> str:
+    return os.path.join(outputdir, module_name.rsplit(".", 1)[-1] + ".py")
+
+
+def build_tables(outputdir: str = PARSER_DIR, debug: bool = False) -> None:
+    """
+    Regenerates the requisite lexer and LALR parser tables as Python modules.
+    Args:
+        outputdir: Directory to write requisite_lextab.py and requisite_parsetab.py to.
+        debug: Also write the grammar/state report (parser.out) next to the tables.
+    """
+    for module_name in (LEXTAB_MODULE, PARSETAB_MODULE):
+        path = _table_path(module_name, outputdir)
+        if os.path.exists(path):
+            os.remove(path)
+        # PLY reads the tables through the import system, drop any loaded copy
+        sys.modules.pop(module_name, None)
+    importlib.invalidate_caches()
+
+    lex.lex(
+        module=requisite_parser, optimize=1, lextab=LEXTAB_MODULE, outputdir=outputdir
+    )
+    yacc.yacc(
+        module=requisite_parser,
+        tabmodule=PARSETAB_MODULE,
+        outputdir=outputdir,
+        write_tables=True,
+        debug=debug,
+    )
+    for module_name in (LEXTAB_MODULE, PARSETAB_MODULE):
+        logger.info(f"Wrote {_table_path(module_name, outputdir)}")
+
+
+def tables_are_current() -> bool:
+    """Whether the packaged tables were generated from the current grammar and tokens."""
+    try:
+        lextab = importlib.import_module(LEXTAB_MODULE)
+        parsetab = importlib.import_module(PARSETAB_MODULE)
+    except ImportError:
+        return False
+
+    parser_info = yacc.ParserReflect(vars(requisite_parser))
+    parser_info.get_all()
+    # In-memory lexer built from the token rules, only used for its master regexes
+    current_lexer = lex.lex(module=requisite_parser)
+    packaged_regexes = [regex for regex, _ in lextab._lexstatere["INITIAL"]]
+    return (
+        parsetab._lr_signature == parser_info.signature()
+        and set(lextab._lextokens) == set(requisite_parser.tokens)
+        and packaged_regexes == current_lexer.lexstateretext["INITIAL"]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generates the requisite parser's lexer and LALR tables into the package",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-o", "--outputdir", default=PARSER_DIR, help="Directory to write tables to"
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Also write the parser.out report"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that the packaged tables match the grammar (exit code 1 if not)",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if tables_are_current():
+            logger.info("Packaged parse tables are up to date.")
+            return
+        logger.error(
+            "Packaged parse tables are missing or stale, run python -m data.parser.build_parse_tables"
+        )
+        sys.exit(1)
+    build_tables(args.outputdir, args.debug)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
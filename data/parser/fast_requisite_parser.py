@@ -0,0 +1,342 @@
+import logging
+import re
+from typing import List, Optional, Tuple
+
+# Hand-written counterpart of requisite_parser's PLY lexer and LALR parser. It produces
+# the same ASTs and raises the same exceptions at the same points, see parse().
+
+logger = logging.getLogger(__name__)
+
+# Token rules in PLY's matching order: function rules in definition order, then string
+# rules by decreasing regex length. Compiled with re.VERBOSE like PLY does, which is why
+# t_AND's "(O Y)" matches "OY". Named groups pick out the parts the values are built from.
+TOKEN_RULES = (
+    (
+        "CREDITS_TO_GRADUATION_REQUIREMENT",
+        r"MENOS\s+DE\s+(?P<graduation_credits>\d+)\s+CRS\s+PARA\s+GRADUACION",
+    ),
+    ("ENGLISH_LEVEL_REQUIREMENT", r"NIVEL_AVAN_INGL\s*(=|<|>|<=|>=)\s*\#(\d+)"),
+    ("GRADUATION_STATUS_REQUIREMENT", r"SUBGRADUADO|GRADUADO"),
+    ("YEAR_REQUIREMENT", r"1ER|2DO|3RO|4TO|5TO|6TO|7MO|8VO|9NO"),
+    (
+        "CREDITS_WITH_PATTERN_REQUIREMENT",
+        r"(?:\[(?P<credit_patterns>[A-Z*]{4}[0-9*]{0,5}(?:,\s*[A-Z*]{4}[0-9*]{0,5})*)\]"
+        r"|([A-Z*]{4}[0-9*]{0,5}))\s*\{(?P<pattern_credits>[0-9]+)\}",
+    ),
+    (
+        "COURSES_WITH_PATTERN_REQUIREMENT",
+        r"(?:\[(?P<course_patterns>[A-Z*]{4}[0-9*]{0,5}(?:,\s*[A-Z*]{4}[0-9*]{0,5})*)\])"
+        r"\s*(?P<pattern_courses>\d+)",
+    ),
+    ("COURSE", r"[A-Z]{4}\s*\d{4}"),
+    ("DIRECTOR_APPROVAL", r"DIR(?=\s|$|\))"),
+    ("UNKNOWN", r"(BIO3064)"),
+    ("EXAM_REQUIREMENT", r"(EXA\s*DIAG\s*MATE)|((EXAM|EXA)(?=\s|$|\)))"),
+    ("DEPARTMENT_REQUIREMENT", r"(?!PARA)[A-Z]{4}"),
+    ("PROGRAM_REQUIREMENT", r"(!)?[0-9]{4}(M)?"),
+    ("CREDITS_GROUP", r"\{([0-9]+)\}"),
+    ("WHITESPACE", r"[ \s\t]+"),
+    ("AND", r"[YyEe](?!/)|(O Y)"),
+    ("OR", r"[OoUu](?!(\sY))"),
+    ("ANDOR", r"(Y/O)"),
+    ("FOR", r"PARA"),
+    ("LBRACKET", r"\["),
+    ("LPAREN", r"\("),
+    ("RBRACKET", r"\]"),
+    ("RPAREN", r"\)"),
+)
+MASTER_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{regex})" for name, regex in TOKEN_RULES), re.VERBOSE
+)
+
+GRADUATION_STATUSES = {"SUBGRADUADO": "Undergraduate", "GRADUADO": "Graduate"}
+# Tokens whose value is the matched text wrapped in {"type", "value"}
+TEXT_VALUE_TOKENS = frozenset(
+    (
+        "COURSE",
+        "DIRECTOR_APPROVAL",
+        "UNKNOWN",
+        "EXAM_REQUIREMENT",
+        "DEPARTMENT_REQUIREMENT",
+        "PROGRAM_REQUIREMENT",
+    )
+)
+OPERAND_TOKENS = frozenset(
+    (
+        "CREDITS_TO_GRADUATION_REQUIREMENT",
+        "YEAR_REQUIREMENT",
+        "COURSE",
+        "DIRECTOR_APPROVAL",
+        "GRADUATION_STATUS_REQUIREMENT",
+        "ENGLISH_LEVEL_REQUIREMENT",
+        "CREDITS_WITH_PATTERN_REQUIREMENT",
+        "COURSES_WITH_PATTERN_REQUIREMENT",
+        "PROGRAM_REQUIREMENT",
+        "DEPARTMENT_REQUIREMENT",
+        "EXAM_REQUIREMENT",
+        "UNKNOWN",
+    )
+)
+END = "$end"
+# Lookaheads on which a finished operand is reduced (any other token is a syntax error)
+FOLLOW_TOKENS = frozenset(("AND", "OR", "FOR", END, "RPAREN", "RBRACKET"))
+# Lookaheads that stand for an empty operand, per place an operand is expected
+EMPTY_AT_START = frozenset(("AND", "OR", "FOR", END))
+EMPTY_IN_PARENS = frozenset(("AND", "OR", "FOR", "RPAREN"))
+EMPTY_IN_BRACKETS = frozenset(("AND", "OR", "FOR", "RBRACKET"))
+EMPTY_AFTER_OPERATOR = FOLLOW_TOKENS
+# Binding power of the binary operators (PLY precedence, all left associative)
+PRECEDENCE = {"FOR": 1, "OR": 2, "AND": 4}
+
+Token = Tuple[str, object]
+# Marks a token whose rule raised; the exception is re-raised when the parser reads it
+_LEX_ERROR = "$error"
+
+
+def _token_value(kind: str, match: re.Match):
+    """Value of a token, as the corresponding t_ rule in requisite_parser builds it."""
+    text = match.group(kind)
+    if kind in TEXT_VALUE_TOKENS:
+        return {"type": kind, "value": text}
+    if kind == "CREDITS_WITH_PATTERN_REQUIREMENT":
+        patterns = match.group("credit_patterns")
+        if patterns is not None:
+            patterns = patterns.replace(" ", "").split(",")
+        else:
+            patterns = [text[: text.index("{")].replace(" ", "")]
+        return {
+            "type": kind,
+            "patterns": patterns,
+            "credits": int(match.group("pattern_credits")),
+        }
+    if kind == "COURSES_WITH_PATTERN_REQUIREMENT":
+        return {
+            "type": kind,
+            "patterns": match.group("course_patterns").replace(" ", "").split(","),
+            "credits": int(match.group("pattern_courses")),
+        }
+    if kind == "CREDITS_GROUP":
+        return int(text[1:-1])
+    if kind == "YEAR_REQUIREMENT":
+        return {"type": kind, "value": int(text[0])}
+    if kind == "CREDITS_TO_GRADUATION_REQUIREMENT":
+        return {"type": kind, "value": int(match.group("graduation_credits"))}
+    if kind == "GRADUATION_STATUS_REQUIREMENT":
+        return {"type": kind, "value": GRADUATION_STATUSES[text]}
+    if kind == "ENGLISH_LEVEL_REQUIREMENT":
+        # Same lookups as t_ENGLISH_LEVEL_REQUIREMENT, including its IndexError when
+        # the comparator isn't surrounded by whitespace
+        comparator = re.findall(r"\s(=|<|>|<=|>=)\s", text)[0]
+        level = re.findall(r"\d+", text)[0]
+        return {"type": kind, "comparator": comparator, "level": int(level)}
+    return text  # Operators and brackets
+
+
+def tokenize(text: str) -> List[Token]:
+    """
+    (type, value) tokens of a requisite string, ending with ("$end", None).
+    Characters no rule matches are logged and skipped. If a rule raises, the list
+    ends with a marker that makes the parser raise it when reading that token.
+    """
+    tokens: List[Token] = []
+    match_at = MASTER_PATTERN.match
+    position, length = 0, len(text)
+    while position < length:
+        char = text[position]
+        # No other rule can start with whitespace or a parenthesis, so these skip the
+        # master pattern (str.isspace() is what \s matches)
+        if char.isspace():
+            position += 1
+            continue
+        if char == "(":
+            tokens.append(("LPAREN", char))
+            position += 1
+            continue
+        if char == ")":
+            tokens.append(("RPAREN", char))
+            position += 1
+            continue
+        match = match_at(text, position)
+        if match is None:
+            logger.info(f"Illegal character '{text[position]}'")
+            position += 1
+            continue
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "WHITESPACE":
+            continue
+        try:
+            tokens.append((kind, _token_value(kind, match)))
+        except Exception as e:
+            tokens.append((_LEX_ERROR, e))
+            return tokens
+    tokens.append((END, None))
+    return tokens
+
+
+def _and_group(left, right):
+    # p_and_group, including how it merges and reorders nested AND groups
+    if left["type"] == "AND" or right["type"] == "AND":
+        and_term, other_term = (left, right) if left["type"] == "AND" else (right, left)
+        if other_term["type"] == "AND":
+            and_term["conditions"].extend(other_term["conditions"])
+        else:
+            and_term["conditions"].append(other_term)
+        return and_term
+    return {"type": "AND", "conditions": [left, right]}
+
+
+def _or_group(left, right):
+    # p_or_group
+    if left["type"] == "OR" or right["type"] == "OR":
+        or_term, other_term = (left, right) if left["type"] == "OR" else (right, left)
+        if other_term["type"] == "OR":
+            or_term["conditions"].extend(other_term["conditions"])
+        else:
+            or_term["conditions"].append(other_term)
+        return or_term
+    return {"type": "OR", "conditions": [left, right]}
+
+
+def _for_group(left, right):
+    return {"type": "FOR", "conditions": [left, right]}
+
+
+_COMBINE = {"AND": _and_group, "OR": _or_group, "FOR": _for_group}
+
+
+class _Parser:
+    """
+    Precedence climbing over the token list. Tokens are read one at a time right after
+    the previous one is consumed, and operators are combined on the same lookaheads the
+    LALR tables reduce on, so semantic actions and syntax errors happen in PLY's order.
+    """
+
+    __slots__ = ("tokens", "position", "kind", "value")
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.position = -1
+        self._advance()
+
+    def _advance(self):
+        self.position += 1
+        self.kind, self.value = self.tokens[self.position]
+        if self.kind == _LEX_ERROR:
+            raise self.value
+
+    def _error(self):
+        # p_error's message. At the end of input PLY passes None instead of a token,
+        # so reading .value raises the same AttributeError here
+        token = None if self.kind == END else self
+        raise Exception(f"Syntax error at token {token.value}")
+
+    def _expect(self, kind: str):
+        if self.kind != kind:
+            self._error()
+        value = self.value
+        self._advance()
+        return value
+
+    def parse(self):
+        result = self._expression(EMPTY_AT_START, 0)
+        if self.kind != END:
+            self._error()
+        return result
+
+    def _expression(self, empty_tokens: frozenset, min_precedence: int):
+        left = self._operand(empty_tokens)
+        while True:
+            precedence = PRECEDENCE.get(self.kind)
+            if precedence is None or precedence < min_precedence:
+                return left
+            combine = _COMBINE[self.kind]
+            self._advance()
+            right = self._expression(EMPTY_AFTER_OPERATOR, precedence + 1)
+            left = combine(left, right)
+
+    def _operand(self, empty_tokens: frozenset):
+        kind = self.kind
+        if kind in OPERAND_TOKENS:
+            value = self.value
+            self._advance()
+        elif kind == "LPAREN":
+            self._advance()
+            value = self._expression(EMPTY_IN_PARENS, 0)
+            self._expect("RPAREN")
+        elif kind == "LBRACKET":
+            self._advance()
+            inner = self._expression(EMPTY_IN_BRACKETS, 0)
+            self._expect("RBRACKET")
+            value = self._bracket_credits(inner, self._expect("CREDITS_GROUP"))
+        elif kind == "CREDITS_GROUP":
+            value = self._credits_group()
+        elif kind in empty_tokens:
+            return {}
+        else:
+            self._error()
+        if self.kind not in FOLLOW_TOKENS:
+            self._error()
+        return value
+
+    @staticmethod
+    def _bracket_credits(inner, credits):
+        # p_credits_with_pattern_requirement_or
+        if inner.get("type") != "OR":
+            patterns = []
+        else:
+            patterns = [
+                requisite["value"]
+                for requisite in inner.get("conditions")
+                if requisite["type"] == "COURSE"
+            ]
+        return {
+            "type": "CREDITS_WITH_PATTERN_REQUIREMENT",
+            "patterns": patterns,
+            "credits": credits,
+        }
+
+    def _credits_group(self):
+        credits = self.value
+        self._advance()
+        if self.kind == "DEPARTMENT_REQUIREMENT":
+            patterns = [self.value["value"]]
+            self._advance()
+        elif self.kind == "LPAREN":
+            self._advance()
+            first = self._expect("COURSE")
+            if self.kind == "ANDOR":
+                group = None
+                while self.kind == "ANDOR":
+                    self._advance()
+                    course = self._expect("COURSE")
+                    if self.kind not in ("ANDOR", "RPAREN"):
+                        self._error()
+                    # p_andor_group (extending with a COURSE dict adds its keys)
+                    if group is None:
+                        group = {"type": "ANDOR", "value": [first, course]}
+                    else:
+                        group["value"].extend(course)
+                patterns = group["value"]
+            else:
+                patterns = [first["value"]]
+            self._expect("RPAREN")
+        else:
+            self._error()
+        return {
+            "type": "CREDITS_WITH_PATTERN_REQUIREMENT",
+            "patterns": patterns,
+            "credits": credits,
+        }
+
+
+def parse(text: str) -> Optional[dict]:
+    """
+    Parses a preprocessed requisite string like requisite_parser's PLY parser: same AST,
+    and the same exception (with the same message) where that parser raises.
+    Args:
+        text: Requisite string, already stripped and checked by _preprocess_string.
+    Returns:
+        The AST ({} when the string only has an empty operand).
+    """
+    return _Parser(tokenize(text)).parse()
@@ -4,14 +4,8 @@ from sqlalchemy import desc
 
 from collections import defaultdict
 from data.database.database import Course, Program
-from data.parser.requisite_parser import (
-    parse_prerequisites,
-    parse_corequisites,
-    lexer,
-)
 
 logger = logging.getLogger(__name__)
-_path_cache = {}
 
 
 def get_highest_ancestor(
@@ -38,10 +32,17 @@ def get_highest_ancestor(
     return (highest_ancestor, course_code)
 
 
-def load_and_parse_all_course_reqs(db_session: Session) -> dict:
+def load_and_parse_all_course_reqs(
+    db_session: Session, processes: int | None = None
+) -> dict:
     """
     Queries all courses, parses their requisites, and returns a lookup dictionary.
+    Each distinct requisite string is parsed once, over a pool of worker processes
+    (one per CPU unless processes is given), and courses sharing a string share its AST.
     """
+    # Imported here so the AST helpers below can be used without loading PLY
+    from data.parser.requisite_parser import parse_in_processes
+
     all_reqs = {}
     print("DB Task: Loading and parsing requisites for all courses...")
     # Query distinct course codes first to avoid parsing duplicates from different terms unnecessarily.
@@ -53,40 +54,35 @@ def load_and_parse_all_course_reqs(db_session: Session) -> dict:
         .all()
     )
 
-    count = 0
+    requisites = [
+        (kind, raw)
+        for course_db_entry in latest_courses
+        for kind, raw in (
+            ("prerequisites", course_db_entry.prerequisites),
+            ("corequisites", course_db_entry.corequisites),
+        )
+    ]
+    # Strings that fail are {} (see _parse_chunk); a failure of the parse as a whole
+    # propagates, so a partial result is never stored as if it were complete.
+    parsed = {}
+    for key, ast in parse_in_processes(requisites, processes):
+        parsed[key] = ast
+        if len(parsed) % 100 == 0:  # Print progress periodically.
+            print(f"DB Task: Parsed {len(parsed)} distinct requisite strings...")
+
     for course_db_entry in latest_courses:
-        course_code = course_db_entry.course_code
-        prereq_str = course_db_entry.prerequisites
-        coreq_str = course_db_entry.corequisites
-        parsed_prereqs = {}
-        parsed_coreqs = {}
-        try:
-            lexer.lineno = 1  # Reset lexer state.
-            parsed_prereqs = parse_prerequisites(prereq_str or "") or {}
-        except Exception as e:
-            # Log potentially less noisily during bulk processing.
-            logger.warning(
-                f"Pre-parse failed for prereqs of {course_code}: '{prereq_str}'. Error: {e}"
-            )
-            pass  # Store empty dict on failure.
-        try:
-            lexer.lineno = 1  # Reset lexer state.
-            parsed_coreqs = parse_corequisites(coreq_str or "") or {}
-        except Exception as e:
-            logger.warning(
-                f"Pre-parse failed for coreqs of {course_code}: '{coreq_str}'. Error: {e}"
+        all_reqs[course_db_entry.course_code] = {
+            kind: parsed.get((kind, (raw or "").strip())) or {}
+            for kind, raw in (
+                ("prerequisites", course_db_entry.prerequisites),
+                ("corequisites", course_db_entry.corequisites),
             )
-            pass  # Store empty dict on failure.
-
-        all_reqs[course_code] = {
-            "prerequisites": parsed_prereqs,
-            "corequisites": parsed_coreqs,
         }
-        count += 1
-        if count % 100 == 0:  # Print progress periodically.
-            print(f"DB Task: Parsed requisites for {count} courses...")
 
-    print(f"DB Task: Finished parsing requisites for {count} unique courses.")
+    print(
+        f"DB Task: Finished parsing {len(parsed)} distinct requisite strings "
+        f"for {len(all_reqs)} unique courses."
+    )
     return all_reqs
 
 
@@ -174,18 +170,30 @@ def build_reverse_dependency_maps(all_reqs: dict) -> tuple[dict, dict]:
     prereq_needed_by_map_set = defaultdict(set)
     coreq_needed_by_map_set = defaultdict(set)
 
+    # Parsed ASTs are cached per requisite string, so courses sharing a string share the
+    # AST object: extract its dependencies once. Keyed by id, the entry holds the AST so
+    # the id can't be reused while the map is alive.
+    dependencies_by_ast = {}
+
+    def course_dependencies(req_dict: dict) -> set:
+        entry = dependencies_by_ast.get(id(req_dict))
+        if entry is None:
+            entry = (req_dict, _extract_course_dependencies(req_dict))
+            dependencies_by_ast[id(req_dict)] = entry
+        return entry[1]
+
     total = len(all_reqs)
     count = 0
     for course_code_needing, req_info in all_reqs.items():
         # Find course codes mentioned in the prerequisites of course_code_needing
-        prereq_deps = _extract_course_dependencies(req_info.get("prerequisites", {}))
+        prereq_deps = course_dependencies(req_info.get("prerequisites", {}))
         for needed_course in prereq_deps:
             needed_course_no_space = needed_course.replace(" ", "")
             # Add course_code_needing to the set for the needed_course
             prereq_needed_by_map_set[needed_course_no_space].add(course_code_needing)
 
         # Find course codes mentioned in the corequisites of course_code_needing
-        coreq_deps = _extract_course_dependencies(req_info.get("corequisites", {}))
+        coreq_deps = course_dependencies(req_info.get("corequisites", {}))
         for needed_course in coreq_deps:
             needed_course_no_space = needed_course.replace(" ", "")
             # Add course_code_needing to the set for the needed_course
@@ -243,106 +251,26 @@ def flatten_requisites_to_list(req_dict: dict | None) -> list[str]:
     return sorted(list(course_codes))
 
 
-def calculate_longest_path(
-    course_code: str, all_parsed_reqs: dict, visited: set
-) -> int:
-    """
-    Recursively calculates the longest prerequisite path (number of course dependencies)
-    for a given course code, using pre-parsed prerequisites.
-    Returns 0 for base cases (no course prerequisites).
-    Returns -1 if a cycle is detected.
-    """
-    course_code = course_code.replace(" ", "")  # Ensure consistent formatting
-
-    # Handle edge cases like empty string if possible
-    if not course_code:
-        return 0
-
-    # Check cache first
-    if course_code in _path_cache:
-        return _path_cache[course_code]
-
-    # Cycle detection
-    if course_code in visited:
-        # Log only once per detected cycle start if desired
-        # logger.warning(f"Cycle detected for longest path calc involving: {course_code}")
-        return -1  # Indicate cycle
-
-    visited.add(course_code)
-
-    parsed_prereqs = all_parsed_reqs.get(course_code)
-
-    # Base case: Course not in our lookup or has no prerequisites dictionary
-    if not parsed_prereqs:
-        visited.remove(course_code)
-        _path_cache[course_code] = 0
-        return 0
-
-    # Get DIRECT COURSE dependencies using the flatten function
-    # Requires flatten_requisites_to_list to be defined/imported
-    course_deps = flatten_requisites_to_list(parsed_prereqs)
-
-    # Base case: Prerequisites exist but contain no actual COURSE dependencies
-    if not course_deps:
-        visited.remove(course_code)
-        _path_cache[course_code] = 0
-        return 0
-
-    # Recursive step
-    max_dep_path = -1  # Initialize to -1 to handle cycles correctly
-
-    for dep_code in course_deps:
-        # Pass a *copy* of the visited set down the recursion path
-        dep_path = calculate_longest_path(dep_code, all_parsed_reqs, visited.copy())
-
-        # Only consider valid, non-cyclic paths for the maximum length
-        if dep_path != -1:
-            max_dep_path = max(max_dep_path, dep_path)
-
-    visited.remove(course_code)  # Remove self AFTER exploring children
-
-    # If max_dep_path is still -1, it means all paths from here led to cycles
-    if max_dep_path == -1:
-        result = -1
-    else:
-        # The path length is 1 (representing the step from dependency to current)
-        # plus the maximum path length found among its valid dependencies.
-        result = 1 + max_dep_path
-
-    _path_cache[course_code] = result  # Cache the result
-    return result
-
-
 def calculate_all_course_paths(all_parsed_reqs: dict) -> dict:
     """
     Calculates the longest prerequisite path for all courses provided in the
-    all_parsed_reqs dictionary.
+    all_parsed_reqs dictionary, over a PrerequisiteGraph built once from them.
     Args:
         all_parsed_reqs: Dict mapping course_code -> parsed_prerequisite_dict.
     Returns:
         Dict mapping course_code -> longest_path_length (int, -1 for cycles).
     """
-    logger.info("Calculating longest prerequisite paths for all courses...")
-    global _path_cache
-    _path_cache = {}  # Reset cache for a full run
-    course_path_lengths = {}
-    total_codes = len(all_parsed_reqs)
-    processed_codes = 0
-
-    # Calculate path for each course code we have prerequisites for
-    for course_code in list(all_parsed_reqs.keys()):  # Use list for safe iteration
-        if course_code not in _path_cache:  # Check cache before calculation
-            visited_nodes = set()  # Reset visited set for each top-level call
-            length = calculate_longest_path(course_code, all_parsed_reqs, visited_nodes)
-            # The result is stored in the cache inside the function call
-        # Ensure the entry exists in the final result dict, retrieving from cache
-        course_path_lengths[course_code] = _path_cache[course_code]
-
-        processed_codes += 1
-        if processed_codes % 100 == 0 or processed_codes == total_codes:
-            logger.info(
-                f"Calculated paths for {processed_codes}/{total_codes} unique codes."
-            )
+    # Imported here, prerequisite_graph builds on the helpers above
+    from data.parser.prerequisite_graph import PrerequisiteGraph
 
-    logger.info("Finished calculating all prerequisite paths.")
+    logger.info("Calculating longest prerequisite paths for all courses...")
+    graph = PrerequisiteGraph(all_parsed_reqs)
+    cycles = graph.cycles
+    for cycle in cycles:
+        logger.warning(f"Prerequisite cycle between {', '.join(cycle)}")
+    course_path_lengths = graph.longest_paths()
+    logger.info(
+        f"Finished calculating prerequisite paths for {len(course_path_lengths)} "
+        f"courses ({len(cycles)} prerequisite cycles)."
+    )
     return course_path_lengths
@@ -0,0 +1,134 @@
+from typing import Dict, List
+
+from data.parser.parser_utils import flatten_requisites_to_list
+
+# Plain-Python graph over parsed prerequisites, importable without the PLY parser.
+
+# Longest path reported for courses that are part of a prerequisite cycle
+CYCLE = -1
+
+
+class PrerequisiteGraph:
+    """
+    Course prerequisite graph, built once from parsed prerequisites: an edge goes from
+    each course to every course mentioned in its prerequisites. Strongly connected
+    components are found with an iterative Tarjan (no recursion, so chains of any length
+    work), and longest prerequisite paths with one pass over the condensed graph in
+    topological order, O(V + E) overall and independent of the order courses are given.
+    A component of several courses, or a course requiring itself, is a cycle: its
+    courses get CYCLE as longest path, and courses requiring them count the whole cycle
+    as one step.
+    """
+
+    def __init__(self, all_parsed_reqs: Dict[str, dict]):
+        self.ids: Dict[str, int] = {}
+        self.codes: List[str] = []
+        self.edges: List[List[int]] = []
+        for course_code, parsed_prereqs in all_parsed_reqs.items():
+            node = self._node(course_code)
+            for dep_code in flatten_requisites_to_list(parsed_prereqs):
+                dep = self._node(dep_code)
+                # Dependencies are sorted and distinct, so the edges are too
+                self.edges[node].append(dep)
+        self.course_codes = list(all_parsed_reqs)
+
+        # Components come out of Tarjan's algorithm after every component they reach,
+        # i.e. prerequisites first, which is the order the longest path pass needs
+        self.component_of: List[int] = [-1] * len(self.codes)
+        self.components: List[List[int]] = []
+        self._find_components()
+
+        self.cyclic: List[bool] = []
+        self.component_depth: List[int] = []
+        for number, members in enumerate(self.components):
+            is_cyclic = len(members) > 1 or members[0] in self.edges[members[0]]
+            depth = -1
+            for member in members:
+                for dep in self.edges[member]:
+                    dep_component = self.component_of[dep]
+                    if dep_component != number:
+                        depth = max(depth, self.component_depth[dep_component])
+            self.cyclic.append(is_cyclic)
+            self.component_depth.append(depth + 1)
+
+    def _node(self, course_code: str) -> int:
+        course_code = course_code.replace(" ", "")
+        node = self.ids.get(course_code)
+        if node is None:
+            node = self.ids[course_code] = len(self.codes)
+            self.codes.append(course_code)
+            self.edges.append([])
+        return node
+
+    def _find_components(self) -> None:
+        index = [-1] * len(self.codes)
+        lowlink = [0] * len(self.codes)
+        on_stack = [False] * len(self.codes)
+        stack: List[int] = []
+        counter = 0
+        for root in range(len(self.codes)):
+            if index[root] != -1:
+                continue
+            # (node, position of the next edge to follow) per active call
+            calls = [(root, 0)]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while calls:
+                node, position = calls[-1]
+                edges = self.edges[node]
+                if position < len(edges):
+                    calls[-1] = (node, position + 1)
+                    dep = edges[position]
+                    if index[dep] == -1:
+                        index[dep] = lowlink[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack[dep] = True
+                        calls.append((dep, 0))
+                    elif on_stack[dep]:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                    continue
+                calls.pop()
+                if calls:
+                    parent = calls[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        self.component_of[member] = len(self.components)
+                        members.append(member)
+                        if member == node:
+                            break
+                    self.components.append(members)
+
+    def longest_path(self, course_code: str) -> int:
+        """
+        Number of courses in the longest chain of course prerequisites below the course.
+        Returns:
+            0 for courses without course prerequisites (or not in the graph), CYCLE for
+            courses in a prerequisite cycle.
+        """
+        node = self.ids.get(course_code.replace(" ", ""))
+        if node is None:
+            return 0
+        component = self.component_of[node]
+        if self.cyclic[component]:
+            return CYCLE
+        return self.component_depth[component]
+
+    def longest_paths(self) -> Dict[str, int]:
+        """longest_path of every course the graph was built from."""
+        return {code: self.longest_path(code) for code in self.course_codes}
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """Course codes of each prerequisite cycle, sorted."""
+        return sorted(
+            sorted(self.codes[member] for member in members)
+            for number, members in enumerate(self.components)
+            if self.cyclic[number]
+        )
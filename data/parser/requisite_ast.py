@@ -0,0 +1,186 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Plain-Python helpers for requisite ASTs, importable without the PLY parser. Course
+# equivalences belong to data.logic, callers pass the code mapping in.
+
+# Simplified terms: True/False constants, ("COURSE", code), ("AND"/"OR", frozenset of
+# terms) and ("OPAQUE", frozen node) for nodes kept as they are
+Term = Any
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(
+        f"{type(self).__name__} is shared between cached requisite ASTs and can't be modified, "
+        "use thaw() to get a mutable copy"
+    )
+
+
+class FrozenDict(dict):
+    """Read-only dict node of a cached requisite AST. Compares equal to a plain dict."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list node of a cached requisite AST. Compares equal to a plain list."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively converts dicts and lists to FrozenDict and FrozenList."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively converts a (frozen) AST back to plain, mutable dicts and lists."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _group(kind: str, children) -> Term:
+    """AND/OR of already simplified terms: flattened, constants folded, absorbed terms dropped."""
+    absorbing = kind == "OR"  # True absorbs an OR, False an AND
+    members = set()
+    for child in children:
+        if child is True or child is False:
+            if child is absorbing:
+                return child
+            continue
+        if child[0] == kind:
+            members.update(child[1])
+        else:
+            members.add(child)
+
+    # A and (A or B) = A, (A or B) and (A or B or C) = A or B; dually for OR
+    dual = "OR" if kind == "AND" else "AND"
+    terms = {
+        member: member[1] if member[0] == dual else frozenset((member,))
+        for member in members
+    }
+    kept = [
+        member
+        for member in members
+        if member[0] != dual
+        or not any(terms[other] < terms[member] for other in members)
+    ]
+    if not kept:
+        return not absorbing  # Empty AND is met, empty OR isn't
+    if len(kept) == 1:
+        return kept[0]
+    return (kind, frozenset(kept))
+
+
+class RequisiteNormalizer:
+    """
+    Rewrites filtered requisite ASTs into a canonical form that is met by exactly the
+    same courses under check_requisites_recursive, so equal requisites get equal ASTs
+    and evaluating them does less work:
+    - Course codes lose their spaces and are mapped through canonical_code (the
+      catalog passes EquivalenceIndex.canonical, so each becomes the canonical code of
+      its equivalence class).
+    - FOR groups (always met) and empty groups are folded as constants.
+    - Nested groups of the same type are flattened, duplicates removed and absorbed
+      terms dropped: A and (A or B) becomes A.
+    - Children are sorted, and identical subtrees are the same frozen object across
+      every AST returned by the normalizer.
+    """
+
+    def __init__(self, canonical_code: Optional[Callable[[str], str]] = None):
+        self.canonical_code = canonical_code
+        # Simplified term -> (sort key, frozen node)
+        self._nodes: Dict[Term, Tuple[tuple, FrozenDict]] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct nodes built so far."""
+        return len(self._nodes)
+
+    def normalize(self, req_dict: Optional[dict]) -> Optional[dict]:
+        """
+        Normalizes a filtered requisite AST.
+        Args:
+            req_dict: Filtered AST (or None).
+        Returns:
+            The canonical frozen AST, None if the requisite is always met, or an empty
+            OR group if it can never be met.
+        """
+        term = self._simplify(req_dict)
+        if term is True:
+            return None
+        if term is False:
+            return FrozenDict(type="OR", conditions=FrozenList())
+        return self._node(term)[1]
+
+    def _simplify(self, req_dict: Any) -> Term:
+        if not req_dict or not isinstance(req_dict, dict):
+            return True
+        req_type = req_dict.get("type")
+        if req_type == "COURSE":
+            course_code = req_dict.get("value", "")
+            if not isinstance(course_code, str):
+                return ("OPAQUE", freeze(req_dict))
+            course_code = course_code.replace(" ", "")
+            if self.canonical_code is not None:
+                course_code = self.canonical_code(course_code)
+            return ("COURSE", course_code)
+        if req_type in ("AND", "OR"):
+            return _group(req_type, map(self._simplify, req_dict.get("conditions", [])))
+        if req_type == "ANDOR":
+            conditions = req_dict.get("value", [])
+            if not isinstance(conditions, list):
+                return False
+            return _group("OR", map(self._simplify, conditions))
+        if req_type == "FOR":
+            return True
+        # Unknown node types fail the check, keep them so it still logs them
+        return ("OPAQUE", freeze(req_dict))
+
+    def _node(self, term: Term) -> Tuple[tuple, FrozenDict]:
+        entry = self._nodes.get(term)
+        if entry is None:
+            kind, value = term
+            if kind == "COURSE":
+                entry = ((0, value), FrozenDict(type="COURSE", value=value))
+            elif kind == "OPAQUE":
+                entry = ((3, repr(value)), value)
+            else:
+                children = sorted(map(self._node, value), key=lambda child: child[0])
+                entry = (
+                    (1 if kind == "OR" else 2, tuple(key for key, _ in children)),
+                    FrozenDict(
+                        type=kind,
+                        conditions=FrozenList(node for _, node in children),
+                    ),
+                )
+            self._nodes[term] = entry
+        return entry
+
+
+def normalize_requisites(
+    req_dict: Optional[dict], canonical_code: Optional[Callable[[str], str]] = None
+) -> Optional[dict]:
+    """Normalizes one filtered AST, see RequisiteNormalizer."""
+    return RequisiteNormalizer(canonical_code).normalize(req_dict)
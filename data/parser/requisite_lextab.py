@@ -0,0 +1,10 @@
+# requisite_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ANDOR', 'COURSE', 'COURSES_WITH_PATTERN_REQUIREMENT', 'CREDITS_GROUP', 'CREDITS_TO_GRADUATION_REQUIREMENT', 'CREDITS_WITH_PATTERN_REQUIREMENT', 'DEPARTMENT_REQUIREMENT', 'DIRECTOR_APPROVAL', 'ENGLISH_LEVEL_REQUIREMENT', 'EXAM_REQUIREMENT', 'FOR', 'GRADUATION_STATUS_REQUIREMENT', 'LBRACKET', 'LPAREN', 'OR', 'PROGRAM_REQUIREMENT', 'RBRACKET', 'RPAREN', 'UNKNOWN', 'WHITESPACE', 'YEAR_REQUIREMENT'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_CREDITS_TO_GRADUATION_REQUIREMENT>MENOS\\s+DE\\s+\\d+\\s+CRS\\s+PARA\\s+GRADUACION)|(?P<t_ENGLISH_LEVEL_REQUIREMENT>NIVEL_AVAN_INGL\\s*(=|<|>|<=|>=)\\s*\\#(\\d+))|(?P<t_GRADUATION_STATUS_REQUIREMENT>SUBGRADUADO|GRADUADO)|(?P<t_YEAR_REQUIREMENT>1ER|2DO|3RO|4TO|5TO|6TO|7MO|8VO|9NO)|(?P<t_CREDITS_WITH_PATTERN_REQUIREMENT>(?:\\[([A-Z*]{4}[0-9*]{0,5}(?:,\\s*[A-Z*]{4}[0-9*]{0,5})*)\\]|([A-Z*]{4}[0-9*]{0,5}))\\s*\\{([0-9]+)\\})|(?P<t_COURSES_WITH_PATTERN_REQUIREMENT>(?:\\[([A-Z*]{4}[0-9*]{0,5}(?:,\\s*[A-Z*]{4}[0-9*]{0,5})*)\\])\\s*(\\d+))|(?P<t_COURSE>[A-Z]{4}\\s*\\d{4})|(?P<t_DIRECTOR_APPROVAL>DIR(?=\\s|$|\\)))|(?P<t_UNKNOWN>(BIO3064))|(?P<t_EXAM_REQUIREMENT>(EXA\\s*DIAG\\s*MATE)|((EXAM|EXA)(?=\\s|$|\\))))|(?P<t_DEPARTMENT_REQUIREMENT>(?!PARA)[A-Z]{4})|(?P<t_PROGRAM_REQUIREMENT>(!)?[0-9]{4}(M)?)|(?P<t_CREDITS_GROUP>\\{([0-9]+)\\})|(?P<t_WHITESPACE>[ \\s\\t]+)|(?P<t_AND>[YyEe](?!/)|(O Y))|(?P<t_OR>[OoUu](?!(\\sY)))|(?P<t_ANDOR>(Y/O))|(?P<t_FOR>PARA)|(?P<t_LBRACKET>\\[)|(?P<t_LPAREN>\\()|(?P<t_RBRACKET>\\])|(?P<t_RPAREN>\\))', [None, ('t_CREDITS_TO_GRADUATION_REQUIREMENT', 'CREDITS_TO_GRADUATION_REQUIREMENT'), ('t_ENGLISH_LEVEL_REQUIREMENT', 'ENGLISH_LEVEL_REQUIREMENT'), None, None, ('t_GRADUATION_STATUS_REQUIREMENT', 'GRADUATION_STATUS_REQUIREMENT'), ('t_YEAR_REQUIREMENT', 'YEAR_REQUIREMENT'), ('t_CREDITS_WITH_PATTERN_REQUIREMENT', 'CREDITS_WITH_PATTERN_REQUIREMENT'), None, None, None, ('t_COURSES_WITH_PATTERN_REQUIREMENT', 'COURSES_WITH_PATTERN_REQUIREMENT'), None, None, ('t_COURSE', 'COURSE'), ('t_DIRECTOR_APPROVAL', 'DIRECTOR_APPROVAL'), ('t_UNKNOWN', 'UNKNOWN'), None, ('t_EXAM_REQUIREMENT', 'EXAM_REQUIREMENT'), None, None, None, ('t_DEPARTMENT_REQUIREMENT', 'DEPARTMENT_REQUIREMENT'), ('t_PROGRAM_REQUIREMENT', 'PROGRAM_REQUIREMENT'), None, None, ('t_CREDITS_GROUP', 'CREDITS_GROUP'), None, ('t_WHITESPACE', 'WHITESPACE'), (None, 'AND'), None, (None, 'OR'), None, (None, 'ANDOR'), None, (None, 'FOR'), (None, 'LBRACKET'), (None, 'LPAREN'), (None, 'RBRACKET'), (None, 'RPAREN')])]}
+_lexstateignore = {'INITIAL': ''}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
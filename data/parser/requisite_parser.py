@@ -1,10 +1,32 @@
 # requisite unused
 
+import copy
+import importlib.util
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
 import ply.yacc as yacc
 import ply.lex as lex
 import logging
 
+from data.parser import fast_requisite_parser
+from data.parser.requisite_ast import FrozenDict, FrozenList, freeze, thaw
+
+logger = logging.getLogger(__name__)
+
+# Lexer/parser tables generated by build_parse_tables.py and shipped with the package
+LEXTAB_MODULE = "data.parser.requisite_lextab"
+PARSETAB_MODULE = "data.parser.requisite_parsetab"
+# "ply" parses with the LALR tables below, "fast" with fast_requisite_parser (same ASTs)
+PARSER_BACKENDS = ("ply", "fast")
+DEFAULT_PARSER_BACKEND = "ply"
+# Distinct (kind, requisite string) pairs kept in the parse cache, the catalog has ~2.8k courses
+REQUISITE_CACHE_SIZE = 4096
+
 tokens = (
     "CREDITS_TO_GRADUATION_REQUIREMENT",
     "GRADUATION_STATUS_REQUIREMENT",
@@ -318,11 +340,84 @@ def p_error(p):
     raise Exception(error_message)
 
 
-lexer = lex.lex()
-lexer.outputdir = "requisite_parser_output"
-parser = yacc.yacc()
-parser.outputdir = "requisite_parser_output"
-logger = logging.getLogger(__name__)
+def _packaged_tables_available() -> bool:
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in (LEXTAB_MODULE, PARSETAB_MODULE)
+    )
+
+
+if _packaged_tables_available():
+    # Optimized mode loads the tables as they are: no grammar validation, no writes
+    lexer = lex.lex(optimize=1, lextab=LEXTAB_MODULE)
+    parser = yacc.yacc(
+        optimize=1, tabmodule=PARSETAB_MODULE, write_tables=False, debug=False
+    )
+else:
+    logger.warning(
+        "Packaged parse tables not found, building them in memory. "
+        "Run python -m data.parser.build_parse_tables to generate them."
+    )
+    lexer = lex.lex()
+    parser = yacc.yacc(
+        tabmodule=PARSETAB_MODULE,
+        write_tables=False,
+        debug=False,
+        errorlog=yacc.NullLogger(),
+    )
+
+
+_thread_local = threading.local()
+
+
+def get_thread_parser() -> Tuple[lex.Lexer, yacc.LRParser]:
+    """
+    Lexer/parser pair owned by the calling thread, created on first use.
+    PLY keeps the lexer position and the parser stacks on the objects themselves, so
+    concurrent parses need their own pair. Clones share the read-only tables, and each
+    process gets its own pairs as threads start parsing in it.
+    """
+    pair = getattr(_thread_local, "pair", None)
+    if pair is None:
+        pair = (lexer.clone(), copy.copy(parser))
+        _thread_local.pair = pair
+    return pair
+
+
+_backend = os.environ.get("REQUISITE_PARSER_BACKEND", DEFAULT_PARSER_BACKEND)
+if _backend not in PARSER_BACKENDS:
+    logger.warning(
+        f"Unknown REQUISITE_PARSER_BACKEND '{_backend}', using '{DEFAULT_PARSER_BACKEND}'."
+    )
+    _backend = DEFAULT_PARSER_BACKEND
+
+
+def get_parser_backend() -> str:
+    return _backend
+
+
+def set_parser_backend(backend: str) -> None:
+    """
+    Selects the parser used for requisite strings (also settable with the
+    REQUISITE_PARSER_BACKEND environment variable). Clears the parse cache.
+    Args:
+        backend: One of PARSER_BACKENDS.
+    """
+    global _backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend '{backend}', expected one of {PARSER_BACKENDS}"
+        )
+    _backend = backend
+    clear_requisite_cache()
+
+
+def _parse(processed_string: str):
+    if _backend == "fast":
+        return fast_requisite_parser.parse(processed_string)
+    thread_lexer, thread_parser = get_thread_parser()
+    thread_lexer.lineno = 1
+    return thread_parser.parse(processed_string, lexer=thread_lexer)
 
 
 def lexer_tester(input_string):
@@ -356,7 +451,7 @@ def _preprocess_string(input_string: str) -> tuple[str, bool]:
         return input_string, False  # Indicate invalid syntax
 
 
-def parse_prerequisites(input_string):
+def _parse_prerequisites_uncached(input_string):
     processed_string, is_potentially_valid = _preprocess_string(input_string or "")
     if not is_potentially_valid:
         return {
@@ -367,9 +462,8 @@ def parse_prerequisites(input_string):
     if not processed_string:  # Was empty or only whitespace
         return {}
     try:
-        lexer.lineno = 1
         # Parse the potentially corrected string
-        result = parser.parse(processed_string, lexer=lexer)
+        result = _parse(processed_string)
         return result if result is not None else {}
     except SyntaxError as e:
         logger.error(
@@ -383,7 +477,7 @@ def parse_prerequisites(input_string):
         return {"type": "PARSE_ERROR", "value": input_string, "error": str(e)}
 
 
-def parse_corequisites(input_string):
+def _parse_corequisites_uncached(input_string):
     processed_string, is_potentially_valid = _preprocess_string(input_string or "")
     if not is_potentially_valid:
         return {
@@ -394,8 +488,7 @@ def parse_corequisites(input_string):
     if not processed_string:  # Was empty or only whitespace
         return {}
     try:
-        lexer.lineno = 1
-        result = parser.parse(processed_string, lexer=lexer)
+        result = _parse(processed_string)
         return result if result is not None else {}
     except SyntaxError as e:
         logger.error(
@@ -407,3 +500,135 @@ def parse_corequisites(input_string):
             f"Unexpected error parsing corequisite string '{processed_string}' (Original: '{input_string}'): {e}"
         )
         return {"type": "PARSE_ERROR", "value": input_string, "error": str(e)}
+
+
+@lru_cache(maxsize=REQUISITE_CACHE_SIZE)
+def _parse_cached(kind: str, stripped_string: str):
+    if kind == "corequisites":
+        return freeze(_parse_corequisites_uncached(stripped_string))
+    return freeze(_parse_prerequisites_uncached(stripped_string))
+
+
+def parse_prerequisites(input_string):
+    """
+    Parses a prerequisite string. Results are cached per process by the stripped string,
+    so identical strings return the same AST object: it is frozen (FrozenDict/FrozenList)
+    and raises TypeError if modified, use thaw() for a mutable copy.
+    Args:
+        input_string: Prerequisite string; None is treated as empty.
+    Returns:
+        The AST, {} for an empty string or a PARSE_ERROR dict if it can't be parsed.
+    """
+    return _parse_cached("prerequisites", (input_string or "").strip())
+
+
+def parse_corequisites(input_string):
+    """Parses a corequisite string, cached and frozen like parse_prerequisites."""
+    return _parse_cached("corequisites", (input_string or "").strip())
+
+
+def requisite_cache_info():
+    """Hits, misses, maxsize and current size of the parse cache (functools cache_info)."""
+    return _parse_cached.cache_info()
+
+
+def clear_requisite_cache() -> None:
+    _parse_cached.cache_clear()
+
+
+def parse_many(
+    input_strings: Iterable[Optional[str]],
+    kind: str = "prerequisites",
+    max_workers: int = 1,
+) -> List[dict]:
+    """
+    Parses several requisite strings. Safe to call from any number of threads at once,
+    since every thread parses with its own lexer/parser pair (see get_thread_parser).
+    Args:
+        input_strings: Requisite strings; None is treated as empty.
+        kind: "prerequisites" or "corequisites", selects the parse function and its error logging.
+        max_workers: Threads to parse with. 1 parses in the calling thread.
+    Returns:
+        Parsed requisite dicts aligned with input_strings ({} for empty strings,
+        PARSE_ERROR dicts for strings that fail to parse).
+    """
+    parse = parse_corequisites if kind == "corequisites" else parse_prerequisites
+    strings = [input_string or "" for input_string in input_strings]
+    if max_workers <= 1 or len(strings) < 2:
+        return [parse(input_string) for input_string in strings]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse, strings))
+
+
+# Strings per task sent to a worker process
+PROCESS_CHUNK_SIZE = 64
+
+
+def _parse_chunk(
+    requisites: List[Tuple[str, str]],
+) -> List[Tuple[Tuple[str, str], dict]]:
+    """
+    Worker process task: ((kind, string), AST) for each pair. A string whose parse
+    raises gets {} and a warning, without failing the rest of the chunk.
+    """
+    results = []
+    for kind, raw in requisites:
+        parse = parse_corequisites if kind == "corequisites" else parse_prerequisites
+        try:
+            ast = parse(raw)
+        except Exception as e:
+            # Log potentially less noisily during bulk processing.
+            logger.warning(f"Pre-parse failed for {kind}: '{raw}'. Error: {e}")
+            ast = {}
+        results.append(((kind, raw), ast))
+    return results
+
+
+def parse_in_processes(
+    requisites: Iterable[Tuple[str, Optional[str]]],
+    processes: Optional[int] = None,
+) -> Iterator[Tuple[Tuple[str, str], dict]]:
+    """
+    Parses (kind, string) pairs over a pool of worker processes, each string once.
+    Args:
+        requisites: ("prerequisites"/"corequisites", string) pairs, duplicates allowed.
+        processes: Worker processes, default one per CPU. With 1 (or a single chunk of
+            strings) everything is parsed in this process.
+    Yields:
+        ((kind, stripped string), AST) per distinct non-empty pair, as workers finish
+        them (not in input order). ASTs are frozen as parse_prerequisites returns them.
+    """
+    distinct = sorted(
+        {(kind, (raw or "").strip()) for kind, raw in requisites if raw and raw.strip()}
+    )
+    processes = processes if processes is not None else os.cpu_count() or 1
+    chunks = [
+        distinct[start : start + PROCESS_CHUNK_SIZE]
+        for start in range(0, len(distinct), PROCESS_CHUNK_SIZE)
+    ]
+    if processes <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk)
+        return
+    remaining = dict(enumerate(chunks))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(chunks)),
+            initializer=set_parser_backend,
+            initargs=(get_parser_backend(),),
+        ) as executor:
+            futures = {
+                executor.submit(_parse_chunk, chunk): number
+                for number, chunk in remaining.items()
+            }
+            for future in as_completed(futures):
+                results = future.result()
+                del remaining[futures[future]]
+                yield from results
+    except (OSError, BrokenProcessPool) as e:
+        # E.g. no semaphores in the sandbox or a killed worker: parse the rest here
+        logger.warning(
+            f"Process pool failed, parsing {len(remaining)} chunks serially: {e}"
+        )
+        for chunk in remaining.values():
+            yield from _parse_chunk(chunk)
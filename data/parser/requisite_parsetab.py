@@ -0,0 +1,55 @@
+
+# requisite_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftFORleftORleftANDORleftANDAND ANDOR COURSE COURSES_WITH_PATTERN_REQUIREMENT CREDITS_GROUP CREDITS_TO_GRADUATION_REQUIREMENT CREDITS_WITH_PATTERN_REQUIREMENT DEPARTMENT_REQUIREMENT DIRECTOR_APPROVAL ENGLISH_LEVEL_REQUIREMENT EXAM_REQUIREMENT FOR GRADUATION_STATUS_REQUIREMENT LBRACKET LPAREN OR PROGRAM_REQUIREMENT RBRACKET RPAREN UNKNOWN WHITESPACE YEAR_REQUIREMENTprerequisite : emptyprerequisite : prerequisite AND prerequisiteprerequisite : prerequisite OR prerequisiteprerequisite : prerequisite FOR prerequisiteprerequisite : LPAREN prerequisite RPARENcredits_with_pattern_requirement : LBRACKET prerequisite RBRACKET CREDITS_GROUPandor_group : andor_group ANDOR COURSE\n    | COURSE ANDOR COURSE\n    credits_with_pattern_requirement : CREDITS_GROUP LPAREN andor_group RPAREN\n    | CREDITS_GROUP LPAREN COURSE RPAREN\n    credits_with_pattern_requirement : CREDITS_GROUP DEPARTMENT_REQUIREMENTcredits_with_pattern_requirement : CREDITS_WITH_PATTERN_REQUIREMENTprerequisite : CREDITS_TO_GRADUATION_REQUIREMENT\n    | YEAR_REQUIREMENT\n    | COURSE\n    | DIRECTOR_APPROVAL\n    | GRADUATION_STATUS_REQUIREMENT\n    | ENGLISH_LEVEL_REQUIREMENT\n    | credits_with_pattern_requirement\n    | COURSES_WITH_PATTERN_REQUIREMENT\n    | PROGRAM_REQUIREMENT\n    | DEPARTMENT_REQUIREMENT\n    | EXAM_REQUIREMENT\n    | UNKNOWNempty :'
+    
+_lr_action_items = {'LPAREN':([0,3,16,17,19,20,21,],[3,3,3,24,3,3,3,]),'CREDITS_TO_GRADUATION_REQUIREMENT':([0,3,16,19,20,21,],[4,4,4,4,4,4,]),'YEAR_REQUIREMENT':([0,3,16,19,20,21,],[5,5,5,5,5,5,]),'COURSE':([0,3,16,19,20,21,24,35,37,],[6,6,6,6,6,6,32,38,39,]),'DIRECTOR_APPROVAL':([0,3,16,19,20,21,],[7,7,7,7,7,7,]),'GRADUATION_STATUS_REQUIREMENT':([0,3,16,19,20,21,],[8,8,8,8,8,8,]),'ENGLISH_LEVEL_REQUIREMENT':([0,3,16,19,20,21,],[9,9,9,9,9,9,]),'COURSES_WITH_PATTERN_REQUIREMENT':([0,3,16,19,20,21,],[11,11,11,11,11,11,]),'PROGRAM_REQUIREMENT':([0,3,16,19,20,21,],[12,12,12,12,12,12,]),'DEPARTMENT_REQUIREMENT':([0,3,16,17,19,20,21,],[13,13,13,25,13,13,13,]),'EXAM_REQUIREMENT':([0,3,16,19,20,21,],[14,14,14,14,14,14,]),'UNKNOWN':([0,3,16,19,20,21,],[15,15,15,15,15,15,]),'AND':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,18,19,20,21,22,23,25,26,27,28,29,33,34,36,],[-25,19,-1,-25,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-12,-25,-25,-25,19,19,-11,-2,19,19,-5,-6,-9,-10,]),'OR':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,18,19,20,21,22,23,25,26,27,28,29,33,34,36,],[-25,20,-1,-25,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-12,-25,-25,-25,20,20,-11,-2,-3,20,-5,-6,-9,-10,]),'FOR':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,18,19,20,21,22,23,25,26,27,28,29,33,34,36,],[-25,21,-1,-25,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-12,-25,-25,-25,21,21,-11,-2,-3,-4,-5,-6,-9,-10,]),'$end':([0,1,2,4,5,6,7,8,9,10,11,12,13,14,15,18,19,20,21,25,26,27,28,29,33,34,36,],[-25,0,-1,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-12,-25,-25,-25,-11,-2,-3,-4,-5,-6,-9,-10,]),'LBRACKET':([0,3,16,19,20,21,],[16,16,16,16,16,16,]),'CREDITS_GROUP':([0,3,16,19,20,21,30,],[17,17,17,17,17,17,33,]),'CREDITS_WITH_PATTERN_REQUIREMENT':([0,3,16,19,20,21,],[18,18,18,18,18,18,]),'RPAREN':([2,3,4,5,6,7,8,9,10,11,12,13,14,15,18,19,20,21,22,25,26,27,28,29,31,32,33,34,36,38,39,],[-1,-25,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-12,-25,-25,-25,29,-11,-2,-3,-4,-5,34,36,-6,-9,-10,-7,-8,]),'RBRACKET':([2,4,5,6,7,8,9,10,11,12,13,14,15,16,18,19,20,21,23,25,26,27,28,29,33,34,36,],[-1,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-12,-25,-25,-25,30,-11,-2,-3,-4,-5,-6,-9,-10,]),'ANDOR':([31,32,38,39,],[35,37,-7,-8,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'prerequisite':([0,3,16,19,20,21,],[1,22,23,26,27,28,]),'empty':([0,3,16,19,20,21,],[2,2,2,2,2,2,]),'credits_with_pattern_requirement':([0,3,16,19,20,21,],[10,10,10,10,10,10,]),'andor_group':([24,],[31,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> prerequisite","S'",1,None,None,None),
+  ('prerequisite -> empty','prerequisite',1,'p_prerequisite_base_rule','requisite_parser.py',200),
+  ('prerequisite -> prerequisite AND prerequisite','prerequisite',3,'p_and_group','requisite_parser.py',205),
+  ('prerequisite -> prerequisite OR prerequisite','prerequisite',3,'p_or_group','requisite_parser.py',219),
+  ('prerequisite -> prerequisite FOR prerequisite','prerequisite',3,'p_for_group','requisite_parser.py',233),
+  ('prerequisite -> LPAREN prerequisite RPAREN','prerequisite',3,'p_grouped_term','requisite_parser.py',238),
+  ('credits_with_pattern_requirement -> LBRACKET prerequisite RBRACKET CREDITS_GROUP','credits_with_pattern_requirement',4,'p_credits_with_pattern_requirement_or','requisite_parser.py',243),
+  ('andor_group -> andor_group ANDOR COURSE','andor_group',3,'p_andor_group','requisite_parser.py',261),
+  ('andor_group -> COURSE ANDOR COURSE','andor_group',3,'p_andor_group','requisite_parser.py',262),
+  ('credits_with_pattern_requirement -> CREDITS_GROUP LPAREN andor_group RPAREN','credits_with_pattern_requirement',4,'p_credits_with_pattern_requirement_andor','requisite_parser.py',272),
+  ('credits_with_pattern_requirement -> CREDITS_GROUP LPAREN COURSE RPAREN','credits_with_pattern_requirement',4,'p_credits_with_pattern_requirement_andor','requisite_parser.py',273),
+  ('credits_with_pattern_requirement -> CREDITS_GROUP DEPARTMENT_REQUIREMENT','credits_with_pattern_requirement',2,'p_credits_with_pattern_requirement_inverted','requisite_parser.py',287),
+  ('credits_with_pattern_requirement -> CREDITS_WITH_PATTERN_REQUIREMENT','credits_with_pattern_requirement',1,'p_credits_with_pattern_requirement','requisite_parser.py',298),
+  ('prerequisite -> CREDITS_TO_GRADUATION_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',303),
+  ('prerequisite -> YEAR_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',304),
+  ('prerequisite -> COURSE','prerequisite',1,'p_term','requisite_parser.py',305),
+  ('prerequisite -> DIRECTOR_APPROVAL','prerequisite',1,'p_term','requisite_parser.py',306),
+  ('prerequisite -> GRADUATION_STATUS_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',307),
+  ('prerequisite -> ENGLISH_LEVEL_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',308),
+  ('prerequisite -> credits_with_pattern_requirement','prerequisite',1,'p_term','requisite_parser.py',309),
+  ('prerequisite -> COURSES_WITH_PATTERN_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',310),
+  ('prerequisite -> PROGRAM_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',311),
+  ('prerequisite -> DEPARTMENT_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',312),
+  ('prerequisite -> EXAM_REQUIREMENT','prerequisite',1,'p_term','requisite_parser.py',313),
+  ('prerequisite -> UNKNOWN','prerequisite',1,'p_term','requisite_parser.py',314),
+  ('empty -> <empty>','empty',0,'p_empty','requisite_parser.py',319),
+]
@@ -0,0 +1,264 @@
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from data.database.catalog_version import bump_catalog_version
+from data.database.database import Course, ParsedRequisite, RequisiteParseError
+from data.parser.parser_utils import filter_parsed_requisites
+
+# Nothing here imports the PLY parser at module level: the API reads the stored ASTs and
+# only loads the parser for strings without a current stored AST.
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = "sqlite:///data/database/courses.db"
+# Bump whenever the parser or filter_parsed_requisites changes the ASTs it produces,
+# stored rows with another version are ignored and parsed again at runtime
+PARSER_VERSION = 2
+REQUISITE_KINDS = ("prerequisites", "corequisites")
+
+# (kind, raw string) -> (filtered AST or None, error message or None)
+StoredRequisites = Dict[Tuple[str, str], Tuple[Optional[dict], Optional[str]]]
+
+
+def parse_filtered_requisites(raw: str, kind: str) -> Optional[dict]:
+    """
+    Parses a requisite string with the PLY parser (imported on first call) and filters it.
+    Args:
+        raw: Requisite string.
+        kind: "prerequisites" or "corequisites".
+    Returns:
+        The filtered AST, or None if no course requisites remain.
+    """
+    from data.parser.requisite_parser import parse_corequisites, parse_prerequisites
+
+    parse = parse_prerequisites if kind == "prerequisites" else parse_corequisites
+    return filter_parsed_requisites(parse(raw))
+
+
+def parse_checked_requisites(
+    raw: str, kind: str
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Parses and filters a requisite string like parse_filtered_requisites, but reports
+    strings the parser can't handle (PARSE_ERROR ASTs or exceptions) instead of
+    reading them as having no course requisites.
+    Returns:
+        (filtered AST or None, None) if the string parses, (None, error message) if not.
+    """
+    from data.parser.requisite_parser import parse_corequisites, parse_prerequisites
+
+    parse = parse_prerequisites if kind == "prerequisites" else parse_corequisites
+    try:
+        ast = parse(raw)
+        if ast.get("type") == "PARSE_ERROR":
+            return None, ast.get("error") or "Parse error"
+        return filter_parsed_requisites(ast), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+def encode_requisites(ast: Optional[dict]) -> Optional[str]:
+    return json.dumps(ast, separators=(",", ":")) if ast else None
+
+
+def decode_requisites(text: Optional[str]) -> Optional[dict]:
+    return json.loads(text) if text else None
+
+
+def _stored_from_rows(rows: Iterable[ParsedRequisite]) -> StoredRequisites:
+    stored: StoredRequisites = {}
+    stale = 0
+    for row in rows:
+        if row.parser_version != PARSER_VERSION:
+            stale += 1
+            continue
+        stored[(row.kind, row.raw)] = (decode_requisites(row.ast), row.error)
+    if stale:
+        logger.warning(
+            f"Ignoring {stale} stored requisite ASTs from another parser version, "
+            "run python -m data.parser.requisite_store to refresh them."
+        )
+    return stored
+
+
+def load_stored_requisites(db: Session) -> StoredRequisites:
+    """Stored ASTs of the current PARSER_VERSION. Empty if the table can't be read."""
+    try:
+        return _stored_from_rows(db.execute(select(ParsedRequisite)).scalars().all())
+    except Exception as e:
+        logger.error(f"Error loading stored requisite ASTs: {e}")
+        return {}
+
+
+async def load_stored_requisites_async(db: AsyncSession) -> StoredRequisites:
+    """Asynchronous counterpart of load_stored_requisites."""
+    try:
+        result = await db.execute(select(ParsedRequisite))
+        return _stored_from_rows(result.scalars().all())
+    except Exception as e:
+        logger.error(f"Error loading stored requisite ASTs: {e}")
+        return {}
+
+
+def _requisite_strings(db: Session) -> List[Tuple[str, str]]:
+    """Distinct non-empty (kind, raw string) pairs of the courses table."""
+    pairs = []
+    for kind in REQUISITE_KINDS:
+        column = getattr(Course, kind)
+        raws = db.execute(select(column).distinct()).scalars().all()
+        pairs.extend((kind, raw) for raw in sorted(raw for raw in raws if raw))
+    return pairs
+
+
+def _course_requisite_strings(db: Session) -> List[Tuple[str, str, str]]:
+    """Distinct non-empty (course code, kind, raw string) triples of the courses table."""
+    triples = []
+    for kind in REQUISITE_KINDS:
+        column = getattr(Course, kind)
+        rows = db.execute(select(Course.course_code, column).distinct()).all()
+        triples.extend((code, kind, raw) for code, raw in sorted(rows) if raw)
+    return triples
+
+
+def load_parse_errors(db: Session) -> List[RequisiteParseError]:
+    """Recorded parse failures, by course code and kind. Empty if the table can't be read."""
+    try:
+        return (
+            db.execute(
+                select(RequisiteParseError).order_by(
+                    RequisiteParseError.course_code, RequisiteParseError.kind
+                )
+            )
+            .scalars()
+            .all()
+        )
+    except Exception as e:
+        logger.error(f"Error loading requisite parse errors: {e}")
+        return []
+
+
+async def load_parse_errors_async(db: AsyncSession) -> List[RequisiteParseError]:
+    """Asynchronous counterpart of load_parse_errors."""
+    try:
+        result = await db.execute(
+            select(RequisiteParseError).order_by(
+                RequisiteParseError.course_code, RequisiteParseError.kind
+            )
+        )
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"Error loading requisite parse errors: {e}")
+        return []
+
+
+def store_parsed_requisites(db: Session) -> int:
+    """
+    Parses every distinct requisite string of the courses table and replaces the
+    parsed_requisites rows with their filtered ASTs, stamped with PARSER_VERSION.
+    Strings that fail to parse are stored with their error and recorded per course
+    in requisite_parse_errors, so nothing parses (and logs) them again at runtime.
+    Bumps catalog_version so running APIs reload their catalog snapshot.
+    Args:
+        db: Synchronous session; committed on success.
+    Returns:
+        Number of requisite strings stored.
+    """
+    rows = []
+    errors: Dict[Tuple[str, str], str] = {}
+    for kind, raw in _requisite_strings(db):
+        ast, error = parse_checked_requisites(raw, kind)
+        if error:
+            errors[(kind, raw)] = error
+        rows.append(
+            ParsedRequisite(
+                kind=kind,
+                raw=raw,
+                ast=encode_requisites(ast),
+                error=error,
+                parser_version=PARSER_VERSION,
+            )
+        )
+    error_rows = [
+        RequisiteParseError(
+            course_code=code,
+            kind=kind,
+            raw=raw,
+            error=errors[(kind, raw)],
+            parser_version=PARSER_VERSION,
+        )
+        for code, kind, raw in _course_requisite_strings(db)
+        if (kind, raw) in errors
+    ]
+    db.execute(delete(ParsedRequisite))
+    db.execute(delete(RequisiteParseError))
+    db.add_all(rows)
+    db.add_all(error_rows)
+    bump_catalog_version(db)
+    db.commit()
+    logger.info(
+        f"Stored {len(rows)} parsed requisite strings (parser version {PARSER_VERSION}), "
+        f"{len(errors)} failed to parse ({len(error_rows)} course requisites)."
+    )
+    return len(rows)
+
+
+def outdated_requisites(db: Session) -> List[Tuple[str, str]]:
+    """
+    (kind, raw string) pairs whose stored AST is missing, from another parser version
+    or different from what the parser produces now.
+    """
+    stored = load_stored_requisites(db)
+    return [
+        (kind, raw)
+        for kind, raw in _requisite_strings(db)
+        if stored.get((kind, raw)) != parse_checked_requisites(raw, kind)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parses the courses' requisite strings and stores the filtered ASTs in the database",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that every requisite string has a current stored AST (exit code 1 if not)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    engine = create_engine(DATABASE_URL, echo=False)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        if not args.check:
+            store_parsed_requisites(db)
+            return
+        outdated = outdated_requisites(db)
+        if not outdated:
+            logger.info("Stored requisite ASTs are up to date.")
+            return
+        for kind, raw in outdated[:10]:
+            logger.error(f"Outdated stored {kind}: '{raw}'")
+        logger.error(
+            f"{len(outdated)} stored requisite ASTs are missing or stale, "
+            "run python -m data.parser.requisite_store"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user. Exiting...")
+        sys.exit(0)
@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from data.parser import bench_parsers, fast_requisite_parser, requisite_parser
+from data.parser.requisite_parser import (
+    get_parser_backend,
+    parse_prerequisites,
+    set_parser_backend,
+)
+
+DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "database",
+    "courses.db",
+)
+
+
+def _outcome(parse, text):
+    try:
+        return parse(text)
+    except Exception as e:
+        return (type(e).__name__, str(e))
+
+
+def _ply_parse(text):
+    thread_lexer, thread_parser = requisite_parser.get_thread_parser()
+    thread_lexer.lineno = 1
+    return thread_parser.parse(text, lexer=thread_lexer)
+
+
+def _catalog_strings():
+    connection = sqlite3.connect(DATABASE_PATH)
+    try:
+        rows = connection.execute(
+            "SELECT prerequisites FROM courses UNION SELECT corequisites FROM courses"
+        ).fetchall()
+    finally:
+        connection.close()
+    strings = set()
+    for (raw,) in rows:
+        processed, is_potentially_valid = requisite_parser._preprocess_string(raw)
+        if processed and is_potentially_valid:
+            strings.add(processed)
+    return sorted(strings)
+
+
+def test_fast_parser_matches_ply_on_catalog():
+    strings = _catalog_strings()
+    assert strings
+    mismatches = [
+        text
+        for text in strings
+        if _outcome(fast_requisite_parser.parse, text) != _outcome(_ply_parse, text)
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "CIIC3011 Y (CIIC3012 Y CIIC3013)",
+        "(CIIC3011 O CIIC3012) Y (MATE3031 O MATE3005) PARA 0502",
+        "{3} (CIIC3011 Y/O CIIC3012 Y/O CIIC3013)",
+        "[CIIC3011 O CIIC3012] {3}",
+        "CIIC3011 Y",
+        "CIIC3011 Y ) MATE3031",
+        "CIIC3011 CIIC3012",
+        "(CIIC3011",
+        "NIVEL_AVAN_INGL>=#4",
+        "CIIC3011 O Y MATE3031",
+        "BANAr7654764NA",
+    ],
+)
+def test_fast_parser_matches_ply_on_edge_cases(text):
+    assert _outcome(fast_requisite_parser.parse, text) == _outcome(_ply_parse, text)
+
+
+def test_parser_backend_flag():
+    original = get_parser_backend()
+    try:
+        set_parser_backend("fast")
+        fast_result = parse_prerequisites("CIIC3011 O INGE3016")
+        set_parser_backend("ply")
+        assert parse_prerequisites("CIIC3011 O INGE3016") == fast_result
+        with pytest.raises(ValueError):
+            set_parser_backend("yacc")
+    finally:
+        set_parser_backend(original)
+
+
+@pytest.mark.parametrize("backend", requisite_parser.PARSER_BACKENDS)
+def test_corpus_errors_match_baseline(backend):
+    # Throughput and memory depend on the machine, parse errors don't
+    corpus_version, requisite_strings = bench_parsers.load_corpus()
+    with open(bench_parsers.BASELINE_PATH, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    assert baseline["corpus_version"] == corpus_version
+    original = get_parser_backend()
+    try:
+        set_parser_backend(backend)
+        errors = bench_parsers._parse_all(requisite_strings)
+    finally:
+        set_parser_backend(original)
+    assert errors == baseline["backends"][backend]["errors"]
@@ -0,0 +1,65 @@
+from data.parser.parser_utils import calculate_all_course_paths
+from data.parser.prerequisite_graph import CYCLE, PrerequisiteGraph
+
+
+def course(code):
+    return {"type": "COURSE", "value": code}
+
+
+def group(kind, *conditions):
+    return {"type": kind, "conditions": list(conditions)}
+
+
+def test_longest_paths_follow_the_longest_chain():
+    graph = PrerequisiteGraph(
+        {
+            "CIIC3015": {},
+            "CIIC4010": course("CIIC3015"),
+            "CIIC4020": group("AND", course("CIIC4010"), course("MATE3031")),
+            "CIIC4025": group("OR", course("CIIC4020"), course("CIIC 3015")),
+        }
+    )
+    assert graph.longest_paths() == {
+        "CIIC3015": 0,
+        "CIIC4010": 1,
+        "CIIC4020": 2,
+        "CIIC4025": 3,
+    }
+    assert graph.longest_path("MATE3031") == 0
+    assert graph.longest_path("FISI3171") == 0
+    assert graph.cycles == []
+
+
+def test_cycles_are_reported_and_counted_as_one_step():
+    reqs = {
+        "INGE3011": course("INGE3016"),
+        "INGE3016": group("AND", course("INGE3011"), course("MATE3005")),
+        "MATE3005": {},
+        "INGE4001": course("INGE3011"),
+        "INGE4002": course("INGE4002"),
+    }
+    graph = PrerequisiteGraph(reqs)
+    assert graph.cycles == [["INGE3011", "INGE3016"], ["INGE4002"]]
+    assert graph.longest_paths() == {
+        "INGE3011": CYCLE,
+        "INGE3016": CYCLE,
+        "MATE3005": 0,
+        "INGE4001": 2,
+        "INGE4002": CYCLE,
+    }
+    # Independent of the order the courses are given in
+    assert calculate_all_course_paths(dict(reversed(reqs.items()))) == (
+        graph.longest_paths()
+    )
+
+
+def test_long_chains_and_dense_cycles():
+    chain = {f"C{number}": course(f"C{number - 1}") for number in range(1, 20000)}
+    assert calculate_all_course_paths(chain)["C19999"] == 19999
+    # Every course requires every other one
+    codes = [f"D{number}" for number in range(60)]
+    dense = {code: group("AND", *map(course, codes)) for code in codes}
+    dense["E1"] = course("D0")
+    graph = PrerequisiteGraph(dense)
+    assert graph.cycles == [sorted(codes)]
+    assert graph.longest_path("E1") == 1
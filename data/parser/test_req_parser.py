@@ -1,6 +1,28 @@
+import os
+
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from data.parser import requisite_parser
+from data.parser.build_parse_tables import tables_are_current
+from data.parser.parser_utils import load_and_parse_all_course_reqs
 from data.parser.requisite_parser import (
+    clear_requisite_cache,
+    PROCESS_CHUNK_SIZE,
+    parse_corequisites,
+    parse_in_processes,
+    parse_many,
     parse_prerequisites,
+    requisite_cache_info,
+    thaw,
+)
+from data.parser.requisite_store import outdated_requisites, parse_checked_requisites
+
+DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "database",
+    "courses.db",
 )
 
 def test_credits_to_graduation_requirement():
@@ -58,3 +80,104 @@ def test_courses_with_pattern_requirement():
         "patterns": ["CIIC*"],
         "credits": 2,
     }
+
+
+def test_packaged_tables_are_current():
+    # Regenerate with: python -m data.parser.build_parse_tables
+    assert tables_are_current()
+
+
+def test_stored_requisites_are_current():
+    # Refresh with: python -m data.parser.requisite_store
+    with Session(create_engine(f"sqlite:///{DATABASE_PATH}")) as db:
+        assert outdated_requisites(db) == []
+
+
+def test_parse_checked_requisites_reports_parse_errors():
+    ast, error = parse_checked_requisites(
+        "24 CREDITS IN COMPARATIVE LITERATURE", "prerequisites"
+    )
+    assert ast is None
+    assert "Syntax error" in error
+    assert parse_checked_requisites("CIIC3011", "prerequisites") == (
+        parse_prerequisites("CIIC3011"),
+        None,
+    )
+
+
+def test_parse_many_threads_match_serial():
+    inputs = [
+        "CIIC3011",
+        "(CIIC3011 O INGE3016) Y MATE3031",
+        "MENOS DE 30 CRS PARA GRADUACION",
+        "[CIIC*] 2",
+        "(FISI3172 O FISI3162) Y (MATE3063 O MATE3185) Y !0502 Y !0507",
+        "",
+    ] * 50
+    expected = [parse_prerequisites(input_string) for input_string in inputs]
+    assert parse_many(inputs, max_workers=8) == expected
+
+
+def test_parse_in_processes_matches_serial():
+    requisites = [
+        ("prerequisites", f"CIIC{3000 + number} O INGE3016") for number in range(200)
+    ] + [
+        ("corequisites", "MATE3031"),
+        ("prerequisites", " CIIC3001 O INGE3016 "),
+        ("prerequisites", ""),
+        ("corequisites", None),
+    ]
+    parsed = dict(parse_in_processes(requisites, processes=2))
+    assert len(parsed) == 201
+    assert len(parsed) > PROCESS_CHUNK_SIZE
+    for kind, raw in requisites[:201]:
+        parse = parse_corequisites if kind == "corequisites" else parse_prerequisites
+        assert parsed[(kind, raw)] == parse(raw)
+
+
+def test_parse_in_processes_isolates_failing_strings(monkeypatch):
+    def parse(raw):
+        if raw == "CIIC3011":
+            raise RuntimeError("parser crashed")
+        return parse_corequisites(raw)
+
+    monkeypatch.setattr(requisite_parser, "parse_prerequisites", parse)
+    parsed = dict(
+        parse_in_processes(
+            [("prerequisites", "CIIC3011"), ("prerequisites", "MATE3031")],
+            processes=1,
+        )
+    )
+    assert parsed == {
+        ("prerequisites", "CIIC3011"): {},
+        ("prerequisites", "MATE3031"): parse_corequisites("MATE3031"),
+    }
+
+
+def test_load_all_course_reqs_propagates_stream_failures(monkeypatch):
+    def failing_stream(requisites, processes=None):
+        yield ("prerequisites", "CIIC3011"), parse_prerequisites("CIIC3011")
+        raise OSError("worker pool lost")
+
+    monkeypatch.setattr(requisite_parser, "parse_in_processes", failing_stream)
+    with Session(create_engine(f"sqlite:///{DATABASE_PATH}")) as db:
+        with pytest.raises(OSError):
+            load_and_parse_all_course_reqs(db)
+
+
+def test_parse_cache_returns_shared_frozen_ast():
+    clear_requisite_cache()
+    first = parse_prerequisites("CIIC3011 O INGE3016")
+    second = parse_prerequisites("  CIIC3011 O INGE3016\n")
+    assert second is first
+    info = requisite_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    with pytest.raises(TypeError):
+        first["type"] = "AND"
+    with pytest.raises(TypeError):
+        first["conditions"].append({"type": "COURSE", "value": "MATE3031"})
+
+    mutable = thaw(first)
+    mutable["conditions"].append({"type": "COURSE", "value": "MATE3031"})
+    assert len(parse_prerequisites("CIIC3011 O INGE3016")["conditions"]) == 2
@@ -0,0 +1,61 @@
+from data.logic.equivalences import EquivalenceIndex
+from data.parser.requisite_ast import RequisiteNormalizer, normalize_requisites
+
+
+def course(code):
+    return {"type": "COURSE", "value": code}
+
+
+def group(kind, *conditions):
+    return {"type": kind, "conditions": list(conditions)}
+
+
+def test_normalize_flattens_dedupes_and_sorts():
+    ast = group(
+        "AND",
+        course("MATE3032"),
+        group("AND", course("CIIC 3015"), course("MATE3032")),
+    )
+    assert normalize_requisites(ast) == group(
+        "AND", course("CIIC3015"), course("MATE3032")
+    )
+
+
+def test_normalize_drops_absorbed_terms():
+    ast = group(
+        "AND",
+        course("CIIC3015"),
+        group("OR", course("CIIC3015"), course("MATE3031")),
+        group("OR", course("MATE3031"), course("MATE3005")),
+        group("OR", course("MATE3031"), course("MATE3005"), course("MATE3063")),
+    )
+    assert normalize_requisites(ast) == group(
+        "AND",
+        course("CIIC3015"),
+        group("OR", course("MATE3005"), course("MATE3031")),
+    )
+
+
+def test_normalize_folds_constants():
+    always_met = group("FOR", course("CIIC3015"))
+    assert normalize_requisites(group("OR", course("CIIC3015"), always_met)) is None
+    assert normalize_requisites(group("AND", course("CIIC3015"), always_met)) == course(
+        "CIIC3015"
+    )
+    never_met = normalize_requisites(group("AND", course("CIIC3015"), group("OR")))
+    assert never_met == group("OR")
+
+
+def test_normalize_uses_canonical_codes_and_shares_subtrees():
+    equivalences = EquivalenceIndex([["CIIC3015", "INGE3016"]])
+    normalizer = RequisiteNormalizer(equivalences.canonical)
+    first = normalizer.normalize(
+        group("AND", course("INGE3016"), group("OR", course("A"), course("B")))
+    )
+    second = normalizer.normalize(
+        group("AND", group("OR", course("B"), course("A")), course("CIIC3015"))
+    )
+    assert first == second
+    assert first is second
+    merged = normalizer.normalize(group("OR", course("INGE3016"), course("CIIC3015")))
+    assert merged == course("CIIC3015")
@@ -3,12 +3,11 @@ import logging
 import math
 from sqlalchemy import create_engine, select, update, desc
 from sqlalchemy.orm import sessionmaker, Session
+from data.database.catalog_version import bump_catalog_version
 from data.database.database import Course
-from data.parser.parser_utils import (
-    parse_prerequisites,
-    lexer,
-    calculate_all_course_paths,
-)
+from data.parser.parser_utils import calculate_all_course_paths
+from data.parser.requisite_parser import parse_many
+from data.parser.requisite_store import store_parsed_requisites
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -16,6 +15,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = "sqlite:///data/database/courses.db"
+PARSE_WORKERS = 4
 engine = create_engine(DATABASE_URL, echo=False)  # Use synchronous engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -50,25 +50,15 @@ def run_calculations_and_update():
             if processed_codes % 100 == 0 or processed_codes == total_codes:
                 logger.info(f"Fetched data for {processed_codes}/{total_codes} codes.")
 
-        # Parse all prerequisites (same as before)
+        # Parse all prerequisites, each thread with its own parser
         logger.info("Parsing all prerequisites...")
-        processed_codes = 0
-        total_codes_to_parse = len(all_course_prereq_strings)
-        for code, prereq_str in all_course_prereq_strings.items():
-            try:
-                lexer.lineno = 1
-                parsed = parse_prerequisites(prereq_str or "") or {}
-                all_parsed_reqs[code] = parsed
-            except Exception as e:
-                logger.error(
-                    f"Failed to parse prereqs for {code}: '{prereq_str}'. Error: {e}"
-                )
-                all_parsed_reqs[code] = {}  # Store empty if parse fails
-            processed_codes += 1
-            if processed_codes % 100 == 0 or processed_codes == total_codes_to_parse:
-                logger.info(
-                    f"Parsed prereqs for {processed_codes}/{total_codes_to_parse} unique codes."
-                )
+        codes = list(all_course_prereq_strings.keys())
+        parsed_list = parse_many(
+            (all_course_prereq_strings[code] for code in codes),
+            max_workers=PARSE_WORKERS,
+        )
+        all_parsed_reqs.update(zip(codes, parsed_list))
+        logger.info(f"Parsed prereqs for {len(codes)} unique codes.")
 
         # Calculate longest path for all courses (same as before)
         course_path_lengths = calculate_all_course_paths(all_parsed_reqs)
@@ -149,6 +139,8 @@ def run_calculations_and_update():
                 )
 
         logger.info("Committing updates...")
+        # Running APIs reload their catalog snapshot on the next request
+        bump_catalog_version(db)
         db.commit()
         logger.info(
             f"Successfully updated path/difficulty for {updated_count} course entries."
@@ -158,6 +150,10 @@ def run_calculations_and_update():
                 f"Failed to update path/difficulty for {error_count} course entries."
             )
 
+        # Precompute the filtered ASTs the API loads instead of parsing
+        logger.info("Storing parsed requisites...")
+        store_parsed_requisites(db)
+
     except Exception as e:
         logger.exception(f"An critical error occurred: {e}")
         db.rollback()
@@ -7,7 +7,6 @@ from data.input_files.programs_metadata import PROGRAMS_METADATA
 from data.parser.requisite_parser import (
     parse_prerequisites,
     parse_corequisites,
-    lexer,
 )
 from data.parser.parser_utils import (
     get_highest_ancestor,
@@ -79,7 +78,6 @@ def main():
                         prereq_str = course_db_entry.prerequisites
                         coreq_str = course_db_entry.corequisites
                         try:
-                            lexer.lineno = 1
                             parsed_prereqs = parse_prerequisites(prereq_str or "") or {}
                         except Exception as e:
                             print(
@@ -87,7 +85,6 @@ def main():
                             )
                             parsed_prereqs = {"error": "parsing failed"}
                         try:
-                            lexer.lineno = 1
                             parsed_coreqs = parse_corequisites(coreq_str or "") or {}
                         except Exception as e:
                             print(
@@ -138,7 +135,6 @@ def main():
                         prereq_str = course_db_entry.prerequisites
                         coreq_str = course_db_entry.corequisites
                         try:
-                            lexer.lineno = 1
                             parsed_prereqs = parse_prerequisites(prereq_str or "") or {}
                         except Exception as e:
                             print(
@@ -146,7 +142,6 @@ def main():
                             )
                             parsed_prereqs = {"error": "parsing failed"}
                         try:
-                            lexer.lineno = 1
                             parsed_coreqs = parse_corequisites(coreq_str or "") or {}
                         except Exception as e:
                             print(
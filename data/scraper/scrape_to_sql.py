@@ -14,6 +14,7 @@ from data.scraper.ssh_scraper import (
     initialize_ssh_channels,
     ssh_scraper_task,
 )
+from data.database.catalog_version import bump_catalog_version_async
 from data.database.database import Course, Base
 from data.models.constants import db_to_rumad_terms, ideal_ssh_tasks
 from sqlalchemy.exc import IntegrityError
@@ -185,6 +186,8 @@ async def write_to_database_task(
                     # If existing_course was loaded within this session, changes are tracked.
                     # If new, add() marks it for INSERT. add_all handles both.
                     session.add_all(courses_to_process)
+                    # Running APIs reload their catalog snapshot on the next request
+                    await bump_catalog_version_async(session)
 
                 await asyncio.wait_for(session.commit(), timeout=30)
                 logging.info(f"DB Task: Committed changes for {department} to SQL DB")